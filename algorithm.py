@@ -1,13 +1,84 @@
+import contextlib
+import importlib
+import os
 import random
 import time
 import statistics
+import estatisticas as est
 import logic
+import bitboard
+import tabuleiro
+import executores
+import cache_fitness
+import checkpoint
+import gravacao
+from fita import FitaAleatoria, semente_simulacao
 import constants as c
 
 valid_moves = ['up', 'down', 'left', 'right']
 
+# Log padrão do rodar_ag: o nome segue a taxa de mutação (log_ag_10%.txt)
+LOG_PADRAO = "log_ag_{taxa:.0%}.txt"
+
+
+def caminho_log_padrao(taxa_mutacao: float) -> str:
+    return LOG_PADRAO.format(taxa=taxa_mutacao)
+
+
+# Motores alternativos ao módulo logic, escolhidos pelo nome em executar_jogo/fitness
+ENGINES = {
+    'bitboard': bitboard.executar_jogo,
+    'tabuleiro': tabuleiro.executar_jogo,
+}
+
+
+def _modulo_numpy(nome: str):
+    # NumPy é opcional: os módulos que dependem dele (lote, genoma) só são
+    # importados quando a engine 'numpy' ou os genomas compactos são usados
+    try:
+        return importlib.import_module(nome)
+    except ImportError as erro:
+        raise ValueError(f"o módulo {nome} requer o pacote numpy instalado") from erro
+
+
+# Tipos de genoma: 'sequencia' é a lista de movimentos jogada em ordem; os
+# outros ficam em módulos com gerar_individuo, cruzar, mutar e fitness
+TIPOS_GENOMA = ('sequencia', 'pesos')
+
+
+def _tipo_genoma(tipo_genoma: str):
+    if tipo_genoma == 'pesos':
+        return _modulo_numpy('pesos')
+    raise ValueError(f"tipo de genoma desconhecido: {tipo_genoma!r}")
+
+
+def _motor(engine: str):
+    if engine == 'numpy':
+        return _modulo_numpy('lote').executar_jogo
+    if engine not in ENGINES:
+        raise ValueError(f"engine desconhecida: {engine!r}")
+    if engine == 'bitboard' and c.GRID_LEN != bitboard.LINHAS:
+        raise ValueError("a engine bitboard só suporta GRID_LEN == 4")
+    return ENGINES[engine]
+
+
+def executar_jogo(
+    individuo: list[str], engine: str = 'logic', rng=None, registro_jogo=None
+) -> tuple[int, int]:
+    # rng substitui o random global nos sorteios de tiles (ex.: FitaAleatoria);
+    # registro_jogo (gravacao.Gravacao) recebe cada movimento válido e o tile novo
+    if registro_jogo is not None and engine != 'logic':
+        raise ValueError("a gravação de partidas só existe na engine logic")
+    if engine != 'logic':
+        if rng is None:
+            return _motor(engine)(individuo)
+        if engine == 'numpy':
+            raise ValueError("a engine numpy não aceita rng externo (modo crn)")
+        return _motor(engine)(individuo, rng)
+
+    if rng is None:
+        rng = random
 
-def executar_jogo(individuo: list[str]) -> tuple[int, int]:
     movimentos_map = {
         'up': logic.up,
         'down': logic.down,
@@ -15,7 +86,9 @@ def executar_jogo(individuo: list[str]) -> tuple[int, int]:
         'right': logic.right
     }
 
-    matriz = logic.new_game(c.GRID_LEN)
+    matriz = logic.new_game(c.GRID_LEN, rng)
+    if registro_jogo is not None:
+        registro_jogo.iniciar(matriz)
     movimentos_validos = 0
     maior_numero = 0
 
@@ -30,7 +103,12 @@ def executar_jogo(individuo: list[str]) -> tuple[int, int]:
         matriz, movimento_realizado = movimentos_map[movimento](matriz)
 
         if movimento_realizado:
-            matriz = logic.add_two(matriz)
+            if registro_jogo is not None:
+                movida = [linha[:] for linha in matriz]
+                matriz = logic.add_two(matriz, rng)
+                registro_jogo.registrar(movimento, movida, matriz)
+            else:
+                matriz = logic.add_two(matriz, rng)
             movimentos_validos += 1
             for linha in matriz:
                 for numero in linha:
@@ -44,54 +122,213 @@ def executar_jogo(individuo: list[str]) -> tuple[int, int]:
     return maior_numero, movimentos_validos
 
 
+def gravar_jogo(individuo: list[str], semente: int) -> gravacao.Gravacao:
+    # Uma partida do indivíduo no logic com random.Random(semente), gravada.
+    # A semente vai para o cabeçalho em 64 bits: seeds negativas ou maiores
+    # são reduzidas antes do jogo, então a gravação continua rejogável
+    semente &= gravacao.MASCARA_SEMENTE
+    registro = gravacao.Gravacao(c.GRID_LEN, semente)
+    executar_jogo(individuo, rng=random.Random(semente), registro_jogo=registro)
+    return registro
+
+
 def generate_individual(size: int) -> list[str]:
     return [random.choice(valid_moves) for _ in range(size)]
 
 
-def generate_population(population_size: int, individual_size: int) -> list[list[str]]:
+def generate_population(
+    population_size: int, individual_size: int, tipo_genoma: str = 'sequencia'
+) -> list[list[str]]:
+    if tipo_genoma != 'sequencia':
+        gerar = _tipo_genoma(tipo_genoma).gerar_individuo
+        return [gerar(individual_size) for _ in range(population_size)]
     return [generate_individual(individual_size) for _ in range(population_size)]
 
 
-def fitness(individuo: list[str], num_simulacoes: int) -> dict:
+def fitness(
+    individuo: list[str],
+    num_simulacoes: int,
+    engine: str = 'logic',
+    snapshots=None,
+    crn: int = None,
+    estatisticas: bool = False,
+    tipo_genoma: str = 'sequencia'
+) -> dict:
+    # estatisticas=True acrescenta "estatisticas": os jogos em um
+    # estatisticas.EstatisticasJogos serializado (para_dict), mesclável
+    if tipo_genoma != 'sequencia':
+        # O genoma decide cada jogada sozinho; as simulações rodam em lote
+        # (NumPy) qualquer que seja a engine, e com crn todos os indivíduos
+        # usam o mesmo gerador de tiles
+        rng = None if crn is None else _modulo_numpy('numpy').random.default_rng(crn)
+        return _tipo_genoma(tipo_genoma).fitness(individuo, num_simulacoes, rng, estatisticas)
     if not individuo or num_simulacoes == 0:
-        return {
+        resultado = {
             "media_tile": 0.0,
             "media_movimentos": 0.0,
             "maior_tile": 0,
             "distribuicao_tiles": {128: 0, 256: 0, 512: 0, 1024: 0, 2048: 0}
         }
+        if estatisticas:
+            resultado["estatisticas"] = est.EstatisticasJogos().para_dict()
+        return resultado
+
+    if snapshots is not None:
+        # Simulações retomadas do maior prefixo já visto (sempre no bitboard)
+        return snapshots.fitness(individuo, num_simulacoes)
+
+    if engine == 'numpy':
+        if crn is None:
+            # Todas as simulações em lote, de uma vez
+            return _modulo_numpy('lote').fitness(individuo, num_simulacoes, estatisticas=estatisticas)
+        # O lote sorteia todos os jogos de um gerador só e não segue as fitas
+        # do crn: cada simulação roda em um motor jogo a jogo
+        engine = 'bitboard' if c.GRID_LEN == bitboard.LINHAS else 'logic'
 
     soma_tile = 0
     soma_movimentos = 0
     maior_tile_global = 0
     distribuicao = {128: 0, 256: 0, 512: 0, 1024: 0, 2048: 0}
+    agregado = est.EstatisticasJogos() if estatisticas else None
 
-    for _ in range(num_simulacoes):
-        maior_tile, movimentos = executar_jogo(individuo)
+    for simulacao in range(num_simulacoes):
+        # Modo crn: a simulação i de todo indivíduo usa a mesma fita de tiles
+        rng = None if crn is None else FitaAleatoria(semente_simulacao(crn, simulacao))
+        maior_tile, movimentos = executar_jogo(individuo, engine, rng)
         soma_tile += maior_tile
         soma_movimentos += movimentos
         maior_tile_global = max(maior_tile_global, maior_tile)
+        if agregado is not None:
+            agregado.adicionar(maior_tile, movimentos)
 
         for limite in distribuicao:
             if maior_tile >= limite:
                 distribuicao[limite] += 1
 
-    return {
+    resultado = {
         "media_tile": soma_tile / num_simulacoes,
         "media_movimentos": soma_movimentos / num_simulacoes,
         "maior_tile": maior_tile_global,
         "distribuicao_tiles": distribuicao
     }
-
+    if agregado is not None:
+        resultado["estatisticas"] = agregado.para_dict()
+    return resultado
+
+
+
+def semente_individuo(semente: int, indice: int) -> int:
+    # Semente própria de cada indivíduo, derivada da semente da geração: o
+    # resultado não depende de qual worker avaliou o indivíduo
+    return (semente ^ (indice * 0x9E3779B97F4A7C15)) & 0xFFFFFFFFFFFFFFFF
+
+
+def avaliar_tarefa(tarefa: tuple) -> dict:
+    # (individuo, num_simulacoes, engine, semente, crn[, estatisticas[, tipo_genoma]])
+    individuo, num_simulacoes, engine, semente, crn, *resto = tarefa
+    estatisticas = bool(resto and resto[0])
+    tipo_genoma = resto[1] if len(resto) > 1 else 'sequencia'
+    if semente is not None:
+        random.seed(semente)
+    return fitness(
+        individuo, num_simulacoes, engine, crn=crn, estatisticas=estatisticas, tipo_genoma=tipo_genoma
+    )
+
+
+def _avaliar_individuos(
+    individuos: list[list[str]],
+    num_simulacoes: int,
+    engine: str,
+    executor,
+    sementes: list,
+    snapshots=None,
+    crn: int = None,
+    estatisticas: bool = False,
+    tipo_genoma: str = 'sequencia'
+) -> list[dict]:
+    if snapshots is not None:
+        # O armazém de snapshots vive neste processo: não dá para repartir
+        # entre workers sem copiar tudo a cada tarefa
+        if executor is not None and executor.nome != "serial":
+            raise ValueError("snapshots só podem ser usados com avaliação serial")
+        return [fitness(individuo, num_simulacoes, engine, snapshots) for individuo in individuos]
+    if executor is None and all(semente is None for semente in sementes):
+        return [
+            fitness(
+                individuo, num_simulacoes, engine, crn=crn, estatisticas=estatisticas,
+                tipo_genoma=tipo_genoma
+            )
+            for individuo in individuos
+        ]
+    tarefas = [
+        (individuo, num_simulacoes, engine, semente, crn, estatisticas, tipo_genoma)
+        for individuo, semente in zip(individuos, sementes)
+    ]
+    executor = executor or executores.ExecutorSerial()
+    return executor.mapear(avaliar_tarefa, tarefas)
 
 
 def avaliar_populacao(
-    populacao: list[list[str]], num_simulacoes: int
+    populacao: list[list[str]],
+    num_simulacoes: int,
+    engine: str = 'logic',
+    executor=None,
+    seed: int = None,
+    cache=None,
+    snapshots=None,
+    crn: bool = False,
+    estatisticas: bool = False,
+    tipo_genoma: str = 'sequencia'
 ) -> list[tuple[float, dict, list[str]]]:
+    # Com crn todos os indivíduos jogam as mesmas fitas de tiles, derivadas da
+    # semente da geração: as diferenças de fitness vêm só dos genes
+    semente_crn = None
+    if crn:
+        semente_crn = seed if seed is not None else random.getrandbits(64)
+
+    sementes = [
+        None if seed is None else semente_individuo(seed, indice)
+        for indice in range(len(populacao))
+    ]
+
+    if cache is None:
+        resultados = _avaliar_individuos(
+            populacao, num_simulacoes, engine, executor, sementes, snapshots, semente_crn,
+            estatisticas, tipo_genoma
+        )
+    else:
+        resultados = [None] * len(populacao)
+        # Genomas repetidos na mesma geração são simulados uma única vez; o
+        # contexto impede reusar resultados de outra fita crn ou engine.
+        # Quem não foi simulado nesta chamada recebe uma cópia com
+        # "do_cache": True, para os jogos não serem contados de novo
+        contexto = (engine, num_simulacoes, semente_crn)
+        pendentes = {}
+        for indice, individuo in enumerate(populacao):
+            guardado = cache.obter(individuo, contexto)
+            if guardado is not None and cache.politica == "reusar":
+                resultados[indice] = dict(guardado, do_cache=True)
+            else:
+                pendentes.setdefault(cache_fitness.chave_genoma(individuo, contexto), []).append(indice)
+
+        indices = [posicoes[0] for posicoes in pendentes.values()]
+        novos = _avaliar_individuos(
+            [populacao[i] for i in indices], num_simulacoes, engine, executor,
+            [sementes[i] for i in indices], snapshots, semente_crn, estatisticas, tipo_genoma
+        )
+        for posicoes, novo in zip(pendentes.values(), novos):
+            resultado = cache.guardar(populacao[posicoes[0]], novo, num_simulacoes, contexto)
+            if resultado is not novo and "estatisticas" in novo:
+                # Política "mesclar": o agregado soma jogos de gerações
+                # anteriores; os desta geração vão à parte
+                resultado = dict(resultado, estatisticas_novas=novo["estatisticas"])
+            resultados[posicoes[0]] = resultado
+            for indice in posicoes[1:]:
+                resultados[indice] = dict(resultado, do_cache=True)
+
     return [
         (resultado["media_tile"], resultado, individuo)
-        for individuo in populacao
-        for resultado in [fitness(individuo, num_simulacoes)]
+        for individuo, resultado in zip(populacao, resultados)
     ]
 
 
@@ -103,7 +340,11 @@ def selecionar_pais(
 
 
 
-def cruzar(pai1: list[str], pai2: list[str]) -> tuple[list[str], list[str]]:
+def cruzar(
+    pai1: list[str], pai2: list[str], tipo_genoma: str = 'sequencia'
+) -> tuple[list[str], list[str]]:
+    if tipo_genoma != 'sequencia':
+        return _tipo_genoma(tipo_genoma).cruzar(pai1, pai2)
     tamanho = len(pai1)
     ponto_corte = random.randint(1, tamanho - 1)
     filho1 = pai1[:ponto_corte] + pai2[ponto_corte:]
@@ -111,7 +352,9 @@ def cruzar(pai1: list[str], pai2: list[str]) -> tuple[list[str], list[str]]:
     return filho1, filho2
 
 
-def mutar(individuo: list[str], taxa_mutacao: float) -> list[str]:
+def mutar(individuo: list[str], taxa_mutacao: float, tipo_genoma: str = 'sequencia') -> list[str]:
+    if tipo_genoma != 'sequencia':
+        return _tipo_genoma(tipo_genoma).mutar(individuo, taxa_mutacao)
     mutante = individuo.copy()
     for i, _ in enumerate(mutante):
         if random.random() < taxa_mutacao:
@@ -119,58 +362,307 @@ def mutar(individuo: list[str], taxa_mutacao: float) -> list[str]:
     return mutante
 
 
+def _medir(telemetria, fase: str):
+    if telemetria is None:
+        return contextlib.nullcontext()
+    return telemetria.medir(fase)
+
+
 def gerar_nova_populacao(
     populacao_com_fitness: list[tuple[float, list[str]]],
     tamanho_pop: int,
     taxa_mutacao: float,
-    num_pais: int
+    num_pais: int,
+    telemetria=None,
+    tipo_genoma: str = 'sequencia'
 ) -> list[list[str]]:
-    pais = selecionar_pais(populacao_com_fitness, num_pais)
+    if tipo_genoma == 'sequencia':
+        operador_cruzar, operador_mutar = cruzar, mutar
+    else:
+        modulo = _tipo_genoma(tipo_genoma)
+        operador_cruzar, operador_mutar = modulo.cruzar, modulo.mutar
+
+    with _medir(telemetria, "selecao"):
+        pais = selecionar_pais(populacao_com_fitness, num_pais)
     nova_populacao = pais.copy()
 
     while len(nova_populacao) < tamanho_pop:
-        pai1 = random.choice(pais)
-        pai2 = random.choice(pais)
-        filho1, filho2 = cruzar(pai1, pai2)
-        nova_populacao.append(mutar(filho1, taxa_mutacao))
-        if len(nova_populacao) < tamanho_pop:
-            nova_populacao.append(mutar(filho2, taxa_mutacao))
+        with _medir(telemetria, "selecao"):
+            pai1 = random.choice(pais)
+            pai2 = random.choice(pais)
+        with _medir(telemetria, "cruzamento"):
+            filho1, filho2 = operador_cruzar(pai1, pai2)
+        with _medir(telemetria, "mutacao"):
+            nova_populacao.append(operador_mutar(filho1, taxa_mutacao))
+            if len(nova_populacao) < tamanho_pop:
+                nova_populacao.append(operador_mutar(filho2, taxa_mutacao))
 
     return nova_populacao
 
 
 def calcular_metricas(fitness_geral: list[float]) -> dict[str, float]:
+    # Média, desvio, mínimo e máximo em uma passada (Welford); a mediana
+    # continua exata
+    acumulador = est.Acumulador()
+    for fitness_val in fitness_geral:
+        acumulador.adicionar(fitness_val)
     return {
-        "melhor_fitness": max(fitness_geral),
-        "pior_fitness": min(fitness_geral),
-        "medio_fitness": statistics.mean(fitness_geral),
-        "desvio_padrao": statistics.stdev(fitness_geral) if len(fitness_geral) > 1 else 0,
+        "melhor_fitness": acumulador.maximo,
+        "pior_fitness": acumulador.minimo,
+        "medio_fitness": acumulador.media,
+        "desvio_padrao": acumulador.desvio(),
         "mediana": statistics.median(fitness_geral)
     }
 
 
+def estatisticas_geracao(populacao_avaliada: list) -> est.EstatisticasJogos:
+    # Junta os jogos simulados nesta geração pelos indivíduos avaliados com
+    # estatisticas=True. Resultados vindos do cache (do_cache) já foram
+    # contados quando simulados; sem o agregador (snapshots, corrida, cache
+    # restaurado de um checkpoint) também ficam de fora
+    agregado = est.EstatisticasJogos()
+    for _, resultado, _ in populacao_avaliada:
+        if resultado.get("do_cache"):
+            continue
+        jogos = resultado.get("estatisticas_novas", resultado.get("estatisticas"))
+        if jogos is not None:
+            agregado.mesclar(est.EstatisticasJogos.de_dict(jogos))
+    return agregado
+
+
+# Log de texto do rodar_ag; ilhas.py e estacionario.py escrevem no mesmo
+# formato
+
+def escrever_geracao(log, geracao: int, metricas: dict, tempo: float, resultado: dict):
+    log.write(f"\n📊 Geração {geracao + 1}:\n")
+    log.write(f"- Melhor fitness: {metricas['melhor_fitness']}\n")
+    log.write(f"- Pior fitness: {metricas['pior_fitness']}\n")
+    log.write(f"- Média fitness: {metricas['medio_fitness']:.2f}\n")
+    log.write(f"- Mediana: {metricas['mediana']}\n")
+    log.write(f"- Desvio padrão: {metricas['desvio_padrao']:.2f}\n")
+    log.write(f"- Tempo de geração: {tempo:.2f}s\n")
+    log.write(f"- Maior tile do melhor indivíduo: {resultado['maior_tile']}\n")
+    log.write(f"- Média de movimentos válidos: {resultado['media_movimentos']:.2f}\n")
+    log.write("- Distribuição dos maiores tiles:\n")
+    for k, v in resultado["distribuicao_tiles"].items():
+        log.write(f"  - ≥ {k}: {v}x\n")
+    if metricas.get("jogos"):
+        log.write(
+            f"- Jogos da geração: {metricas['jogos']}, tile p50 {metricas['tile_p50']}, "
+            f"p95 {metricas['tile_p95']}, máximo {metricas['tile_maximo']}\n"
+        )
+        log.write(
+            f"- Movimentos válidos: p05 {metricas['movimentos_p05']:.0f}, "
+            f"p50 {metricas['movimentos_p50']:.0f}, p95 {metricas['movimentos_p95']:.0f}\n"
+        )
+        log.write("- Histograma dos maiores tiles:\n")
+        for tile, quantidade in metricas["histograma_tiles"].items():
+            log.write(f"  - {tile}: {quantidade}x\n")
+
+
+def escrever_melhor(
+    log, melhor_fitness: float, melhor_individuo: list[str], tipo_genoma: str = 'sequencia'
+):
+    log.write("\n✅ Melhor indivíduo global:\n")
+    log.write(f"- Fitness: {melhor_fitness:.2f}\n")
+    if tipo_genoma != 'sequencia':
+        log.write("- Pesos:\n")
+        for nome, peso in zip(_tipo_genoma(tipo_genoma).CARACTERISTICAS, melhor_individuo):
+            log.write(f"{nome}: {peso:.4f}\n")
+        return
+    log.write("- Movimentos:\n")
+    for movimento in melhor_individuo:
+        log.write(f"{movimento}\n")
+
+
+def escrever_parada(log, relatorio: dict):
+    log.write(
+        f"\n⏹️ Parada antecipada ({relatorio['motivo']}) na geração "
+        f"{relatorio['geracao_parada'] + 1}: {relatorio['geracoes_economizadas']} gerações e "
+        f"~{relatorio['simulacoes_economizadas']} simulações economizadas\n"
+    )
+
+
+def abrir_log(caminho_log: str, posicao: int = None):
+    if caminho_log is None:
+        return contextlib.nullcontext()
+    if posicao is None or not os.path.exists(caminho_log):
+        return open(caminho_log, "w", encoding="utf-8")
+    # Retomada: descarta o que foi escrito depois do checkpoint
+    log = open(caminho_log, "r+", encoding="utf-8")
+    log.seek(posicao)
+    log.truncate()
+    return log
+
+
 def rodar_ag(
     populacoes: int,
     tamanho_pop: int,
     tamanho_individuo: int,
     taxa_mutacao: float,
-    num_simulacoes: int
+    num_simulacoes: int,
+    engine: str = 'logic',
+    executor=None,
+    seed: int = None,
+    telemetria=None,
+    caminho_log: str = LOG_PADRAO,
+    cache=True,
+    snapshots=None,
+    crn: bool = False,
+    corrida=None,
+    genoma_compacto: bool = False,
+    caminho_checkpoint: str = None,
+    intervalo_checkpoint: int = 1,
+    estado_inicial: dict = None,
+    populacao_inicial: list[list[str]] = None,
+    caminho_gravacao: str = None,
+    parada=None,
+    estatisticas=None,
+    tipo_genoma: str = 'sequencia',
+    registro=None
 ) -> tuple[float, list[str]]:
-    import time
+    # registro (registro.RegistroExecucoes) guarda a execução, as métricas de
+    # cada geração e os indivíduos avaliados em SQLite.
+    # cache=True cria um cache que cobre duas gerações; False desliga.
+    # tipo_genoma='pesos' evolui os pesos de uma heurística (ver pesos.py)
+    # em vez de sequências de movimentos; tamanho_individuo é ignorado.
+    # parada (parada.CriteriosParada) pode encerrar antes de populacoes
+    # gerações; o motivo e a economia ficam em parada.relatorio().
+    # estatisticas (estatisticas.EstatisticasJogos) acumula os jogos de todas
+    # as gerações; o resumo de cada uma vai para o log e a telemetria.
+    # corrida (corrida.AvaliadorCorrida) simula por conta própria: o cache
+    # padrão (cache=True) fica desligado, e um cache passado explicitamente,
+    # crn, snapshots ou estatisticas são recusados
+    if caminho_log == LOG_PADRAO:
+        caminho_log = caminho_log_padrao(taxa_mutacao)
+    if corrida is not None:
+        incompativeis = {
+            "cache": cache not in (True, False, None),
+            "crn": crn,
+            "snapshots": snapshots is not None,
+            "estatisticas": estatisticas is not None,
+        }
+        usados = [nome for nome, valor in incompativeis.items() if valor]
+        if usados:
+            raise ValueError(f"corrida não suporta {', '.join(usados)}")
+        cache = None
+    if cache is True:
+        cache = cache_fitness.CacheFitness(2 * tamanho_pop)
+    elif cache is False:
+        cache = None
+
+    if tipo_genoma != 'sequencia':
+        _tipo_genoma(tipo_genoma)
+        # Estes recursos dependem de o indivíduo ser uma sequência de movimentos
+        incompativeis = {
+            "genoma_compacto": genoma_compacto,
+            "caminho_checkpoint": caminho_checkpoint,
+            "snapshots": snapshots,
+            "corrida": corrida,
+            "caminho_gravacao": caminho_gravacao,
+        }
+        usados = [nome for nome, valor in incompativeis.items() if valor]
+        if usados:
+            raise ValueError(f"tipo_genoma={tipo_genoma!r} não suporta {', '.join(usados)}")
 
     num_pais = max(2, tamanho_pop // 2)
-    melhor_individuo_global = None
-    melhor_fitness_global = float('-inf')
-    populacao = generate_population(tamanho_pop, tamanho_individuo)
+    if genoma_compacto:
+        # População em matriz uint8, evoluída por operadores vetorizados.
+        # A avaliação continua recebendo listas de strings: a matriz é
+        # decodificada a cada geração, e as listas (também guardadas em
+        # populacao_avaliada, no cache e no registro) convivem com ela. O
+        # ganho é no tempo dos operadores, não na memória da população
+        genoma = _modulo_numpy('genoma')
+
+    if estado_inicial is None:
+        if seed is not None:
+            random.seed(seed)
+        geracao_inicial = 0
+        posicao_log = None
+        melhor_individuo_global = None
+        melhor_fitness_global = float('-inf')
+        if genoma_compacto:
+            rng_genoma = genoma.gerador(random.getrandbits(64))
+            matriz = genoma.gerar_populacao(tamanho_pop, tamanho_individuo, rng_genoma)
+            populacao = genoma.decodificar_populacao(matriz)
+        else:
+            populacao = generate_population(tamanho_pop, tamanho_individuo, tipo_genoma)
+        if populacao_inicial:
+            # Indivíduos prontos (ex.: expectimax.gerar_individuos) entram no
+            # lugar dos primeiros aleatórios
+            tamanho_esperado = len(populacao[0]) if populacao else tamanho_individuo
+            if any(len(individuo) != tamanho_esperado for individuo in populacao_inicial):
+                raise ValueError("populacao_inicial precisa de indivíduos com tamanho_individuo genes")
+            for i, individuo in enumerate(populacao_inicial[:tamanho_pop]):
+                populacao[i] = list(individuo)
+            if genoma_compacto:
+                matriz = genoma.codificar_populacao(populacao)
+    else:
+        # Retomada de um checkpoint (ver retomar): o estado salvo substitui a semente
+        geracao_inicial = estado_inicial["geracao"]
+        posicao_log = estado_inicial.get("posicao_log")
+        melhor_individuo_global = estado_inicial["melhor_individuo"]
+        melhor_fitness_global = estado_inicial["melhor_fitness"]
+        populacao = estado_inicial["populacao"]
+        random.setstate(estado_inicial["estado_random"])
+        if genoma_compacto:
+            rng_genoma = genoma.gerador()
+            rng_genoma.bit_generator.state = estado_inicial["rng_genoma"]
+            matriz = genoma.codificar_populacao(populacao)
+
+    parametros = {
+        "populacoes": populacoes,
+        "tamanho_pop": tamanho_pop,
+        "tamanho_individuo": tamanho_individuo,
+        "taxa_mutacao": taxa_mutacao,
+        "num_simulacoes": num_simulacoes,
+        "engine": engine,
+        "seed": seed,
+        "caminho_log": caminho_log,
+        "crn": crn,
+        "genoma_compacto": genoma_compacto,
+        "intervalo_checkpoint": intervalo_checkpoint,
+        "caminho_gravacao": caminho_gravacao,
+        "tipo_genoma": tipo_genoma,
+    }
 
-    with open("log_ag_10%.txt", "w", encoding="utf-8") as log:
-        for geracao in range(populacoes):
-            inicio = time.time()
-            populacao_avaliada = avaliar_populacao(populacao, num_simulacoes)
-            fim = time.time()
+    timer = telemetria.timer if telemetria is not None else None
+    instrumentacao = timer.instrumentar(logic) if timer is not None else contextlib.nullcontext()
+
+    taxa_geracao = taxa_mutacao
+    if parada is not None:
+        if estado_inicial is not None and estado_inicial.get("parada") is not None:
+            # Retomada: estagnação, mutação adaptada e orçamentos continuam
+            parada.restaurar(populacoes, estado_inicial["parada"])
+        else:
+            parada.iniciar(populacoes, taxa_mutacao, geracao_inicial)
+        taxa_geracao = parada.taxa_mutacao
+    if registro is not None:
+        registro.iniciar_execucao(parametros, geracao_inicial)
+
+    with abrir_log(caminho_log, posicao_log) as log, instrumentacao:
+        for geracao in range(geracao_inicial, populacoes):
+            semente_geracao = None if seed is None else random.getrandbits(64)
+            inicio = time.perf_counter()
+            with _medir(telemetria, "avaliacao"):
+                if corrida is not None:
+                    # Corrida: simulações extras só para quem disputa os num_pais lugares
+                    populacao_avaliada = corrida.avaliar(
+                        populacao, num_simulacoes, engine, executor, semente_geracao
+                    )
+                else:
+                    populacao_avaliada = avaliar_populacao(
+                        populacao, num_simulacoes, engine, executor, semente_geracao, cache,
+                        snapshots, crn, estatisticas is not None, tipo_genoma
+                    )
+            fim = time.perf_counter()
 
             fitness_geral = [fitness_val for fitness_val, _, _ in populacao_avaliada]
             metricas = calcular_metricas(fitness_geral)
+            if estatisticas is not None:
+                agregado = estatisticas_geracao(populacao_avaliada)
+                metricas.update(agregado.resumo())
+                estatisticas.mesclar(agregado)
 
             melhor_fitness, resultado, individuo = max(populacao_avaliada, key=lambda x: x[0])
 
@@ -178,32 +670,121 @@ def rodar_ag(
                 melhor_fitness_global = melhor_fitness
                 melhor_individuo_global = individuo.copy()
 
-            log.write(f"\n📊 Geração {geracao + 1}:\n")
-            log.write(f"- Melhor fitness: {metricas['melhor_fitness']}\n")
-            log.write(f"- Pior fitness: {metricas['pior_fitness']}\n")
-            log.write(f"- Média fitness: {metricas['medio_fitness']:.2f}\n")
-            log.write(f"- Mediana: {metricas['mediana']}\n")
-            log.write(f"- Desvio padrão: {metricas['desvio_padrao']:.2f}\n")
-            log.write(f"- Tempo de geração: {fim - inicio:.2f}s\n")
-            log.write(f"- Maior tile do melhor indivíduo: {resultado['maior_tile']}\n")
-            log.write(f"- Média de movimentos válidos: {resultado['media_movimentos']:.2f}\n")
-            log.write("- Distribuição dos maiores tiles:\n")
-            for k, v in resultado["distribuicao_tiles"].items():
-                log.write(f"  - ≥ {k}: {v}x\n")
-
-            populacao = gerar_nova_populacao(
-                populacao_avaliada, tamanho_pop, taxa_mutacao, num_pais
-            )
+            if log is not None:
+                escrever_geracao(log, geracao, metricas, fim - inicio, resultado)
+            if registro is not None:
+                registro.registrar_geracao(
+                    geracao, populacao_avaliada, metricas, num_simulacoes, fim - inicio,
+                    time.perf_counter() - inicio
+                )
+
+            motivo_parada = None
+            if parada is not None:
+                motivo_parada = parada.atualizar(
+                    geracao, melhor_fitness_global, populacao_avaliada, num_simulacoes
+                )
+                taxa_geracao = parada.taxa_mutacao
+
+            if genoma_compacto:
+                # Seleção, cruzamento e mutação em uma única passada vetorizada
+                with _medir(telemetria, "cruzamento"):
+                    matriz = genoma.gerar_nova_populacao(
+                        matriz, fitness_geral, tamanho_pop, taxa_geracao, num_pais, rng_genoma
+                    )
+                    populacao = genoma.decodificar_populacao(matriz)
+            else:
+                populacao = gerar_nova_populacao(
+                    populacao_avaliada, tamanho_pop, taxa_geracao, num_pais, telemetria, tipo_genoma
+                )
+
+            if telemetria is not None:
+                telemetria.registrar_geracao(
+                    geracao, populacao_avaliada, metricas, num_simulacoes,
+                    time.perf_counter() - inicio
+                )
+
+            if caminho_checkpoint is not None and (
+                (geracao + 1) % intervalo_checkpoint == 0 or geracao + 1 == populacoes
+                or motivo_parada is not None
+            ):
+                checkpoint.salvar(
+                    caminho_checkpoint, geracao + 1, parametros, populacao,
+                    melhor_fitness_global, melhor_individuo_global, random.getstate(), cache,
+                    {
+                        "posicao_log": None if log is None else log.tell(),
+                        "rng_genoma": rng_genoma.bit_generator.state if genoma_compacto else None,
+                        "parada": None if parada is None else parada.estado(),
+                    }
+                )
+
+            if motivo_parada is not None:
+                if log is not None:
+                    escrever_parada(log, parada.relatorio())
+                break
 
         # Salva o melhor indivíduo encontrado
-        log.write("\n✅ Melhor indivíduo global:\n")
-        log.write(f"- Fitness: {melhor_fitness_global:.2f}\n")
-        log.write("- Movimentos:\n")
-        for movimento in melhor_individuo_global:
-            log.write(f"{movimento}\n")
+        if log is not None:
+            escrever_melhor(log, melhor_fitness_global, melhor_individuo_global, tipo_genoma)
 
-    return melhor_fitness_global, melhor_individuo_global
+    if registro is not None:
+        registro.finalizar_execucao(
+            melhor_fitness_global, melhor_individuo_global,
+            parada.motivo if parada is not None else None
+        )
 
+    if caminho_gravacao is not None and melhor_individuo_global is not None:
+        # Uma partida do melhor indivíduo, para ver com python puzzle.py --replay
+        semente_gravacao = seed if seed is not None else random.getrandbits(64)
+        gravar_jogo(melhor_individuo_global, semente_gravacao).salvar(caminho_gravacao)
+
+    return melhor_fitness_global, melhor_individuo_global
 
 
-print(rodar_ag(50,150,500,0.10,10))
\ No newline at end of file
+def retomar(
+    caminho_checkpoint: str,
+    executor=None,
+    telemetria=None,
+    snapshots=None,
+    corrida=None,
+    populacoes: int = None,
+    parada=None,
+    estatisticas=None,
+    registro=None
+) -> tuple[float, list[str]]:
+    # Continua uma execução de rodar_ag a partir do último checkpoint, com os
+    # mesmos parâmetros; populacoes permite estender uma execução já terminada
+    with checkpoint.carregar(caminho_checkpoint) as salvo:
+        parametros = dict(salvo.parametros)
+        estado = {
+            "geracao": salvo.geracao,
+            "populacao": salvo.populacao(),
+            "melhor_fitness": salvo.melhor_fitness,
+            "melhor_individuo": salvo.melhor_individuo(),
+            "estado_random": salvo.estado_random(),
+            "posicao_log": salvo.extras.get("posicao_log"),
+            "rng_genoma": salvo.extras.get("rng_genoma"),
+            "parada": salvo.extras.get("parada"),
+        }
+        cache = salvo.cache()
+
+    if populacoes is not None:
+        parametros["populacoes"] = populacoes
+    return rodar_ag(
+        executor=executor,
+        telemetria=telemetria,
+        # Com corrida o cache não é usado (nem aceito): o do checkpoint fica de fora
+        cache=False if cache is None or corrida is not None else cache,
+        snapshots=snapshots,
+        corrida=corrida,
+        parada=parada,
+        estatisticas=estatisticas,
+        registro=registro,
+        caminho_checkpoint=caminho_checkpoint,
+        estado_inicial=estado,
+        **parametros
+    )
+
+
+if __name__ == "__main__":
+    import cli
+    cli.main()
@@ -0,0 +1,518 @@
+# Benchmarks de desempenho do AG
+#
+# Uso: python benchmark.py executores --processos 1 2 4 8
+#      python benchmark.py crn --simulacoes 1 2 5 10 20
+#      python benchmark.py tabuleiro --tamanhos 4 5 6 7 8
+#      python benchmark.py genoma --tamanhos-pop 10000 50000
+#      python benchmark.py suite --saida base.json
+#      python benchmark.py comparar base.json atual.json --limite 0.10
+
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import algorithm as ag
+import bitboard
+import constants as c
+import executores
+import logic
+import tabuleiro
+
+
+def medir(funcao, repeticoes: int = 1) -> float:
+    # Melhor tempo entre as repetições, para reduzir o ruído da máquina
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def benchmark_executores(
+    processos: list[int],
+    tamanho_pop: int = 64,
+    tamanho_individuo: int = 500,
+    num_simulacoes: int = 10,
+    engine: str = 'bitboard',
+    nome_executor: str = 'processos',
+    repeticoes: int = 3
+) -> list[dict]:
+    random.seed(0)
+    populacao = ag.generate_population(tamanho_pop, tamanho_individuo)
+
+    resultados = []
+    with executores.ExecutorSerial() as serial:
+        base = medir(lambda: ag.avaliar_populacao(populacao, num_simulacoes, engine, serial, 0), repeticoes)
+    resultados.append({"executor": "serial", "processos": 1, "tempo": base, "speedup": 1.0})
+
+    for n in processos:
+        with executores.criar_executor(nome_executor, n, semente=0) as executor:
+            # Primeira chamada só aquece os workers (criação do pool e das tabelas)
+            ag.avaliar_populacao(populacao[:n], 1, engine, executor, 0)
+            tempo = medir(
+                lambda: ag.avaliar_populacao(populacao, num_simulacoes, engine, executor, 0),
+                repeticoes
+            )
+        resultados.append({
+            "executor": nome_executor, "processos": n, "tempo": tempo, "speedup": base / tempo
+        })
+    return resultados
+
+
+def _postos(valores: list[float]) -> list[float]:
+    # Postos com empates recebendo a média das posições (Spearman)
+    ordem = sorted(range(len(valores)), key=lambda i: valores[i])
+    postos = [0.0] * len(valores)
+    inicio = 0
+    while inicio < len(ordem):
+        fim = inicio
+        while fim + 1 < len(ordem) and valores[ordem[fim + 1]] == valores[ordem[inicio]]:
+            fim += 1
+        for k in range(inicio, fim + 1):
+            postos[ordem[k]] = (inicio + fim) / 2
+        inicio = fim + 1
+    return postos
+
+
+def correlacao_spearman(a: list[float], b: list[float]) -> float:
+    postos_a, postos_b = _postos(a), _postos(b)
+    media_a, media_b = statistics.mean(postos_a), statistics.mean(postos_b)
+    cov = sum((x - media_a) * (y - media_b) for x, y in zip(postos_a, postos_b))
+    var_a = sum((x - media_a) ** 2 for x in postos_a)
+    var_b = sum((y - media_b) ** 2 for y in postos_b)
+    return cov / (var_a * var_b) ** 0.5 if var_a and var_b else 0.0
+
+
+def _melhores(fitness_geral: list[float], n: int) -> set:
+    return set(sorted(range(len(fitness_geral)), key=lambda i: -fitness_geral[i])[:n])
+
+
+def _populacao_variada(tamanho_pop: int, tamanho_individuo: int) -> list[list[str]]:
+    # Indivíduos totalmente aleatórios têm quase a mesma fitness verdadeira;
+    # sortear um viés de movimentos por indivíduo cria diferenças reais para
+    # o ranking detectar
+    populacao = []
+    for _ in range(tamanho_pop):
+        pesos = [random.random() ** 2 for _ in ag.valid_moves]
+        populacao.append(random.choices(ag.valid_moves, pesos, k=tamanho_individuo))
+    return populacao
+
+
+def benchmark_crn(
+    simulacoes: list[int],
+    tamanho_pop: int = 40,
+    tamanho_individuo: int = 200,
+    simulacoes_referencia: int = 200,
+    repeticoes: int = 5,
+    engine: str = 'bitboard'
+) -> list[dict]:
+    # Compara o ranking obtido com k simulações (com e sem crn) ao ranking
+    # de referência com muitas simulações: correlação de Spearman e fração
+    # dos pais escolhidos por selecionar_pais que coincidem com a referência
+    random.seed(0)
+    populacao = _populacao_variada(tamanho_pop, tamanho_individuo)
+    num_pais = max(2, tamanho_pop // 2)
+    referencia = [
+        f for f, _, _ in ag.avaliar_populacao(populacao, simulacoes_referencia, engine, seed=1)
+    ]
+    pais_referencia = _melhores(referencia, num_pais)
+
+    resultados = []
+    for k in simulacoes:
+        for crn in (False, True):
+            correlacoes = []
+            sobreposicoes = []
+            inicio = time.perf_counter()
+            for repeticao in range(repeticoes):
+                fitness_geral = [
+                    f for f, _, _ in ag.avaliar_populacao(
+                        populacao, k, engine, seed=1000 + repeticao, crn=crn
+                    )
+                ]
+                correlacoes.append(correlacao_spearman(fitness_geral, referencia))
+                sobreposicoes.append(len(_melhores(fitness_geral, num_pais) & pais_referencia) / num_pais)
+            resultados.append({
+                "simulacoes": k,
+                "crn": crn,
+                "spearman": statistics.mean(correlacoes),
+                "pais_iguais": statistics.mean(sobreposicoes),
+                "tempo": (time.perf_counter() - inicio) / repeticoes,
+            })
+    return resultados
+
+
+def _jogar_logic(n: int, movimentos: list[str], rng) -> int:
+    funcoes = {'up': logic.up, 'down': logic.down, 'left': logic.left, 'right': logic.right}
+    matriz = logic.new_game(n, rng)
+    jogadas = 0
+    for movimento in movimentos:
+        if logic.game_state(matriz) != 'not over':
+            matriz = logic.new_game(n, rng)
+        matriz, done = funcoes[movimento](matriz)
+        if done:
+            matriz = logic.add_two(matriz, rng)
+        jogadas += 1
+    return jogadas
+
+
+def _jogar_tabuleiro(n: int, movimentos: list[str], rng) -> int:
+    atual = tabuleiro.new_game(n, rng)
+    jogadas = 0
+    for movimento in movimentos:
+        if atual.game_state() != 'not over':
+            atual = tabuleiro.new_game(n, rng)
+        if atual.mover(movimento):
+            atual.add_two(rng)
+        jogadas += 1
+    return jogadas
+
+
+def benchmark_tabuleiro(tamanhos: list[int], jogadas: int = 20000, repeticoes: int = 3) -> list[dict]:
+    # Movimentos por segundo (com game_state e tile novo) do logic e do
+    # Tabuleiro em grades de vários tamanhos; o logic lê c.GRID_LEN, que é
+    # trocado durante a medição
+    resultados = []
+    gerador = random.Random(0)
+    movimentos = [gerador.choice(ag.valid_moves) for _ in range(jogadas)]
+    grid_original = c.GRID_LEN
+    try:
+        for n in tamanhos:
+            c.GRID_LEN = n
+            tempo_logic = medir(lambda: _jogar_logic(n, movimentos, random.Random(1)), repeticoes)
+            tempo_tabuleiro = medir(lambda: _jogar_tabuleiro(n, movimentos, random.Random(1)), repeticoes)
+            resultados.append({
+                "grid_len": n,
+                "logic_mov_s": jogadas / tempo_logic,
+                "tabuleiro_mov_s": jogadas / tempo_tabuleiro,
+                "speedup": tempo_logic / tempo_tabuleiro,
+            })
+    finally:
+        c.GRID_LEN = grid_original
+    return resultados
+
+
+def _memoria(funcao):
+    # Pico de memória alocada durante a chamada; devolve também o resultado
+    tracemalloc.start()
+    try:
+        resultado = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, pico
+
+
+def benchmark_genoma(
+    tamanhos_pop: list[int],
+    tamanho_individuo: int = 500,
+    taxa_mutacao: float = 0.1,
+    repeticoes: int = 1
+) -> list[dict]:
+    import genoma  # pylint: disable=import-outside-toplevel
+
+    resultados = []
+    for tamanho_pop in tamanhos_pop:
+        num_pais = max(2, tamanho_pop // 2)
+        random.seed(0)
+        rng = genoma.gerador(0)
+
+        populacao, memoria_listas = _memoria(lambda: ag.generate_population(tamanho_pop, tamanho_individuo))
+        matriz, memoria_matriz = _memoria(lambda: genoma.gerar_populacao(tamanho_pop, tamanho_individuo, rng))
+        fitness_geral = [random.random() for _ in range(tamanho_pop)]
+        avaliada = [(f, {}, individuo) for f, individuo in zip(fitness_geral, populacao)]
+
+        tempo_listas = medir(
+            lambda: ag.gerar_nova_populacao(list(avaliada), tamanho_pop, taxa_mutacao, num_pais),
+            repeticoes
+        )
+        tempo_matriz = medir(
+            lambda: genoma.gerar_nova_populacao(matriz, fitness_geral, tamanho_pop, taxa_mutacao, num_pais, rng),
+            repeticoes
+        )
+        resultados.append({
+            "tamanho_pop": tamanho_pop,
+            "mem_listas_mb": memoria_listas / 2 ** 20,
+            "mem_matriz_mb": memoria_matriz / 2 ** 20,
+            "geracao_listas_s": tempo_listas,
+            "geracao_matriz_s": tempo_matriz,
+            "speedup": tempo_listas / tempo_matriz,
+        })
+    return resultados
+
+
+# Suíte de regressão: cada medida vira uma entrada {valor, unidade,
+# maior_melhor} de um JSON; "comparar" aponta as que pioraram além do limite
+
+TAMANHOS_AG = {
+    "pequeno": {"tamanho_pop": 20, "tamanho_individuo": 100, "num_simulacoes": 5},
+    "medio": {"tamanho_pop": 50, "tamanho_individuo": 300, "num_simulacoes": 10},
+    "grande": {"tamanho_pop": 150, "tamanho_individuo": 500, "num_simulacoes": 10},
+}
+
+
+def motores_disponiveis() -> list[str]:
+    motores = ['logic', 'bitboard', 'tabuleiro']
+    if importlib.util.find_spec("numpy") is not None:
+        motores.append('numpy')
+    return motores
+
+
+def _medida(valor: float, unidade: str, maior_melhor: bool = True) -> dict:
+    return {"valor": valor, "unidade": unidade, "maior_melhor": maior_melhor}
+
+
+def _matrizes_aleatorias(quantidade: int, rng) -> list[list[list[int]]]:
+    valores = [0, 0, 0, 2, 2, 4, 8, 16, 32, 64]
+    return [
+        [[rng.choice(valores) for _ in range(c.GRID_LEN)] for _ in range(c.GRID_LEN)]
+        for _ in range(quantidade)
+    ]
+
+
+def _movedor(motor: str, direcao: str, matrizes: list):
+    # Função que aplica a direção a todos os tabuleiros uma vez
+    if motor == 'logic':
+        funcao = getattr(logic, direcao)
+        return lambda: [funcao(matriz) for matriz in matrizes]
+    if motor == 'bitboard':
+        funcao = bitboard.movimentos[direcao]
+        boards = [bitboard.encode(matriz) for matriz in matrizes]
+        return lambda: [funcao(board) for board in boards]
+    if motor == 'tabuleiro':
+        # mover é no lugar, então cada passada move cópias
+        tabuleiros = [tabuleiro.Tabuleiro.da_matriz(matriz) for matriz in matrizes]
+        return lambda: [t.copia().mover(direcao) for t in tabuleiros]
+    np = importlib.import_module("numpy")
+    lote = importlib.import_module("lote")
+    tabuleiros = np.array(matrizes, dtype=np.int32)
+    return lambda: lote.mover(tabuleiros, direcao)
+
+
+def benchmark_movimentos(motores: list[str], quantidade: int = 2000, repeticoes: int = 3) -> dict:
+    matrizes = _matrizes_aleatorias(quantidade, random.Random(0))
+    resultados = {}
+    for motor in motores:
+        for direcao in ag.valid_moves:
+            mover = _movedor(motor, direcao, matrizes)
+            mover()  # aquece tabelas preguiçosas (bitboard) antes de medir
+            tempo = medir(mover, repeticoes)
+            resultados[f"movimentos_s/{motor}/{direcao}"] = _medida(quantidade / tempo, "mov/s")
+    return resultados
+
+
+def benchmark_jogos(
+    motores: list[str], jogos: int = 100, tamanho_individuo: int = 500, repeticoes: int = 3
+) -> dict:
+    random.seed(0)
+    individuo = ag.generate_individual(tamanho_individuo)
+    resultados = {}
+    for motor in motores:
+        def jogar():
+            random.seed(1)
+            for _ in range(jogos):
+                ag.executar_jogo(individuo, motor)
+        resultados[f"jogos_s/{motor}"] = _medida(jogos / medir(jogar, repeticoes), "jogos/s")
+    return resultados
+
+
+def benchmark_fitness(
+    motores: list[str],
+    simulacoes: list[int],
+    tamanho_individuo: int = 500,
+    repeticoes: int = 3
+) -> dict:
+    random.seed(0)
+    individuo = ag.generate_individual(tamanho_individuo)
+    resultados = {}
+    for motor in motores:
+        for k in simulacoes:
+            tempo = medir(lambda: ag.fitness(individuo, k, motor), repeticoes)
+            resultados[f"fitness_ms/{motor}/{k}"] = _medida(tempo * 1000, "ms", maior_melhor=False)
+    return resultados
+
+
+def benchmark_geracao(
+    motores: list[str],
+    nomes_executores: list[str],
+    tamanhos: list[str],
+    geracoes: int = 2,
+    repeticoes: int = 1
+) -> dict:
+    resultados = {}
+    for motor in motores:
+        for nome in nomes_executores:
+            with executores.criar_executor(nome, semente=0) as executor:
+                # Aquece os workers antes de medir
+                ag.avaliar_populacao(ag.generate_population(2, 10), 1, motor, executor, 0)
+                for tamanho in tamanhos:
+                    config = TAMANHOS_AG[tamanho]
+                    tempo = medir(lambda: ag.rodar_ag(
+                        geracoes, config["tamanho_pop"], config["tamanho_individuo"], 0.1,
+                        config["num_simulacoes"], motor, executor, seed=0, caminho_log=None
+                    ), repeticoes)
+                    resultados[f"geracao_s/{motor}/{nome}/{tamanho}"] = _medida(
+                        tempo / geracoes, "s", maior_melhor=False
+                    )
+    return resultados
+
+
+def benchmark_suite(
+    motores: list[str] = None,
+    nomes_executores: list[str] = None,
+    tamanhos: list[str] = None,
+    simulacoes: list[int] = (1, 10, 50),
+    geracoes: int = 2,
+    repeticoes: int = 3
+) -> dict:
+    motores = motores or motores_disponiveis()
+    nomes_executores = nomes_executores or list(executores.EXECUTORES)
+    tamanhos = tamanhos or list(TAMANHOS_AG)
+
+    resultados = {}
+    resultados.update(benchmark_movimentos(motores, repeticoes=repeticoes))
+    resultados.update(benchmark_jogos(motores, repeticoes=repeticoes))
+    resultados.update(benchmark_fitness(motores, list(simulacoes), repeticoes=repeticoes))
+    resultados.update(benchmark_geracao(motores, nomes_executores, tamanhos, geracoes))
+    return {
+        "maquina": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "resultados": resultados,
+    }
+
+
+def comparar(base: dict, atual: dict, limite: float = 0.10) -> list[dict]:
+    # variacao > 0 é melhora; regressão é piorar mais que o limite
+    comparacoes = []
+    for nome, medida in atual["resultados"].items():
+        anterior = base["resultados"].get(nome)
+        if anterior is None or not anterior["valor"]:
+            continue
+        razao = medida["valor"] / anterior["valor"]
+        variacao = razao - 1 if medida["maior_melhor"] else 1 / razao - 1
+        comparacoes.append({
+            "medida": nome,
+            "base": anterior["valor"],
+            "atual": medida["valor"],
+            "variacao": variacao,
+            "regressao": variacao < -limite,
+        })
+    return comparacoes
+
+
+def _imprimir_tabela(resultados: list[dict], colunas: list[str]):
+    print("  ".join(f"{coluna:>12}" for coluna in colunas))
+    for linha in resultados:
+        valores = []
+        for coluna in colunas:
+            valor = linha[coluna]
+            valores.append(f"{valor:>12.3f}" if isinstance(valor, float) else f"{valor!s:>12}")
+        print("  ".join(valores))
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmarks do AG do 2048")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p_exec = comandos.add_parser("executores", help="speedup de avaliar_populacao por núcleos")
+    p_exec.add_argument("--processos", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    p_exec.add_argument("--executor", choices=["processos", "pool"], default="processos")
+    p_exec.add_argument("--tamanho-pop", type=int, default=64)
+    p_exec.add_argument("--tamanho-individuo", type=int, default=500)
+    p_exec.add_argument("--simulacoes", type=int, default=10)
+    p_exec.add_argument("--engine", default="bitboard")
+
+    p_crn = comandos.add_parser("crn", help="estabilidade do ranking por simulação, com e sem crn")
+    p_crn.add_argument("--simulacoes", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    p_crn.add_argument("--tamanho-pop", type=int, default=40)
+    p_crn.add_argument("--tamanho-individuo", type=int, default=200)
+    p_crn.add_argument("--referencia", type=int, default=200)
+    p_crn.add_argument("--repeticoes", type=int, default=5)
+    p_crn.add_argument("--engine", default="bitboard")
+
+    p_tab = comandos.add_parser("tabuleiro", help="movimentos/s do logic e do Tabuleiro por GRID_LEN")
+    p_tab.add_argument("--tamanhos", type=int, nargs="+", default=[4, 5, 6, 7, 8])
+    p_tab.add_argument("--jogadas", type=int, default=20000)
+
+    p_gen = comandos.add_parser("genoma", help="memória e vazão dos operadores em listas vs matriz uint8")
+    p_gen.add_argument("--tamanhos-pop", type=int, nargs="+", default=[10000, 50000])
+    p_gen.add_argument("--tamanho-individuo", type=int, default=500)
+
+    p_suite = comandos.add_parser("suite", help="suíte completa por motor/executor, salva em JSON")
+    p_suite.add_argument("--saida", default="benchmark_base.json")
+    p_suite.add_argument("--motores", nargs="+", choices=motores_disponiveis(), default=None)
+    p_suite.add_argument("--executores", nargs="+", choices=list(executores.EXECUTORES), default=None)
+    p_suite.add_argument("--tamanhos", nargs="+", choices=list(TAMANHOS_AG), default=None)
+    p_suite.add_argument("--simulacoes", type=int, nargs="+", default=[1, 10, 50])
+    p_suite.add_argument("--geracoes", type=int, default=2)
+    p_suite.add_argument("--repeticoes", type=int, default=3)
+
+    p_comp = comandos.add_parser("comparar", help="compara dois JSON da suíte e aponta regressões")
+    p_comp.add_argument("base")
+    p_comp.add_argument("atual")
+    p_comp.add_argument("--limite", type=float, default=0.10,
+                        help="piora relativa tolerada (0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "executores":
+        resultados = benchmark_executores(
+            args.processos, args.tamanho_pop, args.tamanho_individuo,
+            args.simulacoes, args.engine, args.executor
+        )
+        _imprimir_tabela(resultados, ["executor", "processos", "tempo", "speedup"])
+    elif args.comando == "crn":
+        resultados = benchmark_crn(
+            args.simulacoes, args.tamanho_pop, args.tamanho_individuo,
+            args.referencia, args.repeticoes, args.engine
+        )
+        _imprimir_tabela(resultados, ["simulacoes", "crn", "spearman", "pais_iguais", "tempo"])
+    elif args.comando == "tabuleiro":
+        resultados = benchmark_tabuleiro(args.tamanhos, args.jogadas)
+        _imprimir_tabela(resultados, ["grid_len", "logic_mov_s", "tabuleiro_mov_s", "speedup"])
+    elif args.comando == "genoma":
+        resultados = benchmark_genoma(args.tamanhos_pop, args.tamanho_individuo)
+        _imprimir_tabela(resultados, [
+            "tamanho_pop", "mem_listas_mb", "mem_matriz_mb",
+            "geracao_listas_s", "geracao_matriz_s", "speedup"
+        ])
+    elif args.comando == "suite":
+        suite = benchmark_suite(
+            args.motores, args.executores, args.tamanhos,
+            args.simulacoes, args.geracoes, args.repeticoes
+        )
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(suite, arquivo, indent=2)
+        linhas = [
+            {"medida": nome, "valor": medida["valor"], "unidade": medida["unidade"]}
+            for nome, medida in suite["resultados"].items()
+        ]
+        _imprimir_tabela(linhas, ["medida", "valor", "unidade"])
+    elif args.comando == "comparar":
+        with open(args.base, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        with open(args.atual, encoding="utf-8") as arquivo:
+            atual = json.load(arquivo)
+        comparacoes = comparar(base, atual, args.limite)
+        _imprimir_tabela(comparacoes, ["medida", "base", "atual", "variacao", "regressao"])
+        regressoes = [linha["medida"] for linha in comparacoes if linha["regressao"]]
+        if regressoes:
+            print(f"{len(regressoes)} regressões acima de {args.limite:.0%}: {', '.join(regressoes)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
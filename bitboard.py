@@ -0,0 +1,200 @@
+# Motor do 2048 em bitboard de 64 bits
+#
+# O tabuleiro 4x4 é guardado em um único inteiro: cada célula ocupa 4 bits
+# com o expoente log2 do tile (0 = vazio, 1 = 2, 2 = 4, ..., 11 = 2048).
+# A linha i ocupa os bits 16*i .. 16*i+15 e a coluna j o nibble j da linha.
+# Os movimentos usam tabelas de 65536 entradas (uma por linha possível),
+# construídas uma única vez no primeiro uso.
+
+import random
+
+LINHAS = 4
+MASCARA_LINHA = 0xFFFF
+EXPOENTE_MAXIMO = 0xF
+EXPOENTE_VITORIA = 11  # 2048
+
+_tabelas = {}
+
+
+def _mover_linha_esquerda(linha: int) -> int:
+    celulas = [(linha >> (4 * j)) & 0xF for j in range(LINHAS)]
+    # compress -> merge -> compress, igual ao logic.cover_up/merge
+    compactada = [v for v in celulas if v != 0]
+    resultado = []
+    j = 0
+    while j < len(compactada):
+        if j + 1 < len(compactada) and compactada[j] == compactada[j + 1]:
+            resultado.append(min(compactada[j] + 1, EXPOENTE_MAXIMO))
+            j += 2
+        else:
+            resultado.append(compactada[j])
+            j += 1
+    resultado += [0] * (LINHAS - len(resultado))
+    nova = 0
+    for j, v in enumerate(resultado):
+        nova |= v << (4 * j)
+    return nova
+
+
+def _inverter_linha(linha: int) -> int:
+    return (
+        ((linha & 0x000F) << 12) | ((linha & 0x00F0) << 4)
+        | ((linha & 0x0F00) >> 4) | ((linha & 0xF000) >> 12)
+    )
+
+
+def _construir_tabelas() -> dict:
+    esquerda = [0] * 65536
+    direita = [0] * 65536
+    maximo = [0] * 65536
+    for linha in range(65536):
+        esquerda[linha] = _mover_linha_esquerda(linha)
+        direita[_inverter_linha(linha)] = _inverter_linha(esquerda[linha])
+        maximo[linha] = max((linha >> (4 * j)) & 0xF for j in range(LINHAS))
+    return {"esquerda": esquerda, "direita": direita, "maximo": maximo}
+
+
+def tabelas() -> dict:
+    if not _tabelas:
+        _tabelas.update(_construir_tabelas())
+    return _tabelas
+
+
+def transpose(board: int) -> int:
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _aplicar_tabela(board: int, tabela: list[int]) -> int:
+    return (
+        tabela[board & MASCARA_LINHA]
+        | (tabela[(board >> 16) & MASCARA_LINHA] << 16)
+        | (tabela[(board >> 32) & MASCARA_LINHA] << 32)
+        | (tabela[(board >> 48) & MASCARA_LINHA] << 48)
+    )
+
+
+def left(board: int) -> tuple[int, bool]:
+    novo = _aplicar_tabela(board, tabelas()["esquerda"])
+    return novo, novo != board
+
+
+def right(board: int) -> tuple[int, bool]:
+    novo = _aplicar_tabela(board, tabelas()["direita"])
+    return novo, novo != board
+
+
+def up(board: int) -> tuple[int, bool]:
+    novo = transpose(_aplicar_tabela(transpose(board), tabelas()["esquerda"]))
+    return novo, novo != board
+
+
+def down(board: int) -> tuple[int, bool]:
+    novo = transpose(_aplicar_tabela(transpose(board), tabelas()["direita"]))
+    return novo, novo != board
+
+
+def get_cell(board: int, i: int, j: int) -> int:
+    return (board >> (16 * i + 4 * j)) & 0xF
+
+
+def encode(mat: list[list[int]]) -> int:
+    board = 0
+    for i, linha in enumerate(mat):
+        for j, valor in enumerate(linha):
+            if valor:
+                board |= (valor.bit_length() - 1) << (16 * i + 4 * j)
+    return board
+
+
+def decode(board: int) -> list[list[int]]:
+    return [
+        [(1 << e) if (e := get_cell(board, i, j)) else 0 for j in range(LINHAS)]
+        for i in range(LINHAS)
+    ]
+
+
+def max_tile(board: int) -> int:
+    maximo = tabelas()["maximo"]
+    expoente = max(
+        maximo[board & MASCARA_LINHA],
+        maximo[(board >> 16) & MASCARA_LINHA],
+        maximo[(board >> 32) & MASCARA_LINHA],
+        maximo[(board >> 48) & MASCARA_LINHA],
+    )
+    return (1 << expoente) if expoente else 0
+
+
+def add_two(board: int, rng=random) -> int:
+    # Mesmo sorteio por rejeição do logic.add_two: com a mesma semente os dois
+    # motores colocam o tile no mesmo lugar
+    a = rng.randint(0, LINHAS - 1)
+    b = rng.randint(0, LINHAS - 1)
+    while get_cell(board, a, b) != 0:
+        a = rng.randint(0, LINHAS - 1)
+        b = rng.randint(0, LINHAS - 1)
+    return board | (1 << (16 * a + 4 * b))
+
+
+def new_game(rng=random) -> int:
+    return add_two(add_two(0, rng), rng)
+
+
+def _tem_celula_vazia(board: int) -> bool:
+    # Um nibble é zero se nenhum dos seus 4 bits estiver ligado
+    x = board | (board >> 1)
+    x |= x >> 2
+    return (x & 0x1111111111111111) != 0x1111111111111111
+
+
+def _tem_vitoria(board: int) -> bool:
+    for deslocamento in range(0, 64, 4):
+        if (board >> deslocamento) & 0xF == EXPOENTE_VITORIA:
+            return True
+    return False
+
+
+def game_state(board: int) -> str:
+    if _tem_vitoria(board):
+        return 'win'
+    if _tem_celula_vazia(board):
+        return 'not over'
+    # Tabuleiro cheio: só continua se algum movimento mudar o tabuleiro
+    if left(board)[1] or up(board)[1]:
+        return 'not over'
+    return 'lose'
+
+
+movimentos = {
+    'up': up,
+    'down': down,
+    'left': left,
+    'right': right
+}
+
+
+def executar_jogo(individuo: list[str], rng=random) -> tuple[int, int]:
+    board = new_game(rng)
+    movimentos_validos = 0
+
+    for movimento in individuo:
+        funcao = movimentos.get(movimento)
+        if funcao is None:
+            continue
+
+        if game_state(board) in ('lose', 'win'):
+            break
+
+        board, movimento_realizado = funcao(board)
+
+        if movimento_realizado:
+            board = add_two(board, rng)
+            movimentos_validos += 1
+
+    return max_tile(board), movimentos_validos
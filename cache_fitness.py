@@ -0,0 +1,130 @@
+# Cache de fitness por genoma
+#
+# gerar_nova_populacao copia os pais sem alteração para a próxima geração e
+# filhos repetidos aparecem com frequência, então boa parte dos indivíduos
+# avaliados a cada geração já foi simulada antes. O cache guarda o resultado
+# de fitness indexado por um hash compacto do genoma, com descarte LRU quando
+# passa do tamanho máximo.
+#
+# Políticas:
+#   "reusar"  -> um acerto devolve o resultado guardado, sem simular de novo
+#   "mesclar" -> o indivíduo é simulado de novo e as simulações novas são
+#                somadas à estimativa guardada (média ponderada pelo número
+#                de simulações), refinando a fitness dos pais que sobrevivem
+#
+# O contexto (engine, simulações por avaliação, semente crn) entra na chave:
+# um resultado só é reaproveitado sob as mesmas condições em que foi
+# simulado. No modo crn a semente muda a cada geração, então o cache só
+# junta repetidos da própria geração e ninguém carrega a fita de outra.
+
+import hashlib
+from collections import OrderedDict
+import estatisticas
+
+POLITICAS = ("reusar", "mesclar")
+
+
+def chave_genoma(individuo: list[str], contexto: tuple = None) -> bytes:
+    # str() também cobre genomas de pesos (floats)
+    texto = "\n".join(map(str, individuo))
+    if contexto is not None:
+        texto += "\0" + repr(contexto)
+    return hashlib.blake2b(texto.encode(), digest_size=16).digest()
+
+
+def mesclar_resultados(anterior: dict, n_anterior: int, novo: dict, n_novo: int) -> dict:
+    total = n_anterior + n_novo
+    if total == 0:
+        return novo
+
+    def media(campo):
+        return (anterior[campo] * n_anterior + novo[campo] * n_novo) / total
+
+    mesclado = {
+        "media_tile": media("media_tile"),
+        "media_movimentos": media("media_movimentos"),
+        "maior_tile": max(anterior["maior_tile"], novo["maior_tile"]),
+        "distribuicao_tiles": {
+            limite: anterior["distribuicao_tiles"].get(limite, 0) + quantidade
+            for limite, quantidade in novo["distribuicao_tiles"].items()
+        }
+    }
+    # O agregador só continua se os dois lados têm todos os jogos
+    if "estatisticas" in anterior and "estatisticas" in novo:
+        mesclado["estatisticas"] = estatisticas.mesclar_dicts(
+            anterior["estatisticas"], novo["estatisticas"]
+        )
+    return mesclado
+
+
+class CacheFitness:
+    def __init__(self, tamanho_max: int = 1024, politica: str = "reusar"):
+        if politica not in POLITICAS:
+            raise ValueError(f"política de cache desconhecida: {politica!r}")
+        self.tamanho_max = tamanho_max
+        self.politica = politica
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        # chave -> (resultado, número de simulações da estimativa)
+        self._entradas = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def contem(self, individuo: list[str], contexto: tuple = None) -> bool:
+        # Sem contar acerto nem mexer na ordem do LRU; o contexto é o mesmo
+        # passado ao obter/guardar
+        return chave_genoma(individuo, contexto) in self._entradas
+
+    def obter(self, individuo: list[str], contexto: tuple = None):
+        chave = chave_genoma(individuo, contexto)
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        self._entradas.move_to_end(chave)
+        return entrada[0]
+
+    def simulacoes(self, individuo: list[str], contexto: tuple = None) -> int:
+        entrada = self._entradas.get(chave_genoma(individuo, contexto))
+        return 0 if entrada is None else entrada[1]
+
+    def guardar(
+        self, individuo: list[str], resultado: dict, num_simulacoes: int, contexto: tuple = None
+    ) -> dict:
+        chave = chave_genoma(individuo, contexto)
+        anterior = self._entradas.get(chave)
+        if anterior is not None and self.politica == "mesclar":
+            resultado = mesclar_resultados(anterior[0], anterior[1], resultado, num_simulacoes)
+            num_simulacoes += anterior[1]
+
+        self._entradas[chave] = (resultado, num_simulacoes)
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.tamanho_max:
+            self._entradas.popitem(last=False)
+            self.descartes += 1
+        return resultado
+
+    def entradas(self) -> list[tuple[bytes, dict, int]]:
+        # (chave, resultado, simulações), da menos para a mais recente
+        return [(chave, resultado, n) for chave, (resultado, n) in self._entradas.items()]
+
+    def restaurar(self, chave: bytes, resultado: dict, num_simulacoes: int):
+        # Recoloca uma entrada exportada por entradas() sem contar acerto/falha
+        self._entradas[chave] = (resultado, num_simulacoes)
+        self._entradas.move_to_end(chave)
+
+    def limpar(self):
+        self._entradas.clear()
+
+    def estatisticas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "tamanho": len(self._entradas),
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+        }
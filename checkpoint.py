@@ -0,0 +1,199 @@
+# Checkpoints binários das execuções de rodar_ag
+#
+# Layout do arquivo (little-endian):
+#   MAGICO (8 bytes) | versão u32 | tamanho do JSON u32
+#   JSON com os parâmetros da execução, a próxima geração, a melhor fitness,
+#   o que mais for preciso para retomar e (início, tamanho) de cada bloco
+#   blocos binários, alinhados em 8 bytes:
+#     genomas  tamanho_pop * tamanho_individuo bytes, um código por gene
+#     melhor   tamanho_individuo bytes do melhor indivíduo global
+#     random   625 u32 do estado do Mersenne Twister do módulo random
+#     cache    entradas de 60 bytes em ordem LRU: chave blake2b do genoma,
+#              médias, maior tile, distribuição e número de simulações
+#
+# O arquivo é escrito em <caminho>.tmp, sincronizado em disco e só então
+# trocado pelo anterior com os.replace, então um checkpoint nunca fica pela
+# metade. A leitura usa mmap: abrir só interpreta o cabeçalho e os genomas
+# são decodificados sob demanda, um indivíduo por vez se for o caso.
+
+import json
+import mmap
+import os
+import struct
+import cache_fitness
+
+MAGICO = b"AG2048CK"
+VERSAO = 1
+MOVIMENTOS = ('up', 'down', 'left', 'right')
+CODIGOS = {movimento: codigo for codigo, movimento in enumerate(MOVIMENTOS)}
+LIMITES = (128, 256, 512, 1024, 2048)
+
+_CABECALHO = struct.Struct("<8sII")
+_ESTADO_RANDOM = struct.Struct("<625I")
+_ENTRADA_CACHE = struct.Struct("<16sddI5II")
+
+
+def _alinhar(posicao: int) -> int:
+    return -(-posicao // 8) * 8
+
+
+def _codificar(individuo: list[str]) -> bytes:
+    return bytes(map(CODIGOS.__getitem__, individuo))
+
+
+def _decodificar(codigos) -> list[str]:
+    return list(map(MOVIMENTOS.__getitem__, codigos))
+
+
+def _empacotar_cache(cache) -> bytes:
+    if cache is None:
+        return b""
+    blocos = []
+    for chave, resultado, num_simulacoes in cache.entradas():
+        distribuicao = resultado["distribuicao_tiles"]
+        blocos.append(_ENTRADA_CACHE.pack(
+            chave, resultado["media_tile"], resultado["media_movimentos"], resultado["maior_tile"],
+            *(distribuicao.get(limite, 0) for limite in LIMITES), num_simulacoes
+        ))
+    return b"".join(blocos)
+
+
+def salvar(
+    caminho: str,
+    geracao: int,
+    parametros: dict,
+    populacao: list[list[str]],
+    melhor_fitness: float,
+    melhor_individuo: list[str],
+    estado_random: tuple,
+    cache=None,
+    extras: dict = None
+):
+    versao_random, estado_mt, gauss = estado_random
+    blocos = {
+        "genomas": b"".join(_codificar(individuo) for individuo in populacao),
+        "melhor": _codificar(melhor_individuo or []),
+        "random": _ESTADO_RANDOM.pack(*estado_mt),
+        "cache": _empacotar_cache(cache),
+    }
+
+    posicao = 0
+    indice = {}
+    for nome, dados in blocos.items():
+        indice[nome] = (posicao, len(dados))
+        posicao = _alinhar(posicao + len(dados))
+
+    cabecalho = json.dumps({
+        "geracao": geracao,
+        "parametros": parametros,
+        "tamanho_pop": len(populacao),
+        "tamanho_individuo": len(populacao[0]) if populacao else 0,
+        "melhor_fitness": melhor_fitness,
+        "versao_random": versao_random,
+        "gauss_random": gauss,
+        "cache": None if cache is None else {"tamanho_max": cache.tamanho_max, "politica": cache.politica},
+        "extras": extras or {},
+        "blocos": indice,
+    }).encode()
+    inicio_dados = _alinhar(_CABECALHO.size + len(cabecalho))
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(MAGICO, VERSAO, len(cabecalho)))
+        arquivo.write(cabecalho)
+        for nome, dados in blocos.items():
+            arquivo.seek(inicio_dados + indice[nome][0])
+            arquivo.write(dados)
+        arquivo.truncate(inicio_dados + posicao)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+class Checkpoint:
+    def __init__(self, caminho: str):
+        self._arquivo = open(caminho, "rb")
+        try:
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            magico, versao, tamanho = _CABECALHO.unpack_from(self._mapa, 0)
+            if magico != MAGICO:
+                raise ValueError(f"{caminho!r} não é um checkpoint do AG")
+            if versao != VERSAO:
+                raise ValueError(f"versão de checkpoint não suportada: {versao}")
+        except Exception:
+            self._arquivo.close()
+            raise
+
+        self.cabecalho = json.loads(self._mapa[_CABECALHO.size:_CABECALHO.size + tamanho])
+        self._inicio_dados = _alinhar(_CABECALHO.size + tamanho)
+        self.geracao = self.cabecalho["geracao"]
+        self.parametros = self.cabecalho["parametros"]
+        self.tamanho_pop = self.cabecalho["tamanho_pop"]
+        self.tamanho_individuo = self.cabecalho["tamanho_individuo"]
+        self.melhor_fitness = self.cabecalho["melhor_fitness"]
+        self.extras = self.cabecalho["extras"]
+
+    def __len__(self) -> int:
+        return self.tamanho_pop
+
+    def _faixa(self, bloco: str) -> tuple[int, int]:
+        inicio, tamanho = self.cabecalho["blocos"][bloco]
+        inicio += self._inicio_dados
+        return inicio, inicio + tamanho
+
+    def genoma(self, indice: int) -> list[str]:
+        if not 0 <= indice < self.tamanho_pop:
+            raise IndexError(indice)
+        inicio, _ = self._faixa("genomas")
+        inicio += indice * self.tamanho_individuo
+        return _decodificar(self._mapa[inicio:inicio + self.tamanho_individuo])
+
+    def genomas(self) -> memoryview:
+        # Códigos crus sem cópia (np.frombuffer aceita direto); libere a view
+        # antes de fechar o checkpoint
+        inicio, fim = self._faixa("genomas")
+        return memoryview(self._mapa)[inicio:fim]
+
+    def populacao(self) -> list[list[str]]:
+        return [self.genoma(i) for i in range(self.tamanho_pop)]
+
+    def melhor_individuo(self) -> list[str]:
+        inicio, fim = self._faixa("melhor")
+        return _decodificar(self._mapa[inicio:fim]) if fim > inicio else None
+
+    def estado_random(self) -> tuple:
+        inicio, _ = self._faixa("random")
+        estado_mt = _ESTADO_RANDOM.unpack_from(self._mapa, inicio)
+        return self.cabecalho["versao_random"], estado_mt, self.cabecalho["gauss_random"]
+
+    def cache(self):
+        configuracao = self.cabecalho["cache"]
+        if configuracao is None:
+            return None
+        cache = cache_fitness.CacheFitness(configuracao["tamanho_max"], configuracao["politica"])
+        inicio, fim = self._faixa("cache")
+        for posicao in range(inicio, fim, _ENTRADA_CACHE.size):
+            campos = _ENTRADA_CACHE.unpack_from(self._mapa, posicao)
+            chave, media_tile, media_movimentos, maior_tile = campos[:4]
+            distribuicao, num_simulacoes = campos[4:9], campos[9]
+            cache.restaurar(chave, {
+                "media_tile": media_tile,
+                "media_movimentos": media_movimentos,
+                "maior_tile": maior_tile,
+                "distribuicao_tiles": dict(zip(LIMITES, distribuicao)),
+            }, num_simulacoes)
+        return cache
+
+    def fechar(self):
+        self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def carregar(caminho: str) -> Checkpoint:
+    return Checkpoint(caminho)
@@ -0,0 +1,255 @@
+# Linha de comando do AG: python -m cli --geracoes 50 --tamanho-pop 150 ...
+#
+# Os padrões reproduzem a execução que ficava no fim do algorithm.py
+# (50 gerações, 150 indivíduos, 500 genes, 10% de mutação, 10 simulações).
+
+import argparse
+import contextlib
+import algorithm as ag
+import cache_fitness
+import estatisticas
+import estacionario
+import executores
+import expectimax
+import ilhas
+import parada
+import registro
+import servidor
+from telemetria import Telemetria
+
+MOTORES = ['logic', 'bitboard', 'tabuleiro', 'numpy']
+GERACOES = 50
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Algoritmo genético do 2048")
+    parser.add_argument("--geracoes", type=int, default=None,
+                        help="número de gerações (padrão: 50, ou o do checkpoint ao retomar)")
+    parser.add_argument("--tamanho-pop", type=int, default=150)
+    parser.add_argument("--tamanho-individuo", type=int, default=500)
+    parser.add_argument("--taxa-mutacao", type=float, default=0.10)
+    parser.add_argument("--simulacoes", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", choices=MOTORES, default="logic")
+    parser.add_argument("--executor", choices=sorted(executores.EXECUTORES), default="serial")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--servidor", default=None,
+                        help="host:porta ou socket Unix de um servidor.py (substitui o --executor)")
+    parser.add_argument("--log", default=None,
+                        help="log de texto por geração (padrão: log_ag_<taxa>%%.txt; '' desliga)")
+    parser.add_argument("--telemetria", default=None, help="arquivo de telemetria por geração")
+    parser.add_argument("--registro", default=None,
+                        help="banco SQLite com execuções, gerações e indivíduos (registro.py)")
+    parser.add_argument("--registro-sem-individuos", action="store_true",
+                        help="no --registro, guarda só as métricas por geração")
+    parser.add_argument("--formato-telemetria", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--gravacao", default=None,
+                        help="grava uma partida do melhor indivíduo (python puzzle.py --replay)")
+    parser.add_argument("--checkpoint", default=None, help="arquivo de checkpoint")
+    parser.add_argument("--intervalo-checkpoint", type=int, default=1)
+    parser.add_argument("--retomar", action="store_true",
+                        help="continua a execução salva em --checkpoint")
+    parser.add_argument("--cache", type=int, default=None,
+                        help="tamanho do cache de fitness (0 desliga; padrão: 2 gerações)")
+    parser.add_argument("--politica-cache", choices=cache_fitness.POLITICAS, default="reusar")
+    parser.add_argument("--estatisticas", action="store_true",
+                        help="percentis e histograma dos jogos por geração no log e na telemetria")
+    parser.add_argument("--crn", action="store_true", help="mesmas sequências aleatórias para todos")
+    parser.add_argument("--genoma-compacto", action="store_true", help="população em matriz uint8")
+    parser.add_argument("--genoma", choices=ag.TIPOS_GENOMA, default="sequencia",
+                        help="sequência de movimentos ou pesos de uma heurística (pesos.py)")
+    parser.add_argument("--expectimax", type=int, default=0,
+                        help="indivíduos da população inicial jogados pelo expectimax")
+    parser.add_argument("--profundidade-expectimax", type=int, default=expectimax.PROFUNDIDADE_ABERTURAS,
+                        help="profundidade da busca do --expectimax (sem limite de tempo)")
+    parser.add_argument("--parar-estagnacao", type=int, default=None,
+                        help="para após N gerações sem o melhor fitness subir --melhora-minima")
+    parser.add_argument("--melhora-minima", type=float, default=0.0)
+    parser.add_argument("--tile-alvo", type=int, default=None, help="para quando algum jogo alcançar o tile")
+    parser.add_argument("--tempo-maximo", type=float, default=None, help="orçamento em segundos")
+    parser.add_argument("--simulacoes-maximas", type=int, default=None, help="orçamento de jogos simulados")
+    parser.add_argument("--adaptar-mutacao", type=int, default=None,
+                        help="dobra a taxa de mutação a cada N gerações sem melhora")
+    parser.add_argument("--estacionario", type=int, default=None, metavar="AVALIACOES",
+                        help="estado estacionário com esse orçamento de avaliações, sem gerações")
+    parser.add_argument("--substituicao", choices=estacionario.SUBSTITUICOES, default="pior",
+                        help="no --estacionario: quem o filho substitui")
+    parser.add_argument("--intervalo-metricas", type=int, default=None,
+                        help="no --estacionario: avaliações por linha de métricas (padrão: --tamanho-pop)")
+    parser.add_argument("--ilhas", type=int, default=1,
+                        help="número de ilhas, cada uma com --tamanho-pop indivíduos em um processo")
+    parser.add_argument("--topologia", choices=ilhas.TOPOLOGIAS, default="anel")
+    parser.add_argument("--intervalo-migracao", type=int, default=5)
+    parser.add_argument("--migrantes", type=int, default=2)
+    return parser
+
+
+def _cache(args):
+    if args.cache == 0:
+        return False
+    tamanho = 2 * args.tamanho_pop if args.cache is None else args.cache
+    return cache_fitness.CacheFitness(tamanho, args.politica_cache)
+
+
+def _populacao_inicial(args):
+    if not args.expectimax:
+        return None
+    return expectimax.gerar_individuos(
+        args.expectimax, args.tamanho_individuo, args.seed,
+        expectimax.jogador_aberturas(args.profundidade_expectimax)
+    )
+
+
+def _parada(args):
+    opcoes = (
+        args.parar_estagnacao, args.tile_alvo, args.tempo_maximo,
+        args.simulacoes_maximas, args.adaptar_mutacao
+    )
+    if all(opcao is None for opcao in opcoes):
+        return None
+    return parada.CriteriosParada(
+        args.parar_estagnacao, args.melhora_minima, args.tile_alvo, args.tempo_maximo,
+        args.simulacoes_maximas, args.adaptar_mutacao
+    )
+
+
+def main(argv: list[str] = None) -> tuple[float, list[str]]:
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if args.log is None:
+        args.log = ag.caminho_log_padrao(args.taxa_mutacao)
+    if args.retomar and args.checkpoint is None:
+        parser.error("--retomar precisa de --checkpoint")
+    if args.ilhas > 1:
+        # Cada ilha roda o rodar_ag básico no próprio processo: o resto seria ignorado
+        incompativeis = {
+            "--genoma": args.genoma != "sequencia",
+            "--checkpoint": args.checkpoint is not None,
+            "--retomar": args.retomar,
+            "--telemetria": args.telemetria is not None,
+            "--registro": args.registro is not None,
+            "--cache": args.cache is not None,
+            "--politica-cache": args.politica_cache != "reusar",
+            "--crn": args.crn,
+            "--genoma-compacto": args.genoma_compacto,
+            "--executor": args.executor != "serial",
+            "--processos": args.processos is not None,
+            "--servidor": args.servidor is not None,
+            "--expectimax": args.expectimax > 0,
+            "--gravacao": args.gravacao is not None,
+            "--estatisticas": args.estatisticas,
+            "--parar-estagnacao/--tile-alvo/--tempo-maximo/--simulacoes-maximas/--adaptar-mutacao":
+                _parada(args) is not None,
+        }
+        usadas = [nome for nome, valor in incompativeis.items() if valor]
+        if usadas:
+            parser.error(f"--ilhas não combina com {', '.join(usadas)}")
+    if args.estacionario is not None:
+        # Opções que só o rodar_ag entende: no estado estacionário seriam ignoradas
+        incompativeis = {
+            "--geracoes": args.geracoes is not None,
+            "--ilhas": args.ilhas > 1,
+            "--checkpoint": args.checkpoint is not None,
+            "--retomar": args.retomar,
+            "--cache": args.cache is not None,
+            "--estatisticas": args.estatisticas,
+            "--crn": args.crn,
+            "--genoma-compacto": args.genoma_compacto,
+            "--expectimax": args.expectimax > 0,
+            "--gravacao": args.gravacao is not None,
+            "--parar-estagnacao/--tile-alvo/--tempo-maximo/--simulacoes-maximas/--adaptar-mutacao":
+                _parada(args) is not None,
+        }
+        usadas = [nome for nome, valor in incompativeis.items() if valor]
+        if usadas:
+            parser.error(f"--estacionario não combina com {', '.join(usadas)}")
+
+    if args.ilhas > 1:
+        modelo = ilhas.ModeloIlhas(
+            args.ilhas, args.topologia, args.intervalo_migracao, args.migrantes
+        )
+        melhor_fitness, melhor_individuo = modelo.rodar(
+            GERACOES if args.geracoes is None else args.geracoes,
+            args.tamanho_pop, args.tamanho_individuo, args.taxa_mutacao,
+            args.simulacoes, args.engine, args.seed, args.log or None
+        )
+        print(f"Ilhas: {args.ilhas} ({args.topologia}), migrações: {modelo.migracoes}")
+    else:
+        criterios = _parada(args)
+        jogos = estatisticas.EstatisticasJogos() if args.estatisticas else None
+        melhor_fitness, melhor_individuo = _rodar(args, criterios, jogos)
+        if jogos is not None and jogos.n:
+            resumo = jogos.resumo()
+            print(
+                f"Jogos: {resumo['jogos']}, tile p50 {resumo['tile_p50']}, p95 {resumo['tile_p95']}, "
+                f"movimentos p50 {resumo['movimentos_p50']:.0f}"
+            )
+        if criterios is not None and criterios.motivo is not None:
+            relatorio = criterios.relatorio()
+            print(
+                f"Parada antecipada ({relatorio['motivo']}) após {relatorio['geracoes']} gerações: "
+                f"{relatorio['geracoes_economizadas']} gerações economizadas"
+            )
+
+    print(f"Melhor fitness: {melhor_fitness:.2f}")
+    if args.genoma == "sequencia":
+        print(f"Melhor indivíduo: {len(melhor_individuo)} movimentos")
+    else:
+        print("Melhor indivíduo: " + ", ".join(f"{peso:.3f}" for peso in melhor_individuo))
+    return melhor_fitness, melhor_individuo
+
+
+def _rodar(args, criterios=None, jogos=None) -> tuple[float, list[str]]:
+    if args.servidor:
+        executor = servidor.ExecutorRemoto(args.servidor)
+    else:
+        executor = executores.criar_executor(args.executor, args.processos, semente=args.seed)
+    telemetria = (
+        Telemetria(args.telemetria, args.formato_telemetria)
+        if args.telemetria else contextlib.nullcontext()
+    )
+
+    banco = (
+        registro.RegistroExecucoes(args.registro, not args.registro_sem_individuos)
+        if args.registro else contextlib.nullcontext()
+    )
+
+    with executor, telemetria as telemetria, banco as banco:
+        if args.estacionario is not None:
+            melhor_fitness, melhor_individuo = estacionario.rodar_estacionario(
+                args.estacionario, args.tamanho_pop, args.tamanho_individuo, args.taxa_mutacao,
+                args.simulacoes, args.engine, executor, args.seed, telemetria,
+                caminho_log=args.log or None,
+                substituicao=args.substituicao,
+                intervalo_metricas=args.intervalo_metricas,
+                tipo_genoma=args.genoma,
+                registro=banco
+            )
+        elif args.retomar:
+            melhor_fitness, melhor_individuo = ag.retomar(
+                args.checkpoint, executor, telemetria, populacoes=args.geracoes, parada=criterios,
+                estatisticas=jogos, registro=banco
+            )
+        else:
+            melhor_fitness, melhor_individuo = ag.rodar_ag(
+                GERACOES if args.geracoes is None else args.geracoes,
+                args.tamanho_pop, args.tamanho_individuo, args.taxa_mutacao,
+                args.simulacoes, args.engine, executor, args.seed, telemetria,
+                caminho_log=args.log or None,
+                cache=_cache(args),
+                crn=args.crn,
+                genoma_compacto=args.genoma_compacto,
+                caminho_checkpoint=args.checkpoint,
+                intervalo_checkpoint=args.intervalo_checkpoint,
+                populacao_inicial=_populacao_inicial(args),
+                caminho_gravacao=args.gravacao,
+                parada=criterios,
+                estatisticas=jogos,
+                tipo_genoma=args.genoma,
+                registro=banco
+            )
+    return melhor_fitness, melhor_individuo
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,7 @@ FONT = ("Verdana",40,"bold")
 
 KEY_QUIT = "Escape"
 KEY_BACK = "b"
+KEY_REDO = "n"
 
 KEY_UP = "Up"
 KEY_DOWN = "Down"
@@ -61,4 +62,9 @@ KEY_RIGHT_ALT1 = "d"
 KEY_UP_ALT2 = "i"
 KEY_DOWN_ALT2 = "k"
 KEY_LEFT_ALT2 = "j"
-KEY_RIGHT_ALT2 = "l"
\ No newline at end of file
+KEY_RIGHT_ALT2 = "l"
+KEY_AUTOPLAY = "p"
+AUTOPLAY_DELAY = 50
+REPLAY_SPEED = 30
+REPLAY_FRAME_SKIP = 1
+HISTORY_DEPTH = 1024
@@ -0,0 +1,154 @@
+# Avaliação por corrida (racing / successive halving)
+#
+# avaliar_populacao gasta num_simulacoes jogos com cada indivíduo, inclusive
+# os que depois de dois jogos já estão claramente fora dos num_pais melhores.
+# Aqui todos começam com poucas simulações e, a cada rodada, calculamos um
+# intervalo de confiança para media_tile. Quem não alcança mais a fronteira
+# dos num_pais melhores (ou já está garantido nela) para de ser simulado; os
+# demais dobram o número de simulações, até o teto de num_simulacoes.
+#
+# O retorno tem o mesmo formato de avaliar_populacao, então selecionar_pais e
+# gerar_nova_populacao continuam funcionando sem mudança.
+
+import math
+import random
+import algorithm as ag
+
+
+def _simular_tarefa(tarefa: tuple) -> list[tuple[int, int]]:
+    individuo, quantidade, engine, semente = tarefa
+    rng = random if semente is None else random.Random(semente)
+    if engine == 'numpy':
+        import lote  # pylint: disable=import-outside-toplevel
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        tiles, movimentos = lote.simular(individuo, quantidade, np.random.default_rng(rng.getrandbits(64)))
+        return list(zip(tiles.tolist(), movimentos.tolist()))
+    return [ag.executar_jogo(individuo, engine, rng) for _ in range(quantidade)]
+
+
+class _Estatistica:
+    def __init__(self):
+        self.n = 0
+        self.soma = 0.0
+        self.soma_quadrados = 0.0
+        self.soma_movimentos = 0
+        self.maior_tile = 0
+        self.distribuicao = {128: 0, 256: 0, 512: 0, 1024: 0, 2048: 0}
+
+    def adicionar(self, jogos: list[tuple[int, int]]):
+        for maior_tile, movimentos in jogos:
+            self.n += 1
+            self.soma += maior_tile
+            self.soma_quadrados += maior_tile * maior_tile
+            self.soma_movimentos += movimentos
+            self.maior_tile = max(self.maior_tile, maior_tile)
+            for limite in self.distribuicao:
+                if maior_tile >= limite:
+                    self.distribuicao[limite] += 1
+
+    def media(self) -> float:
+        return self.soma / self.n if self.n else 0.0
+
+    def desvio(self) -> float:
+        if self.n < 2:
+            return 0.0
+        variancia = (self.soma_quadrados - self.soma * self.soma / self.n) / (self.n - 1)
+        return math.sqrt(max(variancia, 0.0))
+
+    def resultado(self) -> dict:
+        return {
+            "media_tile": self.media(),
+            "media_movimentos": self.soma_movimentos / self.n if self.n else 0.0,
+            "maior_tile": self.maior_tile,
+            "distribuicao_tiles": dict(self.distribuicao),
+            "num_simulacoes": self.n,
+        }
+
+
+class AvaliadorCorrida:
+    def __init__(self, num_pais: int, simulacoes_iniciais: int = 2, z: float = 1.96):
+        self.num_pais = num_pais
+        self.simulacoes_iniciais = simulacoes_iniciais
+        self.z = z
+        self.simulacoes_gastas = 0
+        self.orcamento_fixo = 0
+        self.rodadas = 0
+
+    def _intervalos(self, estatisticas: list[_Estatistica]) -> list[tuple[float, float]]:
+        # Com 2 ou 3 jogos o desvio de um indivíduo costuma sair zero (mesmo
+        # maior tile); o desvio de todos os jogos da geração serve de piso
+        jogos = sum(e.n for e in estatisticas)
+        soma = sum(e.soma for e in estatisticas)
+        soma_quadrados = sum(e.soma_quadrados for e in estatisticas)
+        desvio_geral = 0.0
+        if jogos > 1:
+            desvio_geral = math.sqrt(max((soma_quadrados - soma * soma / jogos) / (jogos - 1), 0.0))
+
+        intervalos = []
+        for e in estatisticas:
+            meia_largura = self.z * max(e.desvio(), desvio_geral) / math.sqrt(e.n)
+            intervalos.append((e.media() - meia_largura, e.media() + meia_largura))
+        return intervalos
+
+    def _em_disputa(self, estatisticas: list[_Estatistica], num_simulacoes: int) -> list[int]:
+        intervalos = self._intervalos(estatisticas)
+        k = min(self.num_pais, len(estatisticas))
+        if k == len(estatisticas):
+            return []
+        inferiores = sorted((inf for inf, _ in intervalos), reverse=True)
+        superiores = sorted((sup for _, sup in intervalos), reverse=True)
+        # Fora: nem o limite superior alcança o k-ésimo melhor limite inferior.
+        # Garantido: o limite inferior supera o (k+1)-ésimo melhor limite superior.
+        corte_fora = inferiores[k - 1]
+        corte_dentro = superiores[k]
+        return [
+            i for i, (inf, sup) in enumerate(intervalos)
+            if estatisticas[i].n < num_simulacoes and sup >= corte_fora and inf <= corte_dentro
+        ]
+
+    def avaliar(
+        self,
+        populacao: list[list[str]],
+        num_simulacoes: int,
+        engine: str = 'logic',
+        executor=None,
+        seed: int = None
+    ) -> list[tuple[float, dict, list[str]]]:
+        estatisticas = [_Estatistica() for _ in populacao]
+        pedidos = {i: min(self.simulacoes_iniciais, num_simulacoes) for i in range(len(populacao))}
+        rodada = 0
+
+        while pedidos:
+            tarefas = [
+                (populacao[i], quantidade, engine,
+                 None if seed is None else ag.semente_individuo(ag.semente_individuo(seed, i), rodada))
+                for i, quantidade in pedidos.items()
+            ]
+            if executor is None:
+                jogos = [_simular_tarefa(tarefa) for tarefa in tarefas]
+            else:
+                jogos = executor.mapear(_simular_tarefa, tarefas)
+            for i, resultado in zip(pedidos, jogos):
+                estatisticas[i].adicionar(resultado)
+                self.simulacoes_gastas += len(resultado)
+
+            rodada += 1
+            pedidos = {
+                i: min(estatisticas[i].n, num_simulacoes - estatisticas[i].n)
+                for i in self._em_disputa(estatisticas, num_simulacoes)
+            }
+
+        self.rodadas += rodada
+        self.orcamento_fixo += len(populacao) * num_simulacoes
+        return [
+            (e.media(), e.resultado(), individuo)
+            for e, individuo in zip(estatisticas, populacao)
+        ]
+
+    def relatorio(self) -> dict:
+        return {
+            "simulacoes_gastas": self.simulacoes_gastas,
+            "orcamento_fixo": self.orcamento_fixo,
+            "economia": 1 - self.simulacoes_gastas / self.orcamento_fixo if self.orcamento_fixo else 0.0,
+            "rodadas": self.rodadas,
+        }
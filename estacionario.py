@@ -0,0 +1,230 @@
+# Evolução em estado estacionário, sem barreira entre gerações
+#
+# No rodar_ag cada geração espera o indivíduo mais lento antes de gerar a
+# próxima, e os workers ficam parados nessa espera. Aqui não há gerações:
+# sempre há em_voo avaliações no executor (executor.submeter) e, assim que
+# uma termina, o resultado entra na população e um filho novo, gerado da
+# população daquele momento, ocupa o lugar dela no executor.
+#
+#   população inicial -> avaliada aos poucos; os filhos começam a sair
+#                        quando há pelo menos dois indivíduos avaliados
+#   pais              -> torneio de tamanho_torneio na população atual
+#   substituição      -> 'pior': o filho entra no lugar do pior da população
+#                        se não for pior que ele; 'torneio': no lugar do
+#                        pior de tamanho_torneio sorteados, se não for pior
+#
+# As métricas saem a cada intervalo_metricas avaliações (um "bloco"), sobre a
+# população do momento, com a vazão do bloco. Cada avaliação leva uma
+# semente sorteada do random global, então com o executor serial a execução
+# é reproduzível pela seed; com processos a ordem de chegada dos resultados
+# muda a população e, com ela, os filhos.
+
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+import algorithm as ag
+import executores
+
+SUBSTITUICOES = ("pior", "torneio")
+TAMANHO_TORNEIO = 3
+
+
+def _torneio(populacao: list, tamanho: int, melhor: bool = True) -> int:
+    # Índice do vencedor (ou do perdedor) entre `tamanho` sorteados
+    sorteados = random.sample(range(len(populacao)), min(tamanho, len(populacao)))
+    escolha = max if melhor else min
+    return escolha(sorteados, key=lambda indice: populacao[indice][0])
+
+
+def substituir(
+    populacao: list,
+    avaliado: tuple,
+    tamanho_pop: int,
+    substituicao: str = "pior",
+    tamanho_torneio: int = TAMANHO_TORNEIO
+) -> bool:
+    # Insere (fitness, resultado, individuo); devolve se ele entrou
+    if len(populacao) < tamanho_pop:
+        populacao.append(avaliado)
+        return True
+    if substituicao == "pior":
+        alvo = min(range(len(populacao)), key=lambda indice: populacao[indice][0])
+    else:
+        alvo = _torneio(populacao, tamanho_torneio, melhor=False)
+    if avaliado[0] < populacao[alvo][0]:
+        return False
+    populacao[alvo] = avaliado
+    return True
+
+
+def _gerar_filhos(
+    populacao: list, taxa_mutacao: float, tamanho_torneio: int, tipo_genoma: str
+) -> list:
+    pai1 = populacao[_torneio(populacao, tamanho_torneio)][2]
+    pai2 = populacao[_torneio(populacao, tamanho_torneio)][2]
+    filho1, filho2 = ag.cruzar(pai1, pai2, tipo_genoma)
+    return [ag.mutar(filho1, taxa_mutacao, tipo_genoma), ag.mutar(filho2, taxa_mutacao, tipo_genoma)]
+
+
+def _escrever_bloco(log, bloco: dict):
+    primeira = bloco['avaliacoes'] - bloco['avaliacoes_bloco'] + 1
+    log.write(f"\n📊 Avaliações {primeira}-{bloco['avaliacoes']}:\n")
+    log.write(f"- Melhor fitness: {bloco['melhor_fitness']}\n")
+    log.write(f"- Pior fitness: {bloco['pior_fitness']}\n")
+    log.write(f"- Média fitness: {bloco['medio_fitness']:.2f}\n")
+    log.write(f"- Mediana: {bloco['mediana']}\n")
+    log.write(f"- Desvio padrão: {bloco['desvio_padrao']:.2f}\n")
+    log.write(
+        f"- Tempo do bloco: {bloco['tempo_total']:.2f}s "
+        f"({bloco['avaliacoes_por_segundo']:.1f} avaliações/s)\n"
+    )
+    log.write(f"- Entradas na população: {bloco['substituicoes']}\n")
+
+
+def rodar_estacionario(
+    avaliacoes: int,
+    tamanho_pop: int,
+    tamanho_individuo: int,
+    taxa_mutacao: float,
+    num_simulacoes: int,
+    engine: str = 'logic',
+    executor=None,
+    seed: int = None,
+    telemetria=None,
+    caminho_log: str = None,
+    substituicao: str = "pior",
+    tamanho_torneio: int = TAMANHO_TORNEIO,
+    intervalo_metricas: int = None,
+    em_voo: int = None,
+    tipo_genoma: str = 'sequencia',
+    registro=None
+) -> tuple[float, list[str]]:
+    # avaliacoes é o orçamento total (inclui a população inicial);
+    # intervalo_metricas tem como padrão tamanho_pop, o equivalente a uma
+    # geração. telemetria recebe um registro por bloco e registro
+    # (registro.RegistroExecucoes) grava cada bloco como uma "geração" com
+    # os indivíduos avaliados nele
+    if tamanho_pop < 2:
+        raise ValueError("o estado estacionário precisa de tamanho_pop >= 2")
+    if substituicao not in SUBSTITUICOES:
+        raise ValueError(f"substituição desconhecida: {substituicao!r}")
+    if executor is None:
+        executor = executores.ExecutorSerial()
+    if intervalo_metricas is None:
+        intervalo_metricas = tamanho_pop
+    if em_voo is None:
+        # Com vários workers, uma tarefa a mais por worker esconde o tempo
+        # entre um resultado chegar e o próximo filho ser enviado
+        em_voo = executor.processos if executor.processos == 1 else 2 * executor.processos
+
+    if seed is not None:
+        random.seed(seed)
+    iniciais = ag.generate_population(tamanho_pop, tamanho_individuo, tipo_genoma)
+    iniciais.reverse()
+    filhos = []
+    populacao = []
+    melhor_fitness_global = float('-inf')
+    melhor_individuo_global = None
+
+    parametros = {
+        "modo": "estacionario",
+        "avaliacoes": avaliacoes,
+        "tamanho_pop": tamanho_pop,
+        "tamanho_individuo": tamanho_individuo,
+        "taxa_mutacao": taxa_mutacao,
+        "num_simulacoes": num_simulacoes,
+        "engine": engine,
+        "seed": seed,
+        "substituicao": substituicao,
+        "tamanho_torneio": tamanho_torneio,
+        "intervalo_metricas": intervalo_metricas,
+        "em_voo": em_voo,
+        "tipo_genoma": tipo_genoma,
+    }
+    if registro is not None:
+        registro.iniciar_execucao(parametros)
+
+    pendentes = {}  # Future -> indivíduo
+    enviadas = 0
+    concluidas = 0
+    bloco = 0
+    avaliados_bloco = []
+    substituicoes = 0
+    tempo_espera = 0.0
+    inicio_bloco = time.perf_counter()
+
+    with ag.abrir_log(caminho_log) as log:
+        while concluidas < avaliacoes:
+            # Mantém o executor cheio
+            while len(pendentes) < em_voo and enviadas < avaliacoes:
+                if iniciais:
+                    individuo = iniciais.pop()
+                elif filhos:
+                    individuo = filhos.pop()
+                elif len(populacao) >= 2:
+                    filhos = _gerar_filhos(populacao, taxa_mutacao, tamanho_torneio, tipo_genoma)
+                    individuo = filhos.pop()
+                else:
+                    break
+                tarefa = (
+                    individuo, num_simulacoes, engine, random.getrandbits(64), None, False, tipo_genoma
+                )
+                pendentes[executor.submeter(ag.avaliar_tarefa, tarefa)] = individuo
+                enviadas += 1
+
+            inicio_espera = time.perf_counter()
+            prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            tempo_espera += time.perf_counter() - inicio_espera
+
+            for futuro in prontos:
+                individuo = pendentes.pop(futuro)
+                resultado = futuro.result()
+                avaliado = (resultado["media_tile"], resultado, individuo)
+                concluidas += 1
+                avaliados_bloco.append(avaliado)
+                if substituir(populacao, avaliado, tamanho_pop, substituicao, tamanho_torneio):
+                    substituicoes += 1
+                if avaliado[0] > melhor_fitness_global:
+                    melhor_fitness_global = avaliado[0]
+                    melhor_individuo_global = list(individuo)
+
+                if len(avaliados_bloco) == intervalo_metricas or concluidas == avaliacoes:
+                    tempo_bloco = time.perf_counter() - inicio_bloco
+                    metricas = ag.calcular_metricas([fitness_val for fitness_val, _, _ in populacao])
+                    registro_bloco = {
+                        "bloco": bloco + 1,
+                        "avaliacoes": concluidas,
+                        "avaliacoes_bloco": len(avaliados_bloco),
+                        "tempo_total": tempo_bloco,
+                        "tempo_espera": tempo_espera,
+                        "avaliacoes_por_segundo": (
+                            len(avaliados_bloco) / tempo_bloco if tempo_bloco else 0.0
+                        ),
+                        "jogos_por_segundo": (
+                            len(avaliados_bloco) * num_simulacoes / tempo_bloco if tempo_bloco else 0.0
+                        ),
+                        "substituicoes": substituicoes,
+                        "melhor_fitness_global": melhor_fitness_global,
+                    }
+                    registro_bloco.update(metricas)
+                    if log is not None:
+                        _escrever_bloco(log, registro_bloco)
+                    if telemetria is not None:
+                        telemetria.registrar(registro_bloco)
+                    if registro is not None:
+                        registro.registrar_geracao(
+                            bloco, avaliados_bloco, metricas, num_simulacoes, tempo_bloco, tempo_bloco
+                        )
+                    bloco += 1
+                    avaliados_bloco = []
+                    substituicoes = 0
+                    tempo_espera = 0.0
+                    inicio_bloco = time.perf_counter()
+
+        if log is not None and melhor_individuo_global is not None:
+            ag.escrever_melhor(log, melhor_fitness_global, melhor_individuo_global, tipo_genoma)
+
+    if registro is not None:
+        registro.finalizar_execucao(melhor_fitness_global, melhor_individuo_global)
+
+    return melhor_fitness_global, melhor_individuo_global
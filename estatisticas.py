@@ -0,0 +1,235 @@
+# Estatísticas dos jogos em fluxo: agregadores de memória constante
+#
+# Cada jogo entra uma vez (maior tile e movimentos válidos) e nada é
+# guardado por jogo:
+#
+#   Acumulador      -> n, média e variância pelo método de Welford, mínimo
+#                      e máximo
+#   HistogramaTiles -> uma contagem por potência de 2 (tiles até 2^17, o
+#                      maior possível no 4x4); os percentis de tile saem
+#                      exatos, já que todo tile é uma potência de 2
+#   EsbocoQuantis   -> percentis aproximados de valores positivos em baldes
+#                      logarítmicos de largura relativa `precisao` (o
+#                      percentil devolvido erra no máximo isso, relativo)
+#
+# Tudo se mescla em O(tamanho do agregador): simulações de um indivíduo,
+# indivíduos avaliados em workers diferentes e gerações inteiras.
+# para_dict() produz só listas e números, então o agregador atravessa
+# processos, o servidor de fitness (JSON) e o cache junto com o resultado.
+
+import math
+
+EXPOENTE_MAXIMO = 17
+PRECISAO = 0.01
+
+
+class Acumulador:
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def adicionar(self, valor: float):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+
+    def mesclar(self, outro: "Acumulador") -> "Acumulador":
+        # Combinação de Chan et al. das duas médias e somas de quadrados
+        if outro.n == 0:
+            return self
+        total = self.n + outro.n
+        delta = outro.media - self.media
+        self.m2 += outro.m2 + delta * delta * self.n * outro.n / total
+        self.media += delta * outro.n / total
+        self.n = total
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        return self
+
+    def variancia(self) -> float:
+        # Amostral, como statistics.variance
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def desvio(self) -> float:
+        return math.sqrt(self.variancia())
+
+    def para_lista(self) -> list:
+        return [self.n, self.media, self.m2, self.minimo, self.maximo]
+
+    @classmethod
+    def de_lista(cls, dados: list) -> "Acumulador":
+        acumulador = cls()
+        acumulador.n, acumulador.media, acumulador.m2, acumulador.minimo, acumulador.maximo = dados
+        return acumulador
+
+
+class HistogramaTiles:
+    def __init__(self, contagens: list[int] = None):
+        # contagens[e] = jogos cujo maior tile foi 2^e (e = 0 é o tabuleiro vazio)
+        self.contagens = list(contagens) if contagens else [0] * (EXPOENTE_MAXIMO + 1)
+
+    def adicionar(self, tile: int, vezes: int = 1):
+        self.contagens[min(tile.bit_length() - 1, EXPOENTE_MAXIMO) if tile else 0] += vezes
+
+    def mesclar(self, outro: "HistogramaTiles") -> "HistogramaTiles":
+        self.contagens = [a + b for a, b in zip(self.contagens, outro.contagens)]
+        return self
+
+    def total(self) -> int:
+        return sum(self.contagens)
+
+    def percentil(self, p: float) -> int:
+        # Menor tile com pelo menos p * total jogos até ele
+        total = self.total()
+        if total == 0:
+            return 0
+        alvo = p * total
+        acumulado = 0
+        for expoente, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if contagem and acumulado >= alvo:
+                return 1 << expoente if expoente else 0
+        return 1 << EXPOENTE_MAXIMO
+
+    def distribuicao(self, limites=(128, 256, 512, 1024, 2048)) -> dict[int, int]:
+        # Mesmo formato do distribuicao_tiles do fitness: jogos com tile >= limite
+        return {
+            limite: sum(
+                contagem for expoente, contagem in enumerate(self.contagens)
+                if expoente and (1 << expoente) >= limite
+            )
+            for limite in limites
+        }
+
+    def como_dict(self) -> dict[int, int]:
+        return {
+            (1 << expoente if expoente else 0): contagem
+            for expoente, contagem in enumerate(self.contagens) if contagem
+        }
+
+
+class EsbocoQuantis:
+    def __init__(self, precisao: float = PRECISAO):
+        self.precisao = precisao
+        self._gama = (1 + precisao) / (1 - precisao)
+        self._log_gama = math.log(self._gama)
+        # índice do balde -> contagem; valores <= 0 ficam à parte
+        self.baldes = {}
+        self.zeros = 0
+
+    def adicionar(self, valor: float, vezes: int = 1):
+        if valor <= 0:
+            self.zeros += vezes
+            return
+        indice = math.ceil(math.log(valor) / self._log_gama)
+        self.baldes[indice] = self.baldes.get(indice, 0) + vezes
+
+    def mesclar(self, outro: "EsbocoQuantis") -> "EsbocoQuantis":
+        if outro.precisao != self.precisao:
+            raise ValueError("só dá para mesclar esboços com a mesma precisão")
+        for indice, contagem in outro.baldes.items():
+            self.baldes[indice] = self.baldes.get(indice, 0) + contagem
+        self.zeros += outro.zeros
+        return self
+
+    def total(self) -> int:
+        return self.zeros + sum(self.baldes.values())
+
+    def percentil(self, p: float) -> float:
+        total = self.total()
+        if total == 0:
+            return 0.0
+        posicao = p * (total - 1)
+        acumulado = self.zeros
+        if posicao < acumulado:
+            return 0.0
+        for indice in sorted(self.baldes):
+            acumulado += self.baldes[indice]
+            if posicao < acumulado:
+                # Ponto do balde com erro relativo de no máximo `precisao`
+                return 2 * self._gama ** indice / (self._gama + 1)
+        return 2 * self._gama ** max(self.baldes) / (self._gama + 1)
+
+    def para_lista(self) -> list:
+        return [self.precisao, self.zeros, sorted(self.baldes.items())]
+
+    @classmethod
+    def de_lista(cls, dados: list) -> "EsbocoQuantis":
+        precisao, zeros, baldes = dados
+        esboco = cls(precisao)
+        esboco.zeros = zeros
+        esboco.baldes = {int(indice): contagem for indice, contagem in baldes}
+        return esboco
+
+
+class EstatisticasJogos:
+    def __init__(self, precisao: float = PRECISAO):
+        self.tiles = Acumulador()
+        self.movimentos = Acumulador()
+        self.histograma = HistogramaTiles()
+        self.quantis_movimentos = EsbocoQuantis(precisao)
+
+    @property
+    def n(self) -> int:
+        return self.tiles.n
+
+    def adicionar(self, maior_tile: int, movimentos: int):
+        self.tiles.adicionar(maior_tile)
+        self.movimentos.adicionar(movimentos)
+        self.histograma.adicionar(maior_tile)
+        self.quantis_movimentos.adicionar(movimentos)
+
+    def adicionar_lote(self, maiores_tiles, movimentos):
+        for maior_tile, movimento in zip(maiores_tiles, movimentos):
+            self.adicionar(int(maior_tile), int(movimento))
+
+    def mesclar(self, outro: "EstatisticasJogos") -> "EstatisticasJogos":
+        self.tiles.mesclar(outro.tiles)
+        self.movimentos.mesclar(outro.movimentos)
+        self.histograma.mesclar(outro.histograma)
+        self.quantis_movimentos.mesclar(outro.quantis_movimentos)
+        return self
+
+    def resumo(self) -> dict:
+        return {
+            "jogos": self.n,
+            "tile_medio": self.tiles.media,
+            "tile_desvio": self.tiles.desvio(),
+            "tile_p50": self.histograma.percentil(0.50),
+            "tile_p95": self.histograma.percentil(0.95),
+            "tile_maximo": self.histograma.percentil(1.0),
+            "movimentos_medio": self.movimentos.media,
+            "movimentos_desvio": self.movimentos.desvio(),
+            "movimentos_p05": self.quantis_movimentos.percentil(0.05),
+            "movimentos_p50": self.quantis_movimentos.percentil(0.50),
+            "movimentos_p95": self.quantis_movimentos.percentil(0.95),
+            "histograma_tiles": self.histograma.como_dict(),
+        }
+
+    def para_dict(self) -> dict:
+        return {
+            "tiles": self.tiles.para_lista(),
+            "movimentos": self.movimentos.para_lista(),
+            "histograma": list(self.histograma.contagens),
+            "quantis_movimentos": self.quantis_movimentos.para_lista(),
+        }
+
+    @classmethod
+    def de_dict(cls, dados: dict) -> "EstatisticasJogos":
+        estatisticas = cls()
+        estatisticas.tiles = Acumulador.de_lista(dados["tiles"])
+        estatisticas.movimentos = Acumulador.de_lista(dados["movimentos"])
+        estatisticas.histograma = HistogramaTiles(dados["histograma"])
+        estatisticas.quantis_movimentos = EsbocoQuantis.de_lista(dados["quantis_movimentos"])
+        return estatisticas
+
+
+def mesclar_dicts(anterior: dict, novo: dict) -> dict:
+    # Para resultados do fitness: mescla as formas serializadas
+    return EstatisticasJogos.de_dict(anterior).mesclar(EstatisticasJogos.de_dict(novo)).para_dict()
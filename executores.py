@@ -0,0 +1,141 @@
+# Backends de execução para avaliar_populacao
+#
+# Todos expõem a mesma interface: mapear(funcao, tarefas) devolve a lista de
+# resultados na ordem das tarefas, submeter(funcao, tarefa) devolve um
+# concurrent.futures.Future de uma tarefa só (usado pelo estacionario.py),
+# e fechar() libera os workers. Os executores
+# de processos criam o pool no primeiro uso e o reaproveitam nas chamadas
+# seguintes, então o mesmo objeto pode ser passado para todas as gerações do
+# rodar_ag sem pagar a criação dos processos a cada geração.
+
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+
+
+def _inicializar_worker(semente, contador):
+    # Processos criados por fork herdam o estado do random do pai: sem uma
+    # semente própria todos os workers sorteariam os mesmos tiles
+    with contador.get_lock():
+        contador.value += 1
+        indice = contador.value
+    if semente is None:
+        random.seed()
+    else:
+        random.seed(f"{semente}:{indice}")
+
+
+def _tamanho_lote(chunksize, num_tarefas: int, processos: int) -> int:
+    if chunksize is not None:
+        return max(1, chunksize)
+    # Mesmo critério do multiprocessing.Pool.map: ~4 lotes por processo
+    return max(1, math.ceil(num_tarefas / (processos * 4)))
+
+
+class ExecutorSerial:
+    nome = "serial"
+    processos = 1
+
+    def mapear(self, funcao, tarefas: list) -> list:
+        # As tarefas podem semear o random global; o estado é restaurado para
+        # que o resto do AG sorteie igual aos backends em processos separados
+        estado = random.getstate()
+        try:
+            return [funcao(tarefa) for tarefa in tarefas]
+        finally:
+            random.setstate(estado)
+
+    def submeter(self, funcao, tarefa) -> Future:
+        # Sem workers a tarefa roda na hora e o Future já volta pronto
+        futuro = Future()
+        try:
+            futuro.set_result(self.mapear(funcao, [tarefa])[0])
+        except Exception as erro:
+            futuro.set_exception(erro)
+        return futuro
+
+    def fechar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+class ExecutorProcessos(ExecutorSerial):
+    nome = "processos"
+
+    def __init__(self, processos: int = None, chunksize: int = None, semente: int = None):
+        self.processos = processos or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.semente = semente
+        self._pool = None
+
+    def _criar_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.processos,
+            initializer=_inicializar_worker,
+            initargs=(self.semente, multiprocessing.Value('i', 0)),
+        )
+
+    def _obter_pool(self):
+        if self._pool is None:
+            self._pool = self._criar_pool()
+        return self._pool
+
+    def mapear(self, funcao, tarefas: list) -> list:
+        tarefas = list(tarefas)
+        lote = _tamanho_lote(self.chunksize, len(tarefas), self.processos)
+        return list(self._obter_pool().map(funcao, tarefas, chunksize=lote))
+
+    def submeter(self, funcao, tarefa) -> Future:
+        return self._obter_pool().submit(funcao, tarefa)
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class ExecutorPool(ExecutorProcessos):
+    nome = "pool"
+
+    def _criar_pool(self):
+        return multiprocessing.Pool(
+            processes=self.processos,
+            initializer=_inicializar_worker,
+            initargs=(self.semente, multiprocessing.Value('i', 0)),
+        )
+
+    def submeter(self, funcao, tarefa) -> Future:
+        # O multiprocessing.Pool devolve AsyncResult: os callbacks completam um Future
+        futuro = Future()
+        self._obter_pool().apply_async(
+            funcao, (tarefa,), callback=futuro.set_result, error_callback=futuro.set_exception
+        )
+        return futuro
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+EXECUTORES = {
+    "serial": ExecutorSerial,
+    "processos": ExecutorProcessos,
+    "pool": ExecutorPool,
+}
+
+
+def criar_executor(nome: str, processos: int = None, chunksize: int = None, semente: int = None):
+    if nome not in EXECUTORES:
+        raise ValueError(f"executor desconhecido: {nome!r}")
+    if nome == "serial":
+        return ExecutorSerial()
+    return EXECUTORES[nome](processos, chunksize, semente)
@@ -0,0 +1,292 @@
+# Jogador expectimax: política de referência e semente de populações do AG
+#
+# A busca usa o motor bitboard, que reproduz exatamente os movimentos e o
+# sorteio de tiles do logic, mas deixa cada tabuleiro em um inteiro: dá para
+# gerar as 8 simetrias com operações de bits e usar o tabuleiro como chave.
+#
+#   nó de máximo  -> melhor dos movimentos que mudam o tabuleiro
+#   nó de acaso   -> média sobre as células vazias (o jogo só cria tiles 2)
+#   folhas        -> heurística por linha/coluna tabelada (vazias, merges,
+#                    monotonicidade, soma), a mesma para as 8 simetrias
+#
+# Os nós de acaso ficam em uma tabela de transposição LRU limitada, indexada
+# pelo menor dos 8 tabuleiros simétricos. A profundidade cresce por
+# aprofundamento iterativo até estourar o tempo de cada jogada; a resposta
+# é a da última profundidade completa.
+
+import argparse
+import random
+import time
+from collections import OrderedDict
+import bitboard
+from algorithm import semente_individuo, valid_moves
+
+PROBABILIDADE_MINIMA = 1e-4
+BONUS_VITORIA = 1e7
+
+_tabela_heuristica = None
+
+
+def _pontuar_linha(linha: list[int]) -> float:
+    vazias = linha.count(0)
+    soma = sum(rank ** 3.5 for rank in linha)
+
+    merges = 0
+    anterior = 0
+    repetidos = 0
+    for rank in linha:
+        if rank == 0:
+            continue
+        if rank == anterior:
+            repetidos += 1
+        elif repetidos:
+            merges += 1 + repetidos
+            repetidos = 0
+        anterior = rank
+    if repetidos:
+        merges += 1 + repetidos
+
+    esquerda = direita = 0
+    for i in range(1, len(linha)):
+        if linha[i - 1] > linha[i]:
+            esquerda += linha[i - 1] ** 4 - linha[i] ** 4
+        else:
+            direita += linha[i] ** 4 - linha[i - 1] ** 4
+
+    pontos = 200000 + 270 * vazias + 700 * merges - 47 * min(esquerda, direita) - 11 * soma
+    if bitboard.EXPOENTE_VITORIA in linha:
+        pontos += BONUS_VITORIA
+    return pontos
+
+
+def tabela_heuristica() -> list[float]:
+    global _tabela_heuristica
+    if _tabela_heuristica is None:
+        _tabela_heuristica = [
+            _pontuar_linha([(linha >> (4 * j)) & 0xF for j in range(4)]) for linha in range(65536)
+        ]
+    return _tabela_heuristica
+
+
+def heuristica(board: int) -> float:
+    tabela = tabela_heuristica()
+    transposto = bitboard.transpose(board)
+    return (
+        tabela[board & 0xFFFF] + tabela[(board >> 16) & 0xFFFF]
+        + tabela[(board >> 32) & 0xFFFF] + tabela[board >> 48]
+        + tabela[transposto & 0xFFFF] + tabela[(transposto >> 16) & 0xFFFF]
+        + tabela[(transposto >> 32) & 0xFFFF] + tabela[transposto >> 48]
+    )
+
+
+def espelhar(board: int) -> int:
+    # Inverte a ordem das colunas em todas as linhas
+    return (
+        ((board & 0x000F000F000F000F) << 12) | ((board & 0x00F000F000F000F0) << 4)
+        | ((board & 0x0F000F000F000F00) >> 4) | ((board & 0xF000F000F000F000) >> 12)
+    )
+
+
+def inverter(board: int) -> int:
+    # Inverte a ordem das linhas
+    return (
+        ((board & 0xFFFF) << 48) | ((board & 0xFFFF0000) << 16)
+        | ((board >> 16) & 0xFFFF0000) | (board >> 48)
+    )
+
+
+def simetrias(board: int) -> list[int]:
+    transposto = bitboard.transpose(board)
+    resultado = []
+    for base in (board, transposto):
+        invertido = inverter(base)
+        resultado += [base, espelhar(base), invertido, espelhar(invertido)]
+    return resultado
+
+
+def canonico(board: int) -> int:
+    return min(simetrias(board))
+
+
+def _celulas_vazias(board: int) -> list[int]:
+    return [deslocamento for deslocamento in range(0, 64, 4) if not (board >> deslocamento) & 0xF]
+
+
+class _TempoEsgotado(Exception):
+    pass
+
+
+class JogadorExpectimax:
+    def __init__(
+        self,
+        profundidade_max: int = 3,
+        tempo_por_jogada: float = 0.05,
+        max_entradas: int = 200_000
+    ):
+        self.profundidade_max = profundidade_max
+        self.tempo_por_jogada = tempo_por_jogada
+        self.max_entradas = max_entradas
+        # tabuleiro canônico -> (profundidade, valor)
+        self._tabela = OrderedDict()
+        self._limite = float('inf')
+        self.nos = 0
+        self.consultas = 0
+        self.acertos = 0
+        self.descartes = 0
+        self.tempo = 0.0
+        self.jogadas = 0
+        self.soma_profundidades = 0
+
+    def _maximo(self, board: int, profundidade: int, probabilidade: float) -> float:
+        melhor = 0.0
+        for funcao in bitboard.movimentos.values():
+            novo, mudou = funcao(board)
+            if mudou:
+                melhor = max(melhor, self._acaso(novo, profundidade, probabilidade))
+        return melhor
+
+    def _acaso(self, board: int, profundidade: int, probabilidade: float) -> float:
+        if profundidade == 0 or probabilidade < PROBABILIDADE_MINIMA:
+            return heuristica(board)
+
+        self.nos += 1
+        if not self.nos & 255 and time.perf_counter() > self._limite:
+            raise _TempoEsgotado
+
+        chave = canonico(board)
+        self.consultas += 1
+        entrada = self._tabela.get(chave)
+        if entrada is not None and entrada[0] >= profundidade:
+            self.acertos += 1
+            self._tabela.move_to_end(chave)
+            return entrada[1]
+
+        vazias = _celulas_vazias(board)
+        chance = probabilidade / len(vazias)
+        valor = sum(
+            self._maximo(board | (1 << deslocamento), profundidade - 1, chance)
+            for deslocamento in vazias
+        ) / len(vazias)
+
+        self._tabela[chave] = (profundidade, valor)
+        self._tabela.move_to_end(chave)
+        if len(self._tabela) > self.max_entradas:
+            self._tabela.popitem(last=False)
+            self.descartes += 1
+        return valor
+
+    def escolher(self, board: int) -> str:
+        # Melhor movimento pela última profundidade completa; None se nenhum muda o tabuleiro
+        candidatos = {}
+        for movimento, funcao in bitboard.movimentos.items():
+            novo, mudou = funcao(board)
+            if mudou:
+                candidatos[movimento] = novo
+        if not candidatos:
+            return None
+
+        inicio = time.perf_counter()
+        melhor = None
+        profundidade_completa = 0
+        for profundidade in range(1, self.profundidade_max + 1):
+            # A profundidade 1 sempre termina, para haver uma resposta
+            self._limite = float('inf') if profundidade == 1 else inicio + self.tempo_por_jogada
+            try:
+                valores = {
+                    movimento: self._acaso(novo, profundidade, 1.0)
+                    for movimento, novo in candidatos.items()
+                }
+            except _TempoEsgotado:
+                break
+            melhor = max(valores, key=valores.get)
+            profundidade_completa = profundidade
+            if time.perf_counter() - inicio > self.tempo_por_jogada:
+                break
+
+        self.tempo += time.perf_counter() - inicio
+        self.jogadas += 1
+        self.soma_profundidades += profundidade_completa
+        return melhor
+
+    def jogar(self, rng=random, max_jogadas: int = None) -> tuple[list[str], int, int]:
+        # Devolve a sequência jogada (um indivíduo), o maior tile e o número de movimentos
+        board = bitboard.new_game(rng)
+        individuo = []
+        while bitboard.game_state(board) == 'not over':
+            if max_jogadas is not None and len(individuo) >= max_jogadas:
+                break
+            movimento = self.escolher(board)
+            if movimento is None:
+                break
+            board, _ = bitboard.movimentos[movimento](board)
+            board = bitboard.add_two(board, rng)
+            individuo.append(movimento)
+        return individuo, bitboard.max_tile(board), len(individuo)
+
+    def estatisticas(self) -> dict:
+        return {
+            "nos": self.nos,
+            "tempo": self.tempo,
+            "nos_por_segundo": self.nos / self.tempo if self.tempo else 0.0,
+            "consultas": self.consultas,
+            "acertos": self.acertos,
+            "taxa_acerto": self.acertos / self.consultas if self.consultas else 0.0,
+            "entradas": len(self._tabela),
+            "descartes": self.descartes,
+            "profundidade_media": self.soma_profundidades / self.jogadas if self.jogadas else 0.0,
+        }
+
+
+PROFUNDIDADE_ABERTURAS = 2
+
+
+def jogador_aberturas(profundidade_max: int = PROFUNDIDADE_ABERTURAS) -> "JogadorExpectimax":
+    # Só o limite de profundidade, sem orçamento de tempo: a busca não
+    # depende da carga da máquina e a mesma seed gera as mesmas aberturas
+    return JogadorExpectimax(profundidade_max=profundidade_max, tempo_por_jogada=float('inf'))
+
+
+def gerar_individuos(
+    quantidade: int,
+    tamanho_individuo: int,
+    seed: int = None,
+    jogador: JogadorExpectimax = None
+) -> list[list[str]]:
+    # Aberturas do expectimax para a população inicial do rodar_ag: cada jogo
+    # usa um gerador próprio e é completado com movimentos aleatórios se
+    # terminar antes de tamanho_individuo. O jogador padrão é raso, já que
+    # cada indivíduo é um jogo inteiro, e limitado só pela profundidade
+    jogador = jogador or jogador_aberturas()
+    individuos = []
+    for indice in range(quantidade):
+        rng = random if seed is None else random.Random(semente_individuo(seed, indice))
+        individuo, _, _ = jogador.jogar(rng, tamanho_individuo)
+        while len(individuo) < tamanho_individuo:
+            individuo.append(rng.choice(valid_moves))
+        individuos.append(individuo)
+    return individuos
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Jogador expectimax do 2048")
+    parser.add_argument("--jogos", type=int, default=3)
+    parser.add_argument("--profundidade", type=int, default=3)
+    parser.add_argument("--tempo", type=float, default=0.05, help="segundos por jogada")
+    parser.add_argument("--entradas", type=int, default=200_000, help="tamanho da tabela de transposição")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    jogador = JogadorExpectimax(args.profundidade, args.tempo, args.entradas)
+    for indice in range(args.jogos):
+        rng = random if args.seed is None else random.Random(semente_individuo(args.seed, indice))
+        _, maior_tile, movimentos = jogador.jogar(rng)
+        print(f"Jogo {indice + 1}: maior tile {maior_tile}, {movimentos} movimentos")
+
+    estatisticas = jogador.estatisticas()
+    print(f"Nós/s: {estatisticas['nos_por_segundo']:.0f}")
+    print(f"Taxa de acerto da tabela: {estatisticas['taxa_acerto']:.1%}")
+    print(f"Profundidade média: {estatisticas['profundidade_media']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Fita de números aleatórios pré-gerados
+#
+# Substitui o módulo random nas funções que sorteiam tiles (add_two/new_game).
+# Os valores saem de um random.Random(semente) próprio e ficam guardados, então
+# a fita pode voltar para qualquer posição já sorteada e duas fitas com a mesma
+# semente produzem exatamente a mesma sequência, independente do estado do
+# random global.
+
+import random
+from array import array
+
+TAMANHO_BLOCO = 256
+
+
+def semente_simulacao(semente: int, simulacao: int) -> int:
+    # Semente da fita da simulação i a partir de uma semente base (da geração
+    # ou do armazém de snapshots)
+    return (semente * 1_000_003 + simulacao) & 0xFFFFFFFFFFFFFFFF
+
+
+class FitaAleatoria:
+    def __init__(self, semente):
+        self.semente = semente
+        self.posicao = 0
+        self._gerador = random.Random(semente)
+        self._valores = array('d')
+
+    def _garantir(self, tamanho: int):
+        while len(self._valores) < tamanho:
+            self._valores.extend(self._gerador.random() for _ in range(TAMANHO_BLOCO))
+
+    def random(self) -> float:
+        if self.posicao >= len(self._valores):
+            self._garantir(self.posicao + 1)
+        valor = self._valores[self.posicao]
+        self.posicao += 1
+        return valor
+
+    def randint(self, a: int, b: int) -> int:
+        return a + int(self.random() * (b - a + 1))
+
+    def randrange(self, n: int) -> int:
+        return int(self.random() * n)
+
+    def choice(self, sequencia):
+        return sequencia[self.randrange(len(sequencia))]
+
+    def ir_para(self, posicao: int):
+        self._garantir(posicao)
+        self.posicao = posicao
@@ -0,0 +1,89 @@
+# Genomas compactos em uint8 e operadores do AG sobre a população inteira
+#
+# Cada gene vira um código de 1 byte (0 = up, 1 = down, 2 = left, 3 = right,
+# na ordem de algorithm.valid_moves) e a população inteira fica em uma matriz
+# (tamanho_pop, tamanho_individuo). Geração, cruzamento, mutação e a nova
+# população são operações vetorizadas sobre a matriz: pontos de corte e
+# máscaras de mutação são sorteados para todos os indivíduos de uma vez.
+# As funções codificar/decodificar mantêm a API de listas de strings.
+
+import numpy as np
+
+MOVIMENTOS = ('up', 'down', 'left', 'right')
+CODIGOS = {movimento: codigo for codigo, movimento in enumerate(MOVIMENTOS)}
+_MOVIMENTOS_OBJETO = np.array(MOVIMENTOS, dtype=object)
+
+
+def gerador(semente: int = None) -> np.random.Generator:
+    return np.random.default_rng(semente)
+
+
+def codificar(individuo: list[str]) -> np.ndarray:
+    return np.fromiter((CODIGOS[g] for g in individuo), dtype=np.uint8, count=len(individuo))
+
+
+def decodificar(genoma: np.ndarray) -> list[str]:
+    return _MOVIMENTOS_OBJETO[genoma].tolist()
+
+
+def codificar_populacao(populacao: list[list[str]]) -> np.ndarray:
+    tamanho_individuo = len(populacao[0]) if populacao else 0
+    matriz = np.empty((len(populacao), tamanho_individuo), dtype=np.uint8)
+    for i, individuo in enumerate(populacao):
+        matriz[i] = codificar(individuo)
+    return matriz
+
+
+def decodificar_populacao(matriz: np.ndarray) -> list[list[str]]:
+    return _MOVIMENTOS_OBJETO[matriz].tolist()
+
+
+def gerar_populacao(tamanho_pop: int, tamanho_individuo: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.integers(0, len(MOVIMENTOS), size=(tamanho_pop, tamanho_individuo), dtype=np.uint8)
+
+
+def cruzar_populacao(
+    pais1: np.ndarray, pais2: np.ndarray, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    # Um ponto de corte por casal, como em algorithm.cruzar
+    quantidade, tamanho = pais1.shape
+    cortes = rng.integers(1, tamanho, size=quantidade)
+    prefixo = np.arange(tamanho) < cortes[:, None]
+    return np.where(prefixo, pais1, pais2), np.where(prefixo, pais2, pais1)
+
+
+def mutar_populacao(matriz: np.ndarray, taxa_mutacao: float, rng: np.random.Generator) -> np.ndarray:
+    mascara = rng.random(matriz.shape) < taxa_mutacao
+    mutante = matriz.copy()
+    mutante[mascara] = rng.integers(0, len(MOVIMENTOS), size=int(mascara.sum()), dtype=np.uint8)
+    return mutante
+
+
+def selecionar_pais(fitness_geral: np.ndarray, n: int) -> np.ndarray:
+    # Índices dos n maiores, estável nos empates como o sort do algorithm
+    return np.argsort(-np.asarray(fitness_geral, dtype=float), kind='stable')[:n]
+
+
+def gerar_nova_populacao(
+    matriz: np.ndarray,
+    fitness_geral: np.ndarray,
+    tamanho_pop: int,
+    taxa_mutacao: float,
+    num_pais: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    pais = matriz[selecionar_pais(fitness_geral, num_pais)]
+    num_filhos = tamanho_pop - len(pais)
+    if num_filhos <= 0:
+        return pais[:tamanho_pop].copy()
+
+    casais = -(-num_filhos // 2)
+    pais1 = pais[rng.integers(0, len(pais), size=casais)]
+    pais2 = pais[rng.integers(0, len(pais), size=casais)]
+    if matriz.shape[1] > 1:
+        filhos1, filhos2 = cruzar_populacao(pais1, pais2, rng)
+    else:
+        filhos1, filhos2 = pais1, pais2
+    # Intercala filho1/filho2 de cada casal, na mesma ordem da versão em listas
+    filhos = np.stack([filhos1, filhos2], axis=1).reshape(-1, matriz.shape[1])[:num_filhos]
+    return np.concatenate([pais, mutar_populacao(filhos, taxa_mutacao, rng)])
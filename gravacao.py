@@ -0,0 +1,114 @@
+# Gravação compacta de partidas para reprodução (puzzle.py --replay)
+#
+# Formato (little-endian):
+#   MAGICO (8 bytes) | versão u8 | GRID_LEN u8 | flags u8 | 1 byte livre |
+#   semente u64 | número de eventos u32
+#   eventos de 2 bytes: (código do movimento << 4 | expoente do tile novo),
+#   célula do tile novo (i * GRID_LEN + j)
+#
+# Só movimentos válidos viram eventos, já que os outros não mudam o
+# tabuleiro. Os tiles iniciais usam o código SEM_MOVIMENTO. A partir do
+# tabuleiro vazio, aplicar cada movimento com o logic e colocar o tile
+# gravado reconstrói exatamente a partida. A semente (flag bit 0) fica
+# guardada para quem quiser rejogar o indivíduo com executar_jogo.
+
+import struct
+import logic
+import constants as c
+
+MAGICO = b"AG2048TR"
+VERSAO = 1
+MOVIMENTOS = ('up', 'down', 'left', 'right')
+CODIGOS = {movimento: codigo for codigo, movimento in enumerate(MOVIMENTOS)}
+SEM_MOVIMENTO = 0xF
+TEM_SEMENTE = 1
+MASCARA_SEMENTE = (1 << 64) - 1
+
+_CABECALHO = struct.Struct("<8sBBBxQI")
+
+
+class Gravacao:
+    def __init__(self, grid_len: int = c.GRID_LEN, semente: int = None, eventos: bytes = b""):
+        if semente is not None and not 0 <= semente <= MASCARA_SEMENTE:
+            raise ValueError(f"a semente da gravação precisa caber em 64 bits sem sinal: {semente}")
+        self.grid_len = grid_len
+        self.semente = semente
+        self.eventos = bytearray(eventos)
+
+    def __len__(self) -> int:
+        # Número de movimentos gravados, sem os tiles iniciais
+        codigos = self.eventos[0::2]
+        return sum(1 for codigo in codigos if codigo >> 4 != SEM_MOVIMENTO)
+
+    def _adicionar(self, codigo: int, celula: int, valor: int):
+        self.eventos += bytes(((codigo << 4) | (valor.bit_length() - 1), celula))
+
+    def iniciar(self, matriz: list[list[int]]):
+        for i, linha in enumerate(matriz):
+            for j, valor in enumerate(linha):
+                if valor:
+                    self._adicionar(SEM_MOVIMENTO, i * self.grid_len + j, valor)
+
+    def registrar(self, movimento: str, antes: list[list[int]], depois: list[list[int]]):
+        # antes: tabuleiro logo após o movimento; depois: com o tile novo
+        for i, (linha_antes, linha_depois) in enumerate(zip(antes, depois)):
+            for j, (valor_antes, valor_depois) in enumerate(zip(linha_antes, linha_depois)):
+                if valor_antes != valor_depois:
+                    self._adicionar(CODIGOS[movimento], i * self.grid_len + j, valor_depois)
+                    return
+
+    def passos(self):
+        # (movimento ou None, linha, coluna, valor do tile novo)
+        for k in range(0, len(self.eventos), 2):
+            codigo, expoente = divmod(self.eventos[k], 16)
+            i, j = divmod(self.eventos[k + 1], self.grid_len)
+            yield (None if codigo == SEM_MOVIMENTO else MOVIMENTOS[codigo]), i, j, 1 << expoente
+
+    def quadros(self):
+        # (movimento, tabuleiro) do inicial e de depois de cada movimento,
+        # reconstruídos com o logic
+        matriz = [[0] * self.grid_len for _ in range(self.grid_len)]
+        primeiro = True
+        for movimento, i, j, valor in self.passos():
+            if movimento is None:
+                matriz[i][j] = valor
+                continue
+            if primeiro:
+                yield None, [linha[:] for linha in matriz]
+                primeiro = False
+            matriz, _ = getattr(logic, movimento)(matriz)
+            matriz[i][j] = valor
+            yield movimento, [linha[:] for linha in matriz]
+        if primeiro:
+            yield None, matriz
+
+    def movimentos(self) -> list[str]:
+        return [movimento for movimento, _, _, _ in self.passos() if movimento is not None]
+
+    def para_bytes(self) -> bytes:
+        flags = TEM_SEMENTE if self.semente is not None else 0
+        cabecalho = _CABECALHO.pack(
+            MAGICO, VERSAO, self.grid_len, flags, self.semente or 0, len(self.eventos) // 2
+        )
+        return cabecalho + bytes(self.eventos)
+
+    @classmethod
+    def de_bytes(cls, dados: bytes) -> "Gravacao":
+        magico, versao, grid_len, flags, semente, num_eventos = _CABECALHO.unpack_from(dados, 0)
+        if magico != MAGICO:
+            raise ValueError("os dados não são uma gravação do 2048")
+        if versao != VERSAO:
+            raise ValueError(f"versão de gravação não suportada: {versao}")
+        inicio = _CABECALHO.size
+        eventos = dados[inicio:inicio + 2 * num_eventos]
+        return cls(grid_len, semente if flags & TEM_SEMENTE else None, eventos)
+
+    def salvar(self, caminho: str):
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(self.para_bytes())
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "Gravacao":
+        with open(caminho, "rb") as arquivo:
+            return cls.de_bytes(arquivo.read())
+
@@ -0,0 +1,75 @@
+# Histórico de jogadas da interface: desfazer, refazer e pular para um passo
+#
+# Os tabuleiros ficam em um buffer circular de tamanho fixo (um bytearray
+# com GRID_LEN * GRID_LEN bytes por passo, o expoente log2 de cada célula),
+# então a memória não cresce com a partida: passando de `capacidade` passos,
+# o mais antigo é sobrescrito. Os passos são numerados desde o começo da
+# partida; `primeiro` é o mais antigo ainda guardado. Cada tabuleiro é
+# copiado ao ser gravado e decodificado em uma lista nova ao ser lido, então
+# o histórico nunca compartilha listas com o tabuleiro do jogo.
+#
+# Registrar depois de desfazer descarta os passos que poderiam ser refeitos,
+# como em um editor de texto.
+
+import constants as c
+
+
+class Historico:
+    def __init__(self, capacidade: int = c.HISTORY_DEPTH, grid_len: int = c.GRID_LEN):
+        if capacidade < 1:
+            raise ValueError("a capacidade do histórico deve ser pelo menos 1")
+        self.capacidade = capacidade
+        self.grid_len = grid_len
+        self._celulas = grid_len * grid_len
+        self._dados = bytearray(capacidade * self._celulas)
+        self.primeiro = 0
+        self.atual = -1
+        self.fim = 0
+
+    def __len__(self) -> int:
+        return self.fim - self.primeiro
+
+    def _posicao(self, passo: int) -> int:
+        return (passo % self.capacidade) * self._celulas
+
+    def _ler(self, passo: int) -> list[list[int]]:
+        inicio = self._posicao(passo)
+        expoentes = self._dados[inicio:inicio + self._celulas]
+        return [
+            [(1 << e) if e else 0 for e in expoentes[i:i + self.grid_len]]
+            for i in range(0, self._celulas, self.grid_len)
+        ]
+
+    def registrar(self, matriz: list[list[int]]):
+        self.atual += 1
+        inicio = self._posicao(self.atual)
+        self._dados[inicio:inicio + self._celulas] = bytes(
+            valor.bit_length() - 1 if valor else 0 for linha in matriz for valor in linha
+        )
+        self.fim = self.atual + 1
+        self.primeiro = max(self.primeiro, self.fim - self.capacidade)
+
+    def pode_desfazer(self) -> bool:
+        return self.atual > self.primeiro
+
+    def pode_refazer(self) -> bool:
+        return self.atual + 1 < self.fim
+
+    def desfazer(self) -> list[list[int]]:
+        # Tabuleiro do passo anterior, ou None se ele já saiu do buffer
+        if not self.pode_desfazer():
+            return None
+        self.atual -= 1
+        return self._ler(self.atual)
+
+    def refazer(self) -> list[list[int]]:
+        if not self.pode_refazer():
+            return None
+        self.atual += 1
+        return self._ler(self.atual)
+
+    def ir_para(self, passo: int) -> list[list[int]]:
+        if not self.primeiro <= passo < self.fim:
+            raise IndexError(f"passo {passo} fora do histórico ({self.primeiro}..{self.fim - 1})")
+        self.atual = passo
+        return self._ler(passo)
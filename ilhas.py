@@ -0,0 +1,267 @@
+# Modelo de ilhas: várias subpopulações evoluindo em paralelo com migração
+#
+# Cada ilha é uma população independente que roda o ciclo normal do AG
+# (avaliar_populacao + gerar_nova_populacao) com seu próprio estado do
+# random e seu próprio cache de fitness. No modo paralelo cada ilha vive em
+# um processo próprio e só conversa com o processo principal a cada
+# intervalo_migracao gerações: recebe os imigrantes, evolui as gerações da
+# época e devolve o histórico de fitness e os seus num_migrantes melhores.
+#
+# Topologias de migração:
+#   "anel"     -> a ilha i recebe os melhores da ilha i-1
+#   "completa" -> a ilha i recebe os num_migrantes melhores entre todas as
+#                 outras ilhas
+# Os imigrantes substituem os últimos filhos da nova população, nunca os
+# pais copiados por elitismo.
+#
+# O estado do random de cada ilha é salvo e restaurado em volta de cada
+# época, então o resultado com a mesma seed é o mesmo no modo serial e no
+# modo com processos.
+
+import contextlib
+import multiprocessing
+import random
+import time
+import algorithm as ag
+import cache_fitness
+
+TOPOLOGIAS = ("anel", "completa")
+
+
+def origens(topologia: str, num_ilhas: int) -> list[list[int]]:
+    # origens[i] são as ilhas que mandam migrantes para a ilha i
+    if topologia == "anel":
+        return [[(i - 1) % num_ilhas] for i in range(num_ilhas)]
+    if topologia == "completa":
+        return [[j for j in range(num_ilhas) if j != i] for i in range(num_ilhas)]
+    raise ValueError(f"topologia desconhecida: {topologia!r}")
+
+
+class Ilha:
+    def __init__(
+        self,
+        indice: int,
+        tamanho_pop: int,
+        tamanho_individuo: int,
+        taxa_mutacao: float,
+        num_simulacoes: int,
+        engine: str,
+        semente: int
+    ):
+        self.indice = indice
+        self.tamanho_pop = tamanho_pop
+        self.taxa_mutacao = taxa_mutacao
+        self.num_simulacoes = num_simulacoes
+        self.engine = engine
+        self.num_pais = max(2, tamanho_pop // 2)
+        self.cache = cache_fitness.CacheFitness(2 * tamanho_pop)
+        self.estado_random = random.Random(semente).getstate()
+        self.melhor_fitness = float('-inf')
+        self.melhor_individuo = None
+        self.melhores = []
+        with self._random():
+            self.populacao = ag.generate_population(tamanho_pop, tamanho_individuo)
+
+    @contextlib.contextmanager
+    def _random(self):
+        anterior = random.getstate()
+        random.setstate(self.estado_random)
+        try:
+            yield
+        finally:
+            self.estado_random = random.getstate()
+            random.setstate(anterior)
+
+    def receber(self, migrantes: list[tuple[float, list[str]]]):
+        if migrantes:
+            inicio = max(self.num_pais, self.tamanho_pop - len(migrantes))
+            for posicao, (_, individuo) in zip(range(inicio, self.tamanho_pop), migrantes):
+                self.populacao[posicao] = individuo.copy()
+
+    def evoluir(self, geracoes: int) -> list[tuple[list[float], dict]]:
+        # Devolve, por geração, as fitness da população e o resultado do melhor
+        historico = []
+        with self._random():
+            for _ in range(geracoes):
+                semente_geracao = random.getrandbits(64)
+                avaliada = ag.avaliar_populacao(
+                    self.populacao, self.num_simulacoes, self.engine,
+                    seed=semente_geracao, cache=self.cache
+                )
+                melhor_fitness, resultado, individuo = max(avaliada, key=lambda x: x[0])
+                if melhor_fitness > self.melhor_fitness:
+                    self.melhor_fitness = melhor_fitness
+                    self.melhor_individuo = individuo.copy()
+                historico.append(([fitness_val for fitness_val, _, _ in avaliada], resultado))
+
+                # gerar_nova_populacao ordena a avaliada: o topo vira a lista de emigrantes
+                self.populacao = ag.gerar_nova_populacao(
+                    avaliada, self.tamanho_pop, self.taxa_mutacao, self.num_pais
+                )
+                self.melhores = [(fitness_val, ind) for fitness_val, _, ind in avaliada]
+        return historico
+
+    def epoca(self, migrantes: list, geracoes: int, num_migrantes: int) -> tuple:
+        self.receber(migrantes)
+        historico = self.evoluir(geracoes)
+        return historico, self.melhores[:num_migrantes], self.melhor_fitness, self.melhor_individuo
+
+
+def _trabalhador(conexao, parametros: tuple):
+    ilha = Ilha(*parametros)
+    while True:
+        mensagem = conexao.recv()
+        if mensagem is None:
+            break
+        conexao.send(ilha.epoca(*mensagem))
+    conexao.close()
+
+
+class _IlhaProcesso:
+    def __init__(self, parametros: tuple):
+        self._conexao, filho = multiprocessing.Pipe()
+        self._processo = multiprocessing.Process(
+            target=_trabalhador, args=(filho, parametros), daemon=True
+        )
+        self._processo.start()
+        filho.close()
+
+    def enviar(self, migrantes: list, geracoes: int, num_migrantes: int):
+        self._conexao.send((migrantes, geracoes, num_migrantes))
+
+    def resultado(self) -> tuple:
+        return self._conexao.recv()
+
+    def fechar(self):
+        with contextlib.suppress(OSError):
+            self._conexao.send(None)
+        self._processo.join()
+        self._conexao.close()
+
+
+class _IlhaLocal:
+    def __init__(self, parametros: tuple):
+        self._ilha = Ilha(*parametros)
+        self._pendente = None
+
+    def enviar(self, migrantes: list, geracoes: int, num_migrantes: int):
+        self._pendente = (migrantes, geracoes, num_migrantes)
+
+    def resultado(self) -> tuple:
+        return self._ilha.epoca(*self._pendente)
+
+    def fechar(self):
+        pass
+
+
+class ModeloIlhas:
+    def __init__(
+        self,
+        num_ilhas: int = 4,
+        topologia: str = "anel",
+        intervalo_migracao: int = 5,
+        num_migrantes: int = 2,
+        paralelo: bool = True
+    ):
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"topologia desconhecida: {topologia!r}")
+        self.num_ilhas = num_ilhas
+        self.topologia = topologia
+        self.intervalo_migracao = intervalo_migracao
+        self.num_migrantes = num_migrantes
+        self.paralelo = paralelo
+        self.historico = []
+        self.migracoes = 0
+        self.tempo_total = 0.0
+
+    def _migrar(self, emigrantes: list[list[tuple[float, list[str]]]]) -> list[list]:
+        migrantes = []
+        for fontes in origens(self.topologia, self.num_ilhas):
+            candidatos = [migrante for j in fontes for migrante in emigrantes[j]]
+            candidatos.sort(key=lambda item: item[0], reverse=True)
+            migrantes.append(candidatos[:self.num_migrantes])
+        return migrantes
+
+    def _consolidar(self, geracao_ilhas: list[tuple[list[float], dict]]) -> tuple[dict, dict]:
+        # Métricas da geração sobre todas as ilhas juntas + o melhor de cada uma
+        metricas = ag.calcular_metricas(
+            [fitness_val for fitness_geral, _ in geracao_ilhas for fitness_val in fitness_geral]
+        )
+        metricas["melhor_por_ilha"] = [max(fitness_geral) for fitness_geral, _ in geracao_ilhas]
+        melhor_ilha = metricas["melhor_por_ilha"].index(metricas["melhor_fitness"])
+        return metricas, geracao_ilhas[melhor_ilha][1]
+
+    def rodar(
+        self,
+        populacoes: int,
+        tamanho_pop: int,
+        tamanho_individuo: int,
+        taxa_mutacao: float,
+        num_simulacoes: int,
+        engine: str = 'logic',
+        seed: int = None,
+        caminho_log: str = None
+    ) -> tuple[float, list[str]]:
+        # tamanho_pop é o tamanho de cada ilha
+        gerador = random.Random(seed) if seed is not None else random
+        sementes = [gerador.getrandbits(64) for _ in range(self.num_ilhas)]
+        tipo = _IlhaProcesso if self.paralelo else _IlhaLocal
+        ilhas = []
+        self.historico = []
+        self.migracoes = 0
+
+        melhor_fitness_global = float('-inf')
+        melhor_individuo_global = None
+        inicio_total = time.perf_counter()
+        try:
+            for indice, semente in enumerate(sementes):
+                parametros = (
+                    indice, tamanho_pop, tamanho_individuo, taxa_mutacao, num_simulacoes, engine, semente
+                )
+                ilhas.append(tipo(parametros))
+
+            with ag.abrir_log(caminho_log) as log:
+                migrantes = [[] for _ in ilhas]
+                geracao = 0
+                while geracao < populacoes:
+                    passo = min(self.intervalo_migracao, populacoes - geracao)
+                    inicio = time.perf_counter()
+                    for ilha, recebidos in zip(ilhas, migrantes):
+                        ilha.enviar(recebidos, passo, self.num_migrantes)
+                    resultados = [ilha.resultado() for ilha in ilhas]
+                    tempo = (time.perf_counter() - inicio) / passo
+
+                    for _, _, melhor_fitness, melhor_individuo in resultados:
+                        if melhor_fitness > melhor_fitness_global:
+                            melhor_fitness_global = melhor_fitness
+                            melhor_individuo_global = melhor_individuo
+
+                    for g in range(passo):
+                        metricas, resultado = self._consolidar([r[0][g] for r in resultados])
+                        self.historico.append(metricas)
+                        if log is not None:
+                            ag.escrever_geracao(log, geracao + g, metricas, tempo, resultado)
+
+                    geracao += passo
+                    if geracao < populacoes:
+                        migrantes = self._migrar([r[1] for r in resultados])
+                        self.migracoes += 1
+
+                if log is not None:
+                    ag.escrever_melhor(log, melhor_fitness_global, melhor_individuo_global)
+        finally:
+            for ilha in ilhas:
+                ilha.fechar()
+            self.tempo_total = time.perf_counter() - inicio_total
+
+        return melhor_fitness_global, melhor_individuo_global
+
+    def relatorio(self) -> dict:
+        return {
+            "ilhas": self.num_ilhas,
+            "topologia": self.topologia,
+            "geracoes": len(self.historico),
+            "migracoes": self.migracoes,
+            "tempo_total": self.tempo_total,
+            "metricas": self.historico,
+        }
@@ -18,12 +18,12 @@ import constants as c
 # Matrix elements must be equal but not identical
 # 1 mark for creating the correct matrix
 
-def new_game(n):
+def new_game(n, rng=random):
     matrix = []
     for i in range(n):
         matrix.append([0] * n)
-    matrix = add_two(matrix)
-    matrix = add_two(matrix)
+    matrix = add_two(matrix, rng)
+    matrix = add_two(matrix, rng)
     return matrix
 
 ###########
@@ -35,12 +35,15 @@ def new_game(n):
 # Must ensure that it is created on a zero entry
 # 1 mark for creating the correct loop
 
-def add_two(mat):
-    a = random.randint(0, len(mat)-1)
-    b = random.randint(0, len(mat)-1)
+# rng can be any object with randint (random module, random.Random or a
+# fita.FitaAleatoria tape shared between simulations)
+
+def add_two(mat, rng=random):
+    a = rng.randint(0, len(mat)-1)
+    b = rng.randint(0, len(mat)-1)
     while mat[a][b] != 0:
-        a = random.randint(0, len(mat)-1)
-        b = random.randint(0, len(mat)-1)
+        a = rng.randint(0, len(mat)-1)
+        b = rng.randint(0, len(mat)-1)
     mat[a][b] = 2
     return mat
 
@@ -159,7 +162,6 @@ def merge(mat, done):
     return mat, done
 
 def up(game):
-    print("up")
     # return matrix after shifting up
     game = transpose(game)
     game, done = cover_up(game)
@@ -169,7 +171,6 @@ def up(game):
     return game, done
 
 def down(game):
-    print("down")
     # return matrix after shifting down
     game = reverse(transpose(game))
     game, done = cover_up(game)
@@ -179,7 +180,6 @@ def down(game):
     return game, done
 
 def left(game):
-    print("left")
     # return matrix after shifting left
     game, done = cover_up(game)
     game, done = merge(game, done)
@@ -187,7 +187,6 @@ def left(game):
     return game, done
 
 def right(game):
-    print("right")
     # return matrix after shifting right
     game = reverse(game)
     game, done = cover_up(game)
@@ -0,0 +1,166 @@
+# Simulador em lote com NumPy
+#
+# Joga as K simulações de Monte Carlo de um indivíduo ao mesmo tempo: os
+# tabuleiros ficam em um array (K, GRID_LEN, GRID_LEN) e cada gene é aplicado
+# a todos os tabuleiros ainda vivos de uma vez. Tabuleiros que terminaram
+# (vitória ou derrota) saem da máscara e os que não mudaram com o movimento
+# não recebem tile novo, exatamente como em algorithm.executar_jogo.
+
+import random
+import numpy as np
+import estatisticas as est
+import constants as c
+
+TILE_VITORIA = 2048
+
+
+def _orientar(tabuleiros: np.ndarray, movimento: str) -> np.ndarray:
+    # Devolve uma view em que o movimento vira "left" ao longo do último eixo
+    if movimento == 'left':
+        return tabuleiros
+    if movimento == 'right':
+        return tabuleiros[..., ::-1]
+    if movimento == 'up':
+        return tabuleiros.transpose(0, 2, 1)
+    return tabuleiros.transpose(0, 2, 1)[..., ::-1]
+
+
+def _desorientar(tabuleiros: np.ndarray, movimento: str) -> np.ndarray:
+    if movimento == 'left':
+        return tabuleiros
+    if movimento == 'right':
+        return tabuleiros[..., ::-1]
+    if movimento == 'up':
+        return tabuleiros.transpose(0, 2, 1)
+    return tabuleiros[..., ::-1].transpose(0, 2, 1)
+
+
+def _compactar(linhas: np.ndarray) -> np.ndarray:
+    # Ordenação estável pela chave "é zero" leva os tiles para a esquerda
+    # mantendo a ordem entre eles (equivalente ao logic.cover_up)
+    ordem = np.argsort(linhas == 0, axis=-1, kind='stable')
+    return np.take_along_axis(linhas, ordem, axis=-1)
+
+
+def _mover_esquerda(tabuleiros: np.ndarray) -> np.ndarray:
+    linhas = _compactar(tabuleiros)
+    for j in range(linhas.shape[-1] - 1):
+        atual = linhas[..., j]
+        proximo = linhas[..., j + 1]
+        iguais = (atual == proximo) & (atual != 0)
+        atual[iguais] *= 2
+        proximo[iguais] = 0
+    return _compactar(linhas)
+
+
+def mover(tabuleiros: np.ndarray, movimento: str) -> tuple[np.ndarray, np.ndarray]:
+    movidos = _mover_esquerda(_orientar(tabuleiros, movimento))
+    novos = np.ascontiguousarray(_desorientar(movidos, movimento))
+    mudou = (novos != tabuleiros).any(axis=(1, 2))
+    return novos, mudou
+
+
+def terminados(tabuleiros: np.ndarray) -> np.ndarray:
+    # Mesmo critério do logic.game_state: 'win' ou 'lose'
+    vitoria = (tabuleiros == TILE_VITORIA).any(axis=(1, 2))
+    vazio = (tabuleiros == 0).any(axis=(1, 2))
+    vizinhos_iguais = (
+        (tabuleiros[:, :, :-1] == tabuleiros[:, :, 1:]).any(axis=(1, 2))
+        | (tabuleiros[:, :-1, :] == tabuleiros[:, 1:, :]).any(axis=(1, 2))
+    )
+    return vitoria | ~(vazio | vizinhos_iguais)
+
+
+def adicionar_dois(tabuleiros: np.ndarray, mascara: np.ndarray, rng: np.random.Generator):
+    # Sorteia uma célula vazia uniforme por tabuleiro: pesos aleatórios nas
+    # células vazias e -1 nas ocupadas, a maior posição vence
+    indices = np.flatnonzero(mascara)
+    if indices.size == 0:
+        return tabuleiros
+    plano = tabuleiros.reshape(tabuleiros.shape[0], -1)
+    pesos = rng.random((indices.size, plano.shape[1]))
+    pesos[plano[indices] != 0] = -1.0
+    plano[indices, pesos.argmax(axis=1)] = 2
+    return tabuleiros
+
+
+def novos_jogos(quantidade: int, rng: np.random.Generator, n: int = c.GRID_LEN) -> np.ndarray:
+    tabuleiros = np.zeros((quantidade, n, n), dtype=np.int32)
+    todos = np.ones(quantidade, dtype=bool)
+    adicionar_dois(tabuleiros, todos, rng)
+    adicionar_dois(tabuleiros, todos, rng)
+    return tabuleiros
+
+
+def _gerador(rng) -> np.random.Generator:
+    # Sem gerador explícito a semente vem do random global, para que
+    # random.seed continue controlando as simulações
+    if rng is None:
+        return np.random.default_rng(random.getrandbits(64))
+    return rng
+
+
+def simular(
+    individuo: list[str], num_simulacoes: int, rng: np.random.Generator = None
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = _gerador(rng)
+    tabuleiros = novos_jogos(num_simulacoes, rng)
+    movimentos_validos = np.zeros(num_simulacoes, dtype=np.int64)
+    vivos = np.ones(num_simulacoes, dtype=bool)
+
+    for movimento in individuo:
+        if movimento not in ('up', 'down', 'left', 'right'):
+            continue
+
+        ativos = np.flatnonzero(vivos)
+        fim = terminados(tabuleiros[ativos])
+        if fim.any():
+            vivos[ativos[fim]] = False
+            ativos = ativos[~fim]
+        if ativos.size == 0:
+            break
+
+        novos, mudou = mover(tabuleiros[ativos], movimento)
+        if not mudou.any():
+            continue
+        novos = adicionar_dois(novos, mudou, rng)
+        alterados = ativos[mudou]
+        tabuleiros[alterados] = novos[mudou]
+        movimentos_validos[alterados] += 1
+
+    return tabuleiros.max(axis=(1, 2)), movimentos_validos
+
+
+def executar_jogo(individuo: list[str], rng: np.random.Generator = None) -> tuple[int, int]:
+    maiores_tiles, movimentos = simular(individuo, 1, rng)
+    return int(maiores_tiles[0]), int(movimentos[0])
+
+
+def fitness(
+    individuo: list[str],
+    num_simulacoes: int,
+    rng: np.random.Generator = None,
+    estatisticas: bool = False
+) -> dict:
+    maiores_tiles, movimentos = simular(individuo, num_simulacoes, rng)
+    return resultado_fitness(maiores_tiles, movimentos, estatisticas)
+
+
+def resultado_fitness(
+    maiores_tiles: np.ndarray, movimentos: np.ndarray, estatisticas: bool = False
+) -> dict:
+    # Dicionário do algorithm.fitness a partir dos jogos de um lote
+    resultado = {
+        "media_tile": float(maiores_tiles.mean()),
+        "media_movimentos": float(movimentos.mean()),
+        "maior_tile": int(maiores_tiles.max()),
+        "distribuicao_tiles": {
+            limite: int((maiores_tiles >= limite).sum())
+            for limite in (128, 256, 512, 1024, 2048)
+        }
+    }
+    if estatisticas:
+        agregado = est.EstatisticasJogos()
+        agregado.adicionar_lote(maiores_tiles.tolist(), movimentos.tolist())
+        resultado["estatisticas"] = agregado.para_dict()
+    return resultado
@@ -0,0 +1,196 @@
+# Agente de Monte Carlo puro: escolhe cada jogada por rollouts aleatórios
+#
+# Para cada movimento que muda o tabuleiro, o agente joga rollouts_por_movimento
+# partidas aleatórias a partir do tabuleiro resultante (cada uma com o seu
+# próprio tile novo) até o fim do jogo ou profundidade_max passos, e pontua
+# o movimento pela média de movimentos válidos sobrevividos. Os rollouts de
+# todos os movimentos vão juntos em um único lote do lote.py, dividido entre
+# os workers do executor.
+#
+# Os rollouts rodam em rodadas: depois de cada uma, se o intervalo de
+# confiança (média ± z * erro padrão) do melhor movimento fica inteiro acima
+# dos intervalos dos outros, o resto do orçamento é cortado.
+
+import argparse
+import random
+import time
+import numpy as np
+import executores
+import logic
+import lote
+import constants as c
+
+MOVIMENTOS = ('up', 'down', 'left', 'right')
+
+
+def rolar(tabuleiros: np.ndarray, profundidade_max: int, rng: np.random.Generator) -> np.ndarray:
+    # Movimentos aleatórios até terminar; devolve os movimentos válidos de cada tabuleiro
+    tabuleiros = tabuleiros.copy()
+    pontos = np.zeros(tabuleiros.shape[0], dtype=np.int64)
+    vivos = ~lote.terminados(tabuleiros)
+
+    for _ in range(profundidade_max):
+        ativos = np.flatnonzero(vivos)
+        if ativos.size == 0:
+            break
+        direcoes = rng.integers(0, len(MOVIMENTOS), size=ativos.size)
+        for codigo, movimento in enumerate(MOVIMENTOS):
+            selecionados = ativos[direcoes == codigo]
+            if selecionados.size == 0:
+                continue
+            novos, mudou = lote.mover(tabuleiros[selecionados], movimento)
+            if not mudou.any():
+                continue
+            novos = lote.adicionar_dois(novos, mudou, rng)
+            alterados = selecionados[mudou]
+            tabuleiros[alterados] = novos[mudou]
+            pontos[alterados] += 1
+        vivos[ativos] = ~lote.terminados(tabuleiros[ativos])
+
+    return pontos
+
+
+def rolar_tarefa(tarefa: tuple) -> np.ndarray:
+    # Tarefa picklável para os executores: (tabuleiros, profundidade_max, semente)
+    tabuleiros, profundidade_max, semente = tarefa
+    rng = np.random.default_rng(semente)
+    # Cada rollout começa sorteando o seu próprio tile novo
+    tabuleiros = lote.adicionar_dois(tabuleiros.copy(), np.ones(len(tabuleiros), dtype=bool), rng)
+    return rolar(tabuleiros, profundidade_max, rng)
+
+
+class AgenteMonteCarlo:
+    def __init__(
+        self,
+        rollouts_por_movimento: int = 200,
+        profundidade_max: int = 50,
+        executor=None,
+        rodadas: int = 4,
+        z: float = 2.58,
+        semente: int = None
+    ):
+        self.rollouts_por_movimento = rollouts_por_movimento
+        self.profundidade_max = profundidade_max
+        self.executor = executor or executores.ExecutorSerial()
+        self.rodadas = max(1, rodadas)
+        self.z = z
+        self._rng = np.random.default_rng(random.getrandbits(64) if semente is None else semente)
+        self.rollouts = 0
+        self.tempo = 0.0
+        self.jogadas = 0
+        self.cortes = 0
+
+    def _rolar(self, tabuleiros: np.ndarray) -> np.ndarray:
+        # Divide o lote entre os workers, cada pedaço com uma semente própria
+        pedacos = np.array_split(tabuleiros, min(len(tabuleiros), self.executor.processos))
+        sementes = self._rng.integers(0, 2 ** 63, size=len(pedacos))
+        tarefas = [
+            (pedaco, self.profundidade_max, int(semente))
+            for pedaco, semente in zip(pedacos, sementes)
+        ]
+        return np.concatenate(self.executor.mapear(rolar_tarefa, tarefas))
+
+    def avaliar(self, matriz: list[list[int]]) -> dict[str, float]:
+        # Média de movimentos sobrevividos (contando o próprio) por movimento válido
+        candidatos = {}
+        for movimento in MOVIMENTOS:
+            novo, mudou = getattr(logic, movimento)([linha[:] for linha in matriz])
+            if mudou:
+                candidatos[movimento] = np.array(novo, dtype=np.int32)
+        if not candidatos:
+            return {}
+
+        inicio = time.perf_counter()
+        nomes = list(candidatos)
+        base = np.stack([candidatos[nome] for nome in nomes])
+        pontos = [[] for _ in nomes]
+        por_rodada = max(1, -(-self.rollouts_por_movimento // self.rodadas))
+        feitos = 0
+        while feitos < self.rollouts_por_movimento:
+            quantidade = min(por_rodada, self.rollouts_por_movimento - feitos)
+            resultado = self._rolar(np.repeat(base, quantidade, axis=0))
+            for i in range(len(nomes)):
+                pontos[i].append(resultado[i * quantidade:(i + 1) * quantidade])
+            feitos += quantidade
+            self.rollouts += quantidade * len(nomes)
+            if feitos < self.rollouts_por_movimento and self._domina(pontos):
+                self.cortes += 1
+                break
+
+        self.tempo += time.perf_counter() - inicio
+        return {nome: 1 + float(np.concatenate(p).mean()) for nome, p in zip(nomes, pontos)}
+
+    def _domina(self, pontos: list[list[np.ndarray]]) -> bool:
+        if len(pontos) < 2:
+            return True
+        medias = []
+        erros = []
+        for partes in pontos:
+            valores = np.concatenate(partes)
+            medias.append(valores.mean())
+            erros.append(valores.std(ddof=1) / np.sqrt(len(valores)) if len(valores) > 1 else np.inf)
+        melhor = int(np.argmax(medias))
+        piso = medias[melhor] - self.z * erros[melhor]
+        return all(
+            medias[i] + self.z * erros[i] < piso for i in range(len(medias)) if i != melhor
+        )
+
+    def escolher(self, matriz: list[list[int]]) -> str:
+        medias = self.avaliar(matriz)
+        if not medias:
+            return None
+        self.jogadas += 1
+        return max(medias, key=medias.get)
+
+    def jogar(self, rng=random, max_jogadas: int = None) -> tuple[list[str], int, int]:
+        # Partida sem interface no logic; devolve a sequência, o maior tile e os movimentos
+        matriz = logic.new_game(c.GRID_LEN, rng)
+        individuo = []
+        while logic.game_state(matriz) == 'not over':
+            if max_jogadas is not None and len(individuo) >= max_jogadas:
+                break
+            movimento = self.escolher(matriz)
+            if movimento is None:
+                break
+            matriz, _ = getattr(logic, movimento)(matriz)
+            matriz = logic.add_two(matriz, rng)
+            individuo.append(movimento)
+        return individuo, max(max(linha) for linha in matriz), len(individuo)
+
+    def estatisticas(self) -> dict:
+        return {
+            "rollouts": self.rollouts,
+            "tempo": self.tempo,
+            "rollouts_por_segundo": self.rollouts / self.tempo if self.tempo else 0.0,
+            "jogadas": self.jogadas,
+            "cortes": self.cortes,
+        }
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Agente de Monte Carlo do 2048")
+    parser.add_argument("--jogos", type=int, default=1)
+    parser.add_argument("--rollouts", type=int, default=200, help="rollouts por movimento")
+    parser.add_argument("--profundidade", type=int, default=50)
+    parser.add_argument("--rodadas", type=int, default=4)
+    parser.add_argument("--executor", choices=sorted(executores.EXECUTORES), default="serial")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rng = random if args.seed is None else random.Random(args.seed)
+    with executores.criar_executor(args.executor, args.processos, semente=args.seed) as executor:
+        agente = AgenteMonteCarlo(
+            args.rollouts, args.profundidade, executor, args.rodadas, semente=args.seed
+        )
+        for indice in range(args.jogos):
+            _, maior_tile, movimentos = agente.jogar(rng)
+            print(f"Jogo {indice + 1}: maior tile {maior_tile}, {movimentos} movimentos")
+
+    estatisticas = agente.estatisticas()
+    print(f"Rollouts/s: {estatisticas['rollouts_por_segundo']:.0f}")
+    print(f"Jogadas cortadas cedo: {estatisticas['cortes']} de {estatisticas['jogadas']}")
+
+
+if __name__ == "__main__":
+    main()
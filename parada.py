@@ -0,0 +1,172 @@
+# Critérios de parada antecipada do rodar_ag
+#
+# Depois de cada geração o rodar_ag chama atualizar(); se algum critério
+# disparar, a execução termina ali e devolve o melhor indivíduo até então.
+#
+#   estagnacao  -> o melhor fitness global não subiu mais que melhora_minima
+#                  nas últimas janela_estagnacao gerações
+#   tile_alvo   -> algum indivíduo alcançou o tile em alguma simulação
+#   tempo       -> a próxima geração (estimada pela duração da última)
+#                  passaria de tempo_maximo segundos desde o início
+#   simulacoes  -> idem para o total de jogos simulados
+#
+# Os orçamentos de tempo e de simulações olham a próxima geração porque uma
+# geração não é interrompida no meio: assim o limite vale de verdade, e a
+# primeira geração sempre roda para haver um melhor indivíduo.
+#
+# Com janela_mutacao, depois dessa quantidade de gerações sem melhora a taxa
+# de mutação é multiplicada por fator_mutacao (até mutacao_maxima), e volta
+# ao valor original assim que o fitness melhora de novo.
+#
+# estado()/restaurar() levam o progresso dos critérios (referência de
+# melhora, gerações sem melhora, taxa adaptada, tempo e simulações gastos)
+# no checkpoint do rodar_ag, e a retomada continua de onde parou.
+
+import time
+
+MOTIVOS = ("estagnacao", "tile_alvo", "tempo", "simulacoes")
+
+
+class CriteriosParada:
+    def __init__(
+        self,
+        janela_estagnacao: int = None,
+        melhora_minima: float = 0.0,
+        tile_alvo: int = None,
+        tempo_maximo: float = None,
+        simulacoes_maximas: int = None,
+        janela_mutacao: int = None,
+        fator_mutacao: float = 2.0,
+        mutacao_maxima: float = 0.5
+    ):
+        self.janela_estagnacao = janela_estagnacao
+        self.melhora_minima = melhora_minima
+        self.tile_alvo = tile_alvo
+        self.tempo_maximo = tempo_maximo
+        self.simulacoes_maximas = simulacoes_maximas
+        self.janela_mutacao = janela_mutacao
+        self.fator_mutacao = fator_mutacao
+        self.mutacao_maxima = mutacao_maxima
+        self.iniciar(0, 0.0)
+
+    def iniciar(self, populacoes: int, taxa_mutacao: float, geracao_inicial: int = 0):
+        self.populacoes = populacoes
+        self.geracao_inicial = geracao_inicial
+        self.taxa_original = taxa_mutacao
+        self.taxa_mutacao = taxa_mutacao
+        self.motivo = None
+        self.geracao_parada = None
+        self.geracoes = 0
+        self.simulacoes = 0
+        self.ajustes_mutacao = 0
+        self._referencia = float('-inf')
+        self._sem_melhora = 0
+        self._inicio = time.perf_counter()
+        self.tempo = 0.0
+
+    def estado(self) -> dict:
+        return {
+            "geracao_inicial": self.geracao_inicial,
+            "taxa_original": self.taxa_original,
+            "taxa_mutacao": self.taxa_mutacao,
+            "geracoes": self.geracoes,
+            "simulacoes": self.simulacoes,
+            "ajustes_mutacao": self.ajustes_mutacao,
+            "referencia": self._referencia,
+            "sem_melhora": self._sem_melhora,
+            "tempo": self.tempo,
+        }
+
+    def restaurar(self, populacoes: int, estado: dict):
+        # Continua a contagem salva: o tempo já gasto entra no orçamento
+        self.iniciar(populacoes, estado["taxa_original"], estado["geracao_inicial"])
+        self.taxa_mutacao = estado["taxa_mutacao"]
+        self.geracoes = estado["geracoes"]
+        self.simulacoes = estado["simulacoes"]
+        self.ajustes_mutacao = estado["ajustes_mutacao"]
+        self._referencia = estado["referencia"]
+        self._sem_melhora = estado["sem_melhora"]
+        self.tempo = estado["tempo"]
+        self._inicio -= self.tempo
+
+    def _simulacoes_geracao(self, populacao_avaliada: list, num_simulacoes: int) -> int:
+        # Mesma contagem da telemetria: a corrida informa quantos jogos cada um
+        # jogou, e os resultados do cache (do_cache) não jogaram nesta geração
+        return sum(
+            resultado.get("num_simulacoes", num_simulacoes)
+            for _, resultado, _ in populacao_avaliada if not resultado.get("do_cache")
+        )
+
+    def _adaptar_mutacao(self, melhorou: bool):
+        if self.janela_mutacao is None:
+            return
+        if melhorou:
+            self.taxa_mutacao = self.taxa_original
+        elif self._sem_melhora and self._sem_melhora % self.janela_mutacao == 0:
+            nova = min(self.mutacao_maxima, self.taxa_mutacao * self.fator_mutacao)
+            if nova != self.taxa_mutacao:
+                self.taxa_mutacao = nova
+                self.ajustes_mutacao += 1
+
+    def atualizar(
+        self,
+        geracao: int,
+        melhor_fitness_global: float,
+        populacao_avaliada: list,
+        num_simulacoes: int
+    ) -> str:
+        # Devolve o motivo da parada, ou None para continuar
+        simulacoes = self._simulacoes_geracao(populacao_avaliada, num_simulacoes)
+        self.geracoes += 1
+        self.simulacoes += simulacoes
+        self.tempo = time.perf_counter() - self._inicio
+
+        melhorou = melhor_fitness_global > self._referencia + self.melhora_minima
+        if melhorou:
+            self._referencia = melhor_fitness_global
+            self._sem_melhora = 0
+        else:
+            self._sem_melhora += 1
+        self._adaptar_mutacao(melhorou)
+
+        motivo = None
+        if self.tile_alvo is not None and any(
+            resultado["maior_tile"] >= self.tile_alvo for _, resultado, _ in populacao_avaliada
+        ):
+            motivo = "tile_alvo"
+        elif self.janela_estagnacao is not None and self._sem_melhora >= self.janela_estagnacao:
+            motivo = "estagnacao"
+        elif self.tempo_maximo is not None and (
+            self.tempo + self.tempo / self.geracoes > self.tempo_maximo
+        ):
+            motivo = "tempo"
+        elif self.simulacoes_maximas is not None and (
+            self.simulacoes + simulacoes > self.simulacoes_maximas
+        ):
+            motivo = "simulacoes"
+
+        if motivo is not None and geracao + 1 < self.populacoes:
+            self.motivo = motivo
+            self.geracao_parada = geracao
+            return motivo
+        return None
+
+    def relatorio(self) -> dict:
+        # Economia estimada pela média por geração do que de fato rodou
+        planejadas = max(0, self.populacoes - self.geracao_inicial)
+        economizadas = planejadas - self.geracoes if self.motivo is not None else 0
+        por_geracao = self.simulacoes / self.geracoes if self.geracoes else 0.0
+        tempo_por_geracao = self.tempo / self.geracoes if self.geracoes else 0.0
+        return {
+            "motivo": self.motivo,
+            "geracao_parada": self.geracao_parada,
+            "geracoes": self.geracoes,
+            "geracoes_economizadas": economizadas,
+            "simulacoes": self.simulacoes,
+            "simulacoes_economizadas": round(economizadas * por_geracao),
+            "tempo": self.tempo,
+            "tempo_economizado": economizadas * tempo_por_geracao,
+            "economia": economizadas / planejadas if planejadas else 0.0,
+            "taxa_mutacao": self.taxa_mutacao,
+            "ajustes_mutacao": self.ajustes_mutacao,
+        }
@@ -0,0 +1,152 @@
+# Genoma de pesos heurísticos (tipo_genoma='pesos')
+#
+# Em vez de uma sequência fixa de movimentos, o indivíduo é um vetor curto
+# de pesos, um por característica do tabuleiro. A cada jogada o jogador
+# calcula os quatro tabuleiros candidatos, pontua cada um pela soma
+# ponderada das características e joga o melhor entre os que mudam o
+# tabuleiro, então reage aos tiles sorteados em vez de gastar genes.
+#
+# As simulações rodam em lote como no lote.py: os num_simulacoes jogos
+# andam juntos, os quatro movimentos são aplicados a todos os tabuleiros
+# ainda vivos e as características dos 4 x vivos candidatos saem de uma
+# única passada vetorizada. O jogo termina pelo mesmo critério do
+# logic.game_state (derrota ou tile 2048).
+#
+# Características (em log2, normalizadas para ficar perto de [-1, 1]):
+#   vazias          -> células vazias
+#   monotonicidade  -> menos a soma, por linha e coluna, da menor das duas
+#                      quebras de ordem (crescente ou decrescente)
+#   suavidade       -> menos a diferença entre vizinhos ocupados
+#   canto_maximo    -> 1 se o maior tile está em um canto
+#   merges          -> pares de vizinhos iguais (junções possíveis)
+
+import random
+import numpy as np
+import lote
+
+CARACTERISTICAS = ("vazias", "monotonicidade", "suavidade", "canto_maximo", "merges")
+MOVIMENTOS = ('up', 'down', 'left', 'right')
+ESCALA_MUTACAO = 0.5
+EXPOENTE_REFERENCIA = 11  # 2048
+
+
+def _expoentes(tabuleiros: np.ndarray) -> np.ndarray:
+    return np.log2(np.maximum(tabuleiros, 1)).astype(np.float64)
+
+
+def caracteristicas(tabuleiros: np.ndarray) -> np.ndarray:
+    # (k, n, n) -> (k, len(CARACTERISTICAS))
+    k, n, _ = tabuleiros.shape
+    expoentes = _expoentes(tabuleiros)
+    ocupadas = tabuleiros != 0
+
+    vazias = (~ocupadas).sum(axis=(1, 2)) / (n * n)
+
+    monotonicidade = np.zeros(k)
+    suavidade = np.zeros(k)
+    merges = np.zeros(k)
+    # eixo 2: vizinhos na mesma linha; eixo 1: na mesma coluna
+    for eixo in (1, 2):
+        diferencas = np.diff(expoentes, axis=eixo)
+        crescente = np.clip(diferencas, 0, None).sum(axis=eixo)
+        decrescente = np.clip(-diferencas, 0, None).sum(axis=eixo)
+        monotonicidade -= np.minimum(crescente, decrescente).sum(axis=1)
+
+        ambos = np.take(ocupadas, range(n - 1), axis=eixo) & np.take(ocupadas, range(1, n), axis=eixo)
+        suavidade -= np.where(ambos, np.abs(diferencas), 0).sum(axis=(1, 2))
+        merges += (ambos & (diferencas == 0)).sum(axis=(1, 2))
+
+    maximos = tabuleiros.max(axis=(1, 2))
+    cantos = np.stack([
+        tabuleiros[:, 0, 0], tabuleiros[:, 0, -1], tabuleiros[:, -1, 0], tabuleiros[:, -1, -1]
+    ], axis=1)
+    canto_maximo = (cantos == maximos[:, None]).any(axis=1)
+
+    return np.stack([
+        vazias,
+        monotonicidade / (2 * n * EXPOENTE_REFERENCIA),
+        suavidade / (2 * n * (n - 1) * EXPOENTE_REFERENCIA),
+        canto_maximo.astype(np.float64),
+        merges / (2 * n * (n - 1)),
+    ], axis=1)
+
+
+def pontuar(individuo, tabuleiros: np.ndarray) -> np.ndarray:
+    return caracteristicas(tabuleiros) @ np.asarray(individuo, dtype=np.float64)
+
+
+def escolher(individuo, tabuleiros: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Para cada tabuleiro: o tabuleiro após o melhor movimento e se houve
+    # algum movimento válido
+    k, n, _ = tabuleiros.shape
+    candidatos = np.empty((len(MOVIMENTOS), k, n, n), dtype=tabuleiros.dtype)
+    mudou = np.empty((len(MOVIMENTOS), k), dtype=bool)
+    for i, movimento in enumerate(MOVIMENTOS):
+        candidatos[i], mudou[i] = lote.mover(tabuleiros, movimento)
+
+    notas = pontuar(individuo, candidatos.reshape(-1, n, n)).reshape(len(MOVIMENTOS), k)
+    notas[~mudou] = -np.inf
+    escolhas = notas.argmax(axis=0)
+    return candidatos[escolhas, np.arange(k)], mudou.any(axis=0)
+
+
+def simular(
+    individuo, num_simulacoes: int, rng: np.random.Generator = None
+) -> tuple[np.ndarray, np.ndarray]:
+    # Sem gerador explícito a semente vem do random global, como no lote.py
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    tabuleiros = lote.novos_jogos(num_simulacoes, rng)
+    movimentos_validos = np.zeros(num_simulacoes, dtype=np.int64)
+    vivos = ~lote.terminados(tabuleiros)
+
+    while vivos.any():
+        ativos = np.flatnonzero(vivos)
+        novos, validos = escolher(individuo, tabuleiros[ativos])
+        novos = lote.adicionar_dois(novos, validos, rng)
+        alterados = ativos[validos]
+        tabuleiros[alterados] = novos[validos]
+        movimentos_validos[alterados] += 1
+        vivos[ativos] = validos & ~lote.terminados(tabuleiros[ativos])
+
+    return tabuleiros.max(axis=(1, 2)), movimentos_validos
+
+
+def executar_jogo(individuo, rng: np.random.Generator = None) -> tuple[int, int]:
+    maiores_tiles, movimentos = simular(individuo, 1, rng)
+    return int(maiores_tiles[0]), int(movimentos[0])
+
+
+def fitness(
+    individuo,
+    num_simulacoes: int,
+    rng: np.random.Generator = None,
+    estatisticas: bool = False
+) -> dict:
+    maiores_tiles, movimentos = simular(individuo, num_simulacoes, rng)
+    return lote.resultado_fitness(maiores_tiles, movimentos, estatisticas)
+
+
+# Operadores do AG, com o random global (semeado pelo rodar_ag)
+
+def gerar_individuo(tamanho: int = None) -> list[float]:
+    # O tamanho é sempre o número de características
+    return [random.gauss(0.0, 1.0) for _ in CARACTERISTICAS]
+
+
+def cruzar(pai1: list[float], pai2: list[float]) -> tuple[list[float], list[float]]:
+    # Cruzamento aritmético: cada gene dos filhos é uma mistura dos pais
+    filho1 = []
+    filho2 = []
+    for gene1, gene2 in zip(pai1, pai2):
+        alfa = random.random()
+        filho1.append(alfa * gene1 + (1 - alfa) * gene2)
+        filho2.append((1 - alfa) * gene1 + alfa * gene2)
+    return filho1, filho2
+
+
+def mutar(individuo: list[float], taxa_mutacao: float) -> list[float]:
+    return [
+        gene + random.gauss(0.0, ESCALA_MUTACAO) if random.random() < taxa_mutacao else gene
+        for gene in individuo
+    ]
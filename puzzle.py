@@ -1,5 +1,8 @@
 from tkinter import Frame, Label, CENTER
+import argparse
 import random
+import gravacao
+import historico
 import logic
 import constants as c
 
@@ -7,7 +10,7 @@ def gen():
     return random.randint(0, c.GRID_LEN - 1)
 
 class GameGrid(Frame):
-    def __init__(self):
+    def __init__(self, agent=None):
         Frame.__init__(self)
 
         self.grid()
@@ -32,10 +35,13 @@ class GameGrid(Frame):
         self.grid_cells = []
         self.init_grid()
         self.matrix = logic.new_game(c.GRID_LEN)
-        self.history_matrixs = []
+        self.history = historico.Historico(c.HISTORY_DEPTH)
+        self.history.registrar(self.matrix)
         self.update_grid_cells()
 
-        self.mainloop()
+        # autoplay: the agent (montecarlo.AgenteMonteCarlo by default) picks every move
+        self.agent = agent
+        self.autoplay = False
 
     def init_grid(self):
         background = Frame(self, bg=c.BACKGROUND_COLOR_GAME,width=c.SIZE, height=c.SIZE)
@@ -68,41 +74,118 @@ class GameGrid(Frame):
                 grid_row.append(t)
             self.grid_cells.append(grid_row)
 
+    def draw_cell(self, i, j, new_number):
+        if new_number == 0:
+            self.grid_cells[i][j].configure(text="",bg=c.BACKGROUND_COLOR_CELL_EMPTY)
+        else:
+            self.grid_cells[i][j].configure(
+                text=str(new_number),
+                bg=c.BACKGROUND_COLOR_DICT[new_number],
+                fg=c.CELL_COLOR_DICT[new_number]
+            )
+
     def update_grid_cells(self):
         for i in range(c.GRID_LEN):
             for j in range(c.GRID_LEN):
-                new_number = self.matrix[i][j]
-                if new_number == 0:
-                    self.grid_cells[i][j].configure(text="",bg=c.BACKGROUND_COLOR_CELL_EMPTY)
-                else:
-                    self.grid_cells[i][j].configure(
-                        text=str(new_number),
-                        bg=c.BACKGROUND_COLOR_DICT[new_number],
-                        fg=c.CELL_COLOR_DICT[new_number]
-                    )
+                self.draw_cell(i, j, self.matrix[i][j])
+        # what is on screen, so update_changed_cells can skip untouched labels
+        self.shown = [row[:] for row in self.matrix]
+        self.update_idletasks()
+
+    def update_changed_cells(self):
+        for i in range(c.GRID_LEN):
+            for j in range(c.GRID_LEN):
+                if self.matrix[i][j] != self.shown[i][j]:
+                    self.draw_cell(i, j, self.matrix[i][j])
+                    self.shown[i][j] = self.matrix[i][j]
         self.update_idletasks()
 
+    def show_game_over(self):
+        if logic.game_state(self.matrix) == 'win':
+            self.grid_cells[1][1].configure(text="You", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
+            self.grid_cells[1][2].configure(text="Win!", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
+        if logic.game_state(self.matrix) == 'lose':
+            self.grid_cells[1][1].configure(text="You", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
+            self.grid_cells[1][2].configure(text="Lose!", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
+
     def key_down(self, event):
         key = event.keysym
         print(event)
         if key == c.KEY_QUIT: exit()
-        if key == c.KEY_BACK and len(self.history_matrixs) > 1:
-            self.matrix = self.history_matrixs.pop()
-            self.update_grid_cells()
-            print('back on step total step:', len(self.history_matrixs))
+        if key == c.KEY_BACK:
+            self.show_step(self.history.desfazer())
+        elif key == c.KEY_REDO:
+            self.show_step(self.history.refazer())
+        elif key == c.KEY_AUTOPLAY:
+            self.toggle_autoplay()
         elif key in self.commands:
-            self.matrix, done = self.commands[key](self.matrix)
-            if done:
-                self.matrix = logic.add_two(self.matrix)
-                # record last move
-                self.history_matrixs.append(self.matrix)
-                self.update_grid_cells()
-                if logic.game_state(self.matrix) == 'win':
-                    self.grid_cells[1][1].configure(text="You", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
-                    self.grid_cells[1][2].configure(text="Win!", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
-                if logic.game_state(self.matrix) == 'lose':
-                    self.grid_cells[1][1].configure(text="You", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
-                    self.grid_cells[1][2].configure(text="Lose!", bg=c.BACKGROUND_COLOR_CELL_EMPTY)
+            self.apply_move(self.commands[key])
+
+    def apply_move(self, move):
+        self.matrix, done = move(self.matrix)
+        if done:
+            self.matrix = logic.add_two(self.matrix)
+            # record last move
+            self.history.registrar(self.matrix)
+            self.update_grid_cells()
+            self.show_game_over()
+        return done
+
+    def show_step(self, matrix):
+        # matrix comes from the history (undo, redo or jump); None means no step there
+        if matrix is None:
+            return False
+        self.matrix = matrix
+        self.update_grid_cells()
+        print('step', self.history.atual, 'of', self.history.fim - 1)
+        return True
+
+    def jump_to(self, step):
+        return self.show_step(self.history.ir_para(step))
+
+    def toggle_autoplay(self):
+        if self.agent is None:
+            import montecarlo
+            self.agent = montecarlo.AgenteMonteCarlo()
+        self.autoplay = not self.autoplay
+        if self.autoplay:
+            self.after(c.AUTOPLAY_DELAY, self.autoplay_step)
+
+    def autoplay_step(self):
+        if not self.autoplay or logic.game_state(self.matrix) != 'not over':
+            self.autoplay = False
+            return
+        move = self.agent.escolher(self.matrix)
+        if move is None:
+            self.autoplay = False
+            return
+        self.apply_move(getattr(logic, move))
+        self.after(c.AUTOPLAY_DELAY, self.autoplay_step)
+
+    def replay(self, trace, speed=c.REPLAY_SPEED, frame_skip=c.REPLAY_FRAME_SKIP):
+        # Plays a gravacao.Gravacao back at `speed` moves per second, drawing
+        # one frame every `frame_skip` moves and only the cells that changed
+        self.autoplay = False
+        self.frames = trace.quadros()
+        self.frame_skip = max(1, frame_skip)
+        self.replay_delay = max(1, int(1000 * self.frame_skip / speed))
+        _, self.matrix = next(self.frames)
+        self.update_grid_cells()
+        self.after(self.replay_delay, self.replay_step)
+
+    def replay_step(self):
+        finished = False
+        for _ in range(self.frame_skip):
+            frame = next(self.frames, None)
+            if frame is None:
+                finished = True
+                break
+            _, self.matrix = frame
+        self.update_changed_cells()
+        if finished:
+            self.show_game_over()
+        else:
+            self.after(self.replay_delay, self.replay_step)
 
     def generate_next(self):
         index = (gen(), gen())
@@ -110,4 +193,17 @@ class GameGrid(Frame):
             index = (gen(), gen())
         self.matrix[index[0]][index[1]] = 2
 
-game_grid = GameGrid()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="2048")
+    parser.add_argument("--autoplay", action="store_true", help="Monte Carlo agent plays")
+    parser.add_argument("--replay", default=None, help="game recorded by gravacao.py")
+    parser.add_argument("--speed", type=float, default=c.REPLAY_SPEED, help="replay moves per second")
+    parser.add_argument("--skip", type=int, default=c.REPLAY_FRAME_SKIP, help="moves per drawn frame")
+    args = parser.parse_args()
+
+    game_grid = GameGrid()
+    if args.replay:
+        game_grid.replay(gravacao.Gravacao.carregar(args.replay), args.speed, args.skip)
+    elif args.autoplay:
+        game_grid.toggle_autoplay()
+    game_grid.mainloop()
@@ -0,0 +1,295 @@
+# Registro persistente das execuções do rodar_ag em SQLite
+#
+# Uso: rodar_ag(..., registro=RegistroExecucoes("execucoes.db"))
+#      python registro.py execucoes.db            -> melhor de cada execução
+#      python registro.py execucoes.db --curva 3  -> fitness por geração da execução 3
+#
+# Tabelas:
+#   execucoes   -> uma linha por chamada do rodar_ag: parâmetros (JSON),
+#                  seed (em texto: as seeds vão até 2**64, além do INTEGER
+#                  do SQLite), engine, tipo de genoma, início/fim e o
+#                  melhor indivíduo ao final
+#   geracoes    -> as métricas do calcular_metricas de cada geração, jogos
+#                  simulados, vazão (jogos/s) e tempos; o resto das
+#                  métricas (percentis, histograma) vai em JSON
+#   individuos  -> genoma compacto (um byte por movimento, ou float64 por
+#                  peso) e o dicionário do fitness de cada avaliado
+#
+# Cada geração é gravada em uma única transação (executemany para os
+# indivíduos), com o banco em WAL e synchronous=NORMAL: o custo por geração
+# é um commit, sem fsync a cada linha. Uma execução que cai no meio deixa
+# as gerações já gravadas e fim NULL.
+
+import argparse
+import json
+import sqlite3
+import struct
+import time
+import checkpoint
+
+METRICAS = ("melhor_fitness", "pior_fitness", "medio_fitness", "desvio_padrao", "mediana")
+COLUNAS_CURVA = METRICAS + ("jogos", "jogos_por_segundo", "tempo_avaliacao", "tempo_total")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    id INTEGER PRIMARY KEY,
+    parametros TEXT NOT NULL,
+    seed TEXT,
+    engine TEXT,
+    tipo_genoma TEXT NOT NULL,
+    geracao_inicial INTEGER NOT NULL,
+    inicio REAL NOT NULL,
+    fim REAL,
+    tempo REAL,
+    geracoes INTEGER NOT NULL DEFAULT 0,
+    melhor_fitness REAL,
+    melhor_individuo BLOB,
+    motivo_parada TEXT
+);
+CREATE TABLE IF NOT EXISTS geracoes (
+    execucao INTEGER NOT NULL REFERENCES execucoes(id),
+    geracao INTEGER NOT NULL,
+    melhor_fitness REAL,
+    pior_fitness REAL,
+    medio_fitness REAL,
+    desvio_padrao REAL,
+    mediana REAL,
+    jogos INTEGER,
+    jogos_por_segundo REAL,
+    tempo_avaliacao REAL,
+    tempo_total REAL,
+    extras TEXT,
+    PRIMARY KEY (execucao, geracao)
+);
+CREATE TABLE IF NOT EXISTS individuos (
+    id INTEGER PRIMARY KEY,
+    execucao INTEGER NOT NULL REFERENCES execucoes(id),
+    geracao INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    fitness REAL NOT NULL,
+    genoma BLOB NOT NULL,
+    resultado TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS individuos_geracao ON individuos (execucao, geracao);
+CREATE INDEX IF NOT EXISTS individuos_fitness ON individuos (execucao, fitness);
+CREATE INDEX IF NOT EXISTS execucoes_melhor ON execucoes (melhor_fitness);
+"""
+
+
+def codificar_genoma(individuo, tipo_genoma: str = 'sequencia') -> bytes:
+    if tipo_genoma == 'sequencia':
+        return bytes(map(checkpoint.CODIGOS.__getitem__, individuo))
+    return struct.pack(f"<{len(individuo)}d", *individuo)
+
+
+def decodificar_genoma(dados: bytes, tipo_genoma: str = 'sequencia') -> list:
+    if tipo_genoma == 'sequencia':
+        return list(map(checkpoint.MOVIMENTOS.__getitem__, dados))
+    return list(struct.unpack(f"<{len(dados) // 8}d", dados))
+
+
+def _seed(valor):
+    return None if valor is None else int(valor)
+
+
+def _resultado(texto: str) -> dict:
+    # O JSON transforma as chaves da distribuição em texto
+    resultado = json.loads(texto)
+    if "distribuicao_tiles" in resultado:
+        resultado["distribuicao_tiles"] = {
+            int(limite): contagem for limite, contagem in resultado["distribuicao_tiles"].items()
+        }
+    return resultado
+
+
+class RegistroExecucoes:
+    def __init__(self, caminho: str = ":memory:", individuos: bool = True):
+        # individuos=False guarda só execuções e métricas por geração
+        self.caminho = caminho
+        self.gravar_individuos = individuos
+        self.execucao = None
+        self._tipo_genoma = 'sequencia'
+        self._inicio = None
+        self._conexao = sqlite3.connect(caminho)
+        self._conexao.row_factory = sqlite3.Row
+        if caminho != ":memory:":
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(_ESQUEMA)
+
+    # Gravação (chamada pelo rodar_ag)
+
+    def iniciar_execucao(self, parametros: dict, geracao_inicial: int = 0) -> int:
+        self._tipo_genoma = parametros.get("tipo_genoma", 'sequencia')
+        self._inicio = time.perf_counter()
+        seed = parametros.get("seed")
+        with self._conexao:
+            cursor = self._conexao.execute(
+                "INSERT INTO execucoes (parametros, seed, engine, tipo_genoma, geracao_inicial, inicio)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    json.dumps(parametros, sort_keys=True), None if seed is None else str(seed),
+                    parametros.get("engine"), self._tipo_genoma, geracao_inicial, time.time(),
+                )
+            )
+        self.execucao = cursor.lastrowid
+        return self.execucao
+
+    def registrar_geracao(
+        self,
+        geracao: int,
+        populacao_avaliada: list,
+        metricas: dict,
+        num_simulacoes: int,
+        tempo_avaliacao: float,
+        tempo_total: float
+    ):
+        if self.execucao is None:
+            raise RuntimeError("registrar_geracao antes de iniciar_execucao")
+        # Só os jogos simulados na geração: a corrida informa os de cada um e
+        # os resultados do cache (do_cache) não jogaram de novo
+        jogos = sum(
+            resultado.get("num_simulacoes", num_simulacoes)
+            for _, resultado, _ in populacao_avaliada if not resultado.get("do_cache")
+        )
+        extras = {chave: valor for chave, valor in metricas.items() if chave not in METRICAS}
+        linha = (
+            self.execucao, geracao, *(metricas[nome] for nome in METRICAS), jogos,
+            jogos / tempo_avaliacao if tempo_avaliacao else 0.0, tempo_avaliacao, tempo_total,
+            json.dumps(extras) if extras else None,
+        )
+        with self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO geracoes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", linha
+            )
+            if self.gravar_individuos:
+                self._conexao.executemany(
+                    "INSERT INTO individuos (execucao, geracao, posicao, fitness, genoma, resultado)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            self.execucao, geracao, posicao, fitness_val,
+                            codificar_genoma(individuo, self._tipo_genoma), json.dumps(resultado),
+                        )
+                        for posicao, (fitness_val, resultado, individuo) in enumerate(populacao_avaliada)
+                    )
+                )
+            self._conexao.execute(
+                "UPDATE execucoes SET geracoes = geracoes + 1 WHERE id = ?", (self.execucao,)
+            )
+
+    def finalizar_execucao(self, melhor_fitness: float, melhor_individuo: list, motivo_parada: str = None):
+        if self.execucao is None:
+            return
+        genoma = None if melhor_individuo is None else codificar_genoma(melhor_individuo, self._tipo_genoma)
+        with self._conexao:
+            self._conexao.execute(
+                "UPDATE execucoes SET fim = ?, tempo = ?, melhor_fitness = ?, melhor_individuo = ?,"
+                " motivo_parada = ? WHERE id = ?",
+                (
+                    time.time(), time.perf_counter() - self._inicio, melhor_fitness, genoma,
+                    motivo_parada, self.execucao,
+                )
+            )
+        self.execucao = None
+
+    # Consultas
+
+    def execucoes(self) -> list[dict]:
+        linhas = self._conexao.execute("SELECT * FROM execucoes ORDER BY id").fetchall()
+        return [self._execucao(linha) for linha in linhas]
+
+    def _execucao(self, linha: sqlite3.Row) -> dict:
+        execucao = dict(linha)
+        execucao["parametros"] = json.loads(execucao["parametros"])
+        execucao["seed"] = _seed(execucao["seed"])
+        if execucao["melhor_individuo"] is not None:
+            execucao["melhor_individuo"] = decodificar_genoma(
+                execucao["melhor_individuo"], execucao["tipo_genoma"]
+            )
+        return execucao
+
+    def melhor_por_execucao(self) -> list[dict]:
+        # Melhor geração de cada execução (também das que não terminaram),
+        # da melhor execução para a pior
+        linhas = self._conexao.execute(
+            "SELECT e.id AS execucao, e.seed, e.engine, e.tipo_genoma, e.geracoes, e.tempo,"
+            " g.geracao, g.melhor_fitness, g.medio_fitness"
+            " FROM execucoes e JOIN geracoes g ON g.execucao = e.id"
+            " WHERE g.geracao = (SELECT geracao FROM geracoes WHERE execucao = e.id"
+            "                    ORDER BY melhor_fitness DESC, geracao LIMIT 1)"
+            " ORDER BY g.melhor_fitness DESC"
+        ).fetchall()
+        return [dict(linha, seed=_seed(linha["seed"])) for linha in linhas]
+
+    def curva_fitness(self, execucao: int, metricas=("melhor_fitness", "medio_fitness")) -> list[dict]:
+        # Uma linha por geração com as colunas pedidas
+        desconhecidas = [nome for nome in metricas if nome not in COLUNAS_CURVA]
+        if desconhecidas:
+            raise ValueError(f"métricas desconhecidas: {', '.join(desconhecidas)}")
+        linhas = self._conexao.execute(
+            f"SELECT geracao, {', '.join(metricas)} FROM geracoes WHERE execucao = ? ORDER BY geracao",
+            (execucao,)
+        ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def melhores_individuos(self, execucao: int, quantidade: int = 10) -> list[tuple[float, dict, list]]:
+        # No formato do avaliar_populacao: (fitness, resultado, individuo)
+        tipo_genoma = self._conexao.execute(
+            "SELECT tipo_genoma FROM execucoes WHERE id = ?", (execucao,)
+        ).fetchone()
+        if tipo_genoma is None:
+            raise KeyError(f"execução inexistente: {execucao}")
+        linhas = self._conexao.execute(
+            "SELECT fitness, resultado, genoma FROM individuos WHERE execucao = ?"
+            " ORDER BY fitness DESC, geracao, posicao LIMIT ?",
+            (execucao, quantidade)
+        ).fetchall()
+        return [
+            (
+                linha["fitness"], _resultado(linha["resultado"]),
+                decodificar_genoma(linha["genoma"], tipo_genoma[0]),
+            )
+            for linha in linhas
+        ]
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Consulta o registro de execuções do AG")
+    parser.add_argument("banco", help="arquivo SQLite gravado pelo rodar_ag")
+    parser.add_argument("--curva", type=int, default=None, metavar="EXECUCAO",
+                        help="fitness por geração de uma execução")
+    args = parser.parse_args(argv)
+
+    with RegistroExecucoes(args.banco) as registro:
+        if args.curva is not None:
+            curva = registro.curva_fitness(
+                args.curva, ("melhor_fitness", "medio_fitness", "jogos_por_segundo")
+            )
+            for linha in curva:
+                print(
+                    f"{linha['geracao'] + 1:4d}  melhor {linha['melhor_fitness']:9.2f}"
+                    f"  médio {linha['medio_fitness']:9.2f}  {linha['jogos_por_segundo']:8.1f} jogos/s"
+                )
+        else:
+            for linha in registro.melhor_por_execucao():
+                print(
+                    f"execução {linha['execucao']:3d}  seed {linha['seed']}  {linha['engine']}"
+                    f"  {linha['tipo_genoma']}  melhor {linha['melhor_fitness']:.2f}"
+                    f" (geração {linha['geracao'] + 1} de {linha['geracoes']})"
+                )
+
+
+if __name__ == "__main__":
+    main()
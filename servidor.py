@@ -0,0 +1,423 @@
+# Servidor local de fitness: vários AGs no mesmo host dividindo um pool
+#
+# O servidor (asyncio, TCP em localhost ou socket Unix) recebe tarefas no
+# formato do avaliar_tarefa, (individuo, num_simulacoes, engine, semente,
+# crn[, estatisticas]), e devolve os dicionários do fitness. Protocolo: uma
+# linha JSON por mensagem.
+#
+#   pedido   {"id": n, "tarefas": [[individuo, simulacoes, engine, semente, crn], ...]}
+#            {"id": n, "metricas": true}
+#   resposta {"id": n, "resultados": [...]} | {"id": n, "metricas": {...}}
+#            | {"id": n, "erro": "..."}
+#
+# As tarefas de todos os clientes entram em uma única fila limitada
+# (max_fila): quando ela enche, quem envia espera, e o cliente deixa de ser
+# lido até sobrar espaço. Um despachante junta o que chegou em até
+# espera_lote segundos (no máximo tamanho_lote tarefas) e manda tudo de uma
+# vez para o executor, em uma thread para não travar o loop. Tarefas
+# idênticas com semente no mesmo lote são simuladas uma vez só; sem
+# semente, cada uma continua sendo uma amostra independente. O erro de uma
+# tarefa (ex.: engine desconhecida) volta só para quem a enviou, e fechar o
+# servidor falha com "servidor de fitness fechado" tudo o que ainda não
+# tinha resposta, inclusive o lote em execução.
+#
+# ExecutorRemoto é o lado do cliente e pode ser passado como executor para
+# o avaliar_populacao e o rodar_ag. ExecutorEmProcesso roda o mesmo servidor
+# em uma thread do próprio processo, sem sockets.
+
+import argparse
+import asyncio
+import collections
+import json
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import Future
+import algorithm as ag
+import executores
+
+TAMANHO_LOTE = 256
+ESPERA_LOTE = 0.005
+MAX_FILA = 1024
+JANELA_LATENCIA = 1000
+LIMITE_LINHA = 64 * 1024 * 1024
+FECHADO = "servidor de fitness fechado"
+
+
+def _verificar_funcao(funcao):
+    # Só dá para mandar dados pelo socket, não funções
+    if funcao is not ag.avaliar_tarefa:
+        raise ValueError("o servidor de fitness só executa algorithm.avaliar_tarefa")
+
+
+def _restaurar_resultado(resultado: dict) -> dict:
+    # O JSON transforma as chaves inteiras da distribuição em strings
+    distribuicao = resultado.get("distribuicao_tiles")
+    if distribuicao is not None:
+        resultado["distribuicao_tiles"] = {int(tile): n for tile, n in distribuicao.items()}
+    return resultado
+
+
+def _avaliar_isolada(tarefa: tuple) -> tuple:
+    # Roda no worker: a exceção vira valor, para não derrubar o lote inteiro
+    try:
+        return True, ag.avaliar_tarefa(tarefa)
+    except Exception as erro:
+        return False, erro
+
+
+def _falhar(futuros, erro: Exception):
+    for futuro in futuros:
+        if not futuro.done():
+            futuro.set_exception(erro)
+
+
+def _chave_tarefa(tarefa: tuple):
+    individuo, _, _, semente, *_ = tarefa
+    if semente is None:
+        return None
+    return (tuple(individuo),) + tuple(tarefa[1:])
+
+
+class ServidorFitness:
+    def __init__(
+        self,
+        executor=None,
+        tamanho_lote: int = TAMANHO_LOTE,
+        espera_lote: float = ESPERA_LOTE,
+        max_fila: int = MAX_FILA
+    ):
+        self.executor = executor or executores.ExecutorSerial()
+        self.tamanho_lote = tamanho_lote
+        self.espera_lote = espera_lote
+        self.max_fila = max_fila
+        self._fila = None
+        self._despachante = None
+        self._fechado = False
+        # (tarefa, futuro) já tirados da fila e ainda sem resposta
+        self._lote_atual = []
+        self._servidores = []
+        self._latencias = collections.deque(maxlen=JANELA_LATENCIA)
+        self.requisicoes = 0
+        self.tarefas = 0
+        self.coalescidas = 0
+        self.lotes = 0
+        self.clientes = 0
+        self.em_execucao = 0
+
+    async def iniciar(self):
+        # A fila é criada dentro do loop que vai usá-la
+        if self._fila is None:
+            self._fila = asyncio.Queue(maxsize=self.max_fila)
+            self._despachante = asyncio.get_running_loop().create_task(self._despachar())
+
+    async def escutar_tcp(self, host: str = "127.0.0.1", porta: int = 0) -> int:
+        # Devolve a porta de verdade (porta=0 escolhe uma livre)
+        await self.iniciar()
+        servidor = await asyncio.start_server(self._atender, host, porta, limit=LIMITE_LINHA)
+        self._servidores.append(servidor)
+        return servidor.sockets[0].getsockname()[1]
+
+    async def escutar_unix(self, caminho: str):
+        await self.iniciar()
+        servidor = await asyncio.start_unix_server(self._atender, caminho, limit=LIMITE_LINHA)
+        self._servidores.append(servidor)
+
+    async def fechar(self):
+        self._fechado = True
+        for servidor in self._servidores:
+            servidor.close()
+            await servidor.wait_closed()
+        self._servidores = []
+        if self._despachante is not None:
+            self._despachante.cancel()
+            try:
+                await self._despachante
+            except asyncio.CancelledError:
+                pass
+            self._despachante = None
+        # O lote interrompido e quem ainda esperava na fila recebem o erro
+        # em vez de ficar presos
+        _falhar([futuro for _, futuro in self._lote_atual], RuntimeError(FECHADO))
+        self._lote_atual = []
+        while self._fila is not None and not self._fila.empty():
+            _, futuro = self._fila.get_nowait()
+            _falhar([futuro], RuntimeError(FECHADO))
+
+    async def avaliar(self, tarefas: list) -> list[dict]:
+        if self._fechado:
+            raise RuntimeError(FECHADO)
+        await self.iniciar()
+        loop = asyncio.get_running_loop()
+        chegada = loop.time()
+        self.requisicoes += 1
+        futuros = []
+        for tarefa in tarefas:
+            futuro = loop.create_future()
+            # Com a fila cheia o put espera: é aqui que entra a contrapressão
+            await self._fila.put((tuple(tarefa), futuro))
+            futuros.append(futuro)
+            if self._fechado:
+                # Fechado enquanto esperava espaço na fila
+                _falhar(futuros, RuntimeError(FECHADO))
+                break
+        resultados = await asyncio.gather(*futuros)
+        self._latencias.append(loop.time() - chegada)
+        return list(resultados)
+
+    async def _proximo_lote(self) -> list:
+        # O lote cresce em _lote_atual: se o despachante for cancelado no
+        # meio, fechar() ainda enxerga o que já saiu da fila
+        loop = asyncio.get_running_loop()
+        lote = self._lote_atual = []
+        lote.append(await self._fila.get())
+        limite = loop.time() + self.espera_lote
+        while len(lote) < self.tamanho_lote:
+            if not self._fila.empty():
+                lote.append(self._fila.get_nowait())
+                continue
+            restante = limite - loop.time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._fila.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _despachar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = await self._proximo_lote()
+            unicas = []
+            destinos = []
+            posicoes = {}
+            for tarefa, _ in lote:
+                chave = _chave_tarefa(tarefa)
+                if chave is not None and chave in posicoes:
+                    destinos.append(posicoes[chave])
+                    self.coalescidas += 1
+                    continue
+                if chave is not None:
+                    posicoes[chave] = len(unicas)
+                destinos.append(len(unicas))
+                unicas.append(tarefa)
+
+            self.em_execucao = len(unicas)
+            try:
+                resultados = await loop.run_in_executor(
+                    None, self.executor.mapear, _avaliar_isolada, unicas
+                )
+            except Exception as erro:
+                # Falha do executor (ex.: pool quebrado), não de uma tarefa
+                _falhar([futuro for _, futuro in lote], erro)
+            else:
+                for (_, futuro), destino in zip(lote, destinos):
+                    if futuro.done():
+                        continue
+                    ok, valor = resultados[destino]
+                    if ok:
+                        futuro.set_result(valor)
+                    else:
+                        futuro.set_exception(valor)
+            finally:
+                self.em_execucao = 0
+            # Só aqui: cancelado no meio, o lote continua visível para fechar()
+            self._lote_atual = []
+            self.lotes += 1
+            self.tarefas += len(lote)
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.clientes += 1
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                pedido = json.loads(linha)
+                resposta = {"id": pedido.get("id")}
+                if pedido.get("metricas"):
+                    resposta["metricas"] = self.metricas()
+                else:
+                    try:
+                        resposta["resultados"] = await self.avaliar(pedido["tarefas"])
+                    except Exception as erro:
+                        resposta["erro"] = f"{type(erro).__name__}: {erro}"
+                escritor.write(json.dumps(resposta).encode() + b"\n")
+                await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.clientes -= 1
+            escritor.close()
+
+    def metricas(self) -> dict:
+        latencias = sorted(self._latencias)
+        return {
+            "fila": self._fila.qsize() if self._fila is not None else 0,
+            "max_fila": self.max_fila,
+            "em_execucao": self.em_execucao,
+            "clientes": self.clientes,
+            "requisicoes": self.requisicoes,
+            "tarefas": self.tarefas,
+            "coalescidas": self.coalescidas,
+            "lotes": self.lotes,
+            "media_lote": self.tarefas / self.lotes if self.lotes else 0.0,
+            "latencia_media": statistics.fmean(latencias) if latencias else 0.0,
+            "latencia_p95": latencias[int(0.95 * (len(latencias) - 1))] if latencias else 0.0,
+        }
+
+
+class ExecutorRemoto(executores.ExecutorSerial):
+    # endereco: "host:porta" para TCP ou o caminho de um socket Unix. O
+    # submeter é o do ExecutorSerial: a conexão é uma só e o servidor a
+    # atende em ordem, então cada tarefa volta pronta antes da próxima sair
+    nome = "remoto"
+
+    def __init__(self, endereco: str, timeout: float = None):
+        self.endereco = endereco
+        self.timeout = timeout
+        self._socket = None
+        self._arquivo = None
+        self._proximo_id = 0
+
+    def _conectar(self):
+        if self._socket is None:
+            host, separador, porta = self.endereco.rpartition(":")
+            if separador and porta.isdigit():
+                self._socket = socket.create_connection((host, int(porta)), self.timeout)
+            else:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(self.timeout)
+                self._socket.connect(self.endereco)
+            self._arquivo = self._socket.makefile("rb")
+
+    def _pedir(self, pedido: dict) -> dict:
+        self._conectar()
+        self._proximo_id += 1
+        pedido["id"] = self._proximo_id
+        self._socket.sendall(json.dumps(pedido).encode() + b"\n")
+        linha = self._arquivo.readline()
+        if not linha:
+            self.fechar()
+            raise ConnectionError(f"o servidor de fitness em {self.endereco} fechou a conexão")
+        resposta = json.loads(linha)
+        if "erro" in resposta:
+            raise RuntimeError(f"erro no servidor de fitness: {resposta['erro']}")
+        return resposta
+
+    def mapear(self, funcao, tarefas: list) -> list:
+        _verificar_funcao(funcao)
+        resposta = self._pedir({"tarefas": [list(tarefa) for tarefa in tarefas]})
+        return [_restaurar_resultado(resultado) for resultado in resposta["resultados"]]
+
+    def metricas(self) -> dict:
+        return self._pedir({"metricas": True})["metricas"]
+
+    def fechar(self):
+        if self._socket is not None:
+            self._arquivo.close()
+            self._socket.close()
+            self._socket = None
+            self._arquivo = None
+
+
+class ExecutorEmProcesso(executores.ExecutorSerial):
+    # O mesmo ServidorFitness rodando no loop de uma thread deste processo.
+    # Várias threads podem chamar mapear ao mesmo tempo, como vários clientes
+    nome = "em_processo"
+
+    def __init__(self, servidor: ServidorFitness = None):
+        self.servidor = servidor or ServidorFitness()
+        self.processos = self.servidor.executor.processos
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.rodar(self.servidor.iniciar())
+
+    def rodar(self, corotina):
+        # Executa uma corotina no loop do servidor e espera o resultado
+        return asyncio.run_coroutine_threadsafe(corotina, self._loop).result()
+
+    def mapear(self, funcao, tarefas: list) -> list:
+        _verificar_funcao(funcao)
+        return self.rodar(self.servidor.avaliar([tuple(tarefa) for tarefa in tarefas]))
+
+    def submeter(self, funcao, tarefa) -> Future:
+        # Não bloqueia: as tarefas em voo ao mesmo tempo entram juntas nos
+        # lotes do servidor, como pedidos de vários clientes
+        _verificar_funcao(funcao)
+        return asyncio.run_coroutine_threadsafe(self._avaliar_uma(tuple(tarefa)), self._loop)
+
+    async def _avaliar_uma(self, tarefa: tuple) -> dict:
+        return (await self.servidor.avaliar([tarefa]))[0]
+
+    def metricas(self) -> dict:
+        return self.rodar(self._metricas())
+
+    async def _metricas(self) -> dict:
+        return self.servidor.metricas()
+
+    async def _esperar_pendentes(self):
+        # Conexões TCP abertas podem ficar lendo para sempre: espera pouco
+        pendentes = [tarefa for tarefa in asyncio.all_tasks() if tarefa is not asyncio.current_task()]
+        if pendentes:
+            await asyncio.wait(pendentes, timeout=1.0)
+
+    def fechar(self):
+        if self._loop.is_closed():
+            return
+        self.rodar(self.servidor.fechar())
+        # Deixa os mapear de outras threads receberem o erro antes de parar o loop
+        self.rodar(self._esperar_pendentes())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def _servir(servidor: ServidorFitness, args):
+    if args.unix:
+        await servidor.escutar_unix(args.unix)
+        print(f"Servidor de fitness em {args.unix}")
+    else:
+        porta = await servidor.escutar_tcp(args.host, args.porta)
+        print(f"Servidor de fitness em {args.host}:{porta}")
+    try:
+        while True:
+            await asyncio.sleep(args.intervalo_metricas)
+            metricas = servidor.metricas()
+            print(
+                f"{time.strftime('%H:%M:%S')} fila {metricas['fila']}/{metricas['max_fila']}, "
+                f"{metricas['clientes']} clientes, {metricas['tarefas']} tarefas, "
+                f"lote médio {metricas['media_lote']:.1f}, "
+                f"latência p95 {metricas['latencia_p95'] * 1000:.1f} ms"
+            )
+    finally:
+        await servidor.fechar()
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Servidor local de fitness do AG")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="caminho de um socket Unix (em vez de TCP)")
+    parser.add_argument("--executor", choices=sorted(executores.EXECUTORES), default="processos")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="máximo de tarefas por lote")
+    parser.add_argument("--espera", type=float, default=ESPERA_LOTE,
+                        help="segundos esperando mais tarefas para o lote")
+    parser.add_argument("--fila", type=int, default=MAX_FILA, help="tamanho máximo da fila")
+    parser.add_argument("--intervalo-metricas", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    with executores.criar_executor(args.executor, args.processos) as executor:
+        servidor = ServidorFitness(executor, args.lote, args.espera, args.fila)
+        try:
+            asyncio.run(_servir(servidor, args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
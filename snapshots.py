@@ -0,0 +1,149 @@
+# Retomada de simulações a partir de snapshots
+#
+# Os filhos do cruzar compartilham com pai1 todos os genes antes do ponto de
+# corte, e o mutar altera poucas posições. Com os tiles sorteados de uma fita
+# fixa por simulação (FitaAleatoria), o jogo de um filho é idêntico ao do pai
+# até o primeiro gene diferente. Durante a simulação guardamos, a cada
+# `intervalo` genes, o estado do jogo (bitboard, posição na fita e movimentos
+# válidos) indexado pelo hash do prefixo de genes. Um filho procura o maior
+# prefixo já visto e continua a simulação dali, em vez de começar do
+# new_game. O resultado é exatamente o mesmo de simular do início.
+#
+# Como o prefixo é identificado pelo hash dos genes, não é preciso saber quem
+# é o pai: qualquer indivíduo com o mesmo prefixo aproveita o snapshot.
+
+import hashlib
+from collections import OrderedDict
+import bitboard
+from fita import FitaAleatoria, semente_simulacao
+
+
+def hashes_prefixos(individuo: list[str], intervalo: int) -> list[bytes]:
+    # hashes[k] identifica os genes individuo[:(k + 1) * intervalo]
+    hashes = []
+    acumulado = hashlib.blake2b(digest_size=16)
+    for inicio in range(0, len(individuo) - intervalo + 1, intervalo):
+        acumulado.update("\n".join(individuo[inicio:inicio + intervalo]).encode() + b"\n")
+        hashes.append(acumulado.copy().digest())
+    return hashes
+
+
+class ArmazemSnapshots:
+    def __init__(self, semente: int = 0, intervalo: int = 25, max_snapshots: int = 100_000):
+        if intervalo < 1:
+            raise ValueError("o intervalo entre snapshots precisa ser positivo")
+        self.semente = semente
+        self.intervalo = intervalo
+        self.max_snapshots = max_snapshots
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.genes_pulados = 0
+        self.genes_simulados = 0
+        # (simulação, hash do prefixo) -> (board, posição na fita, movimentos válidos, terminou)
+        self._snapshots = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def _guardar(self, chave: tuple, estado: tuple):
+        self._snapshots[chave] = estado
+        self._snapshots.move_to_end(chave)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+            self.descartes += 1
+
+    def _procurar(self, simulacao: int, hashes: list[bytes]):
+        # Do prefixo mais longo para o mais curto
+        for k in range(len(hashes) - 1, -1, -1):
+            chave = (simulacao, hashes[k])
+            estado = self._snapshots.get(chave)
+            if estado is not None:
+                self._snapshots.move_to_end(chave)
+                self.acertos += 1
+                return (k + 1) * self.intervalo, estado
+        self.falhas += 1
+        return 0, None
+
+    def simular(self, individuo: list[str], simulacao: int, hashes: list[bytes] = None) -> tuple[int, int]:
+        if hashes is None:
+            hashes = hashes_prefixos(individuo, self.intervalo)
+
+        fita = FitaAleatoria(semente_simulacao(self.semente, simulacao))
+        inicio, estado = self._procurar(simulacao, hashes)
+        if estado is None:
+            board = bitboard.new_game(fita)
+            movimentos_validos = 0
+            terminou = False
+        else:
+            board, posicao, movimentos_validos, terminou = estado
+            fita.ir_para(posicao)
+        self.genes_pulados += inicio
+
+        movimentos = bitboard.movimentos
+        gene = inicio
+        while gene < len(individuo) and not terminou:
+            if gene and gene % self.intervalo == 0 and gene > inicio:
+                self._guardar(
+                    (simulacao, hashes[gene // self.intervalo - 1]),
+                    (board, fita.posicao, movimentos_validos, False)
+                )
+
+            funcao = movimentos.get(individuo[gene])
+            gene += 1
+            if funcao is None:
+                continue
+            if bitboard.game_state(board) in ('lose', 'win'):
+                terminou = True
+                break
+            board, movimento_realizado = funcao(board)
+            if movimento_realizado:
+                board = bitboard.add_two(board, fita)
+                movimentos_validos += 1
+
+        self.genes_simulados += gene - inicio
+        if terminou:
+            # O jogo acabou antes do gene `gene - 1`: qualquer indivíduo que
+            # compartilhe o prefixo até o próximo ponto de snapshot termina
+            # igual e recebe o resultado sem simular nada
+            proximo = -(-(gene - 1) // self.intervalo) * self.intervalo
+            if inicio < proximo <= len(individuo):
+                self._guardar(
+                    (simulacao, hashes[proximo // self.intervalo - 1]),
+                    (board, fita.posicao, movimentos_validos, True)
+                )
+        return bitboard.max_tile(board), movimentos_validos
+
+    def fitness(self, individuo: list[str], num_simulacoes: int) -> dict:
+        # Mesmo dicionário do algorithm.fitness, com as simulações retomadas
+        hashes = hashes_prefixos(individuo, self.intervalo)
+        soma_tile = 0
+        soma_movimentos = 0
+        maior_tile_global = 0
+        distribuicao = {128: 0, 256: 0, 512: 0, 1024: 0, 2048: 0}
+
+        for simulacao in range(num_simulacoes):
+            maior_tile, movimentos = self.simular(individuo, simulacao, hashes)
+            soma_tile += maior_tile
+            soma_movimentos += movimentos
+            maior_tile_global = max(maior_tile_global, maior_tile)
+            for limite in distribuicao:
+                if maior_tile >= limite:
+                    distribuicao[limite] += 1
+
+        return {
+            "media_tile": soma_tile / num_simulacoes,
+            "media_movimentos": soma_movimentos / num_simulacoes,
+            "maior_tile": maior_tile_global,
+            "distribuicao_tiles": distribuicao
+        }
+
+    def estatisticas(self) -> dict:
+        total = self.genes_pulados + self.genes_simulados
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "snapshots": len(self._snapshots),
+            "fracao_pulada": self.genes_pulados / total if total else 0.0,
+        }
@@ -0,0 +1,154 @@
+# Tabuleiro em array plano para qualquer GRID_LEN
+#
+# As células ficam em um bytearray de n*n expoentes log2 (0 = vazio). Cada
+# direção tem uma permutação de índices pré-calculada: a linha k da direção
+# lista os índices das células na ordem em que os tiles deslizam, então um
+# movimento nunca materializa transpose/reverse. O tabuleiro mantém a lista
+# de células vazias e o maior expoente, atualizados a cada movimento e a cada
+# tile novo; a possibilidade de mesclar vizinhos é calculada sob demanda e
+# atualizada de forma incremental pelo add_two.
+
+import random
+import constants as c
+
+EXPOENTE_VITORIA = 11  # 2048
+
+_direcoes = {}
+_vizinhos = {}
+
+
+def indices_direcao(n: int) -> dict[str, list[list[int]]]:
+    if n not in _direcoes:
+        _direcoes[n] = {
+            'left': [[i * n + j for j in range(n)] for i in range(n)],
+            'right': [[i * n + (n - 1 - j) for j in range(n)] for i in range(n)],
+            'up': [[i * n + j for i in range(n)] for j in range(n)],
+            'down': [[(n - 1 - i) * n + j for i in range(n)] for j in range(n)],
+        }
+    return _direcoes[n]
+
+
+def indices_vizinhos(n: int) -> list[list[int]]:
+    # vizinhos[k] são as células à direita/esquerda/acima/abaixo da célula k
+    if n not in _vizinhos:
+        vizinhos = []
+        for k in range(n * n):
+            i, j = divmod(k, n)
+            vizinhos.append([
+                a * n + b for a, b in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                if 0 <= a < n and 0 <= b < n
+            ])
+        _vizinhos[n] = vizinhos
+    return _vizinhos[n]
+
+
+class Tabuleiro:
+    __slots__ = ("n", "celulas", "vazias", "maior", "_mesclavel")
+
+    def __init__(self, n: int = c.GRID_LEN, celulas: bytes = None):
+        self.n = n
+        self.celulas = bytearray(n * n) if celulas is None else bytearray(celulas)
+        self._atualizar()
+
+    @classmethod
+    def da_matriz(cls, mat: list[list[int]]) -> "Tabuleiro":
+        return cls(len(mat), bytes(v.bit_length() - 1 if v else 0 for linha in mat for v in linha))
+
+    def matriz(self) -> list[list[int]]:
+        n = self.n
+        return [
+            [(1 << e) if e else 0 for e in self.celulas[i * n:(i + 1) * n]]
+            for i in range(n)
+        ]
+
+    def copia(self) -> "Tabuleiro":
+        return Tabuleiro(self.n, self.celulas)
+
+    def maior_tile(self) -> int:
+        return (1 << self.maior) if self.maior else 0
+
+    def _atualizar(self):
+        celulas = self.celulas
+        self.vazias = [k for k, v in enumerate(celulas) if not v]
+        self.maior = max(celulas)
+        self._mesclavel = None
+
+    def mesclavel(self) -> bool:
+        if self._mesclavel is None:
+            celulas = self.celulas
+            n = self.n
+            self._mesclavel = any(
+                celulas[k] and (
+                    (k % n != n - 1 and celulas[k] == celulas[k + 1])
+                    or (k + n < n * n and celulas[k] == celulas[k + n])
+                )
+                for k in range(n * n)
+            )
+        return self._mesclavel
+
+    def mover(self, direcao: str) -> bool:
+        # Move no lugar; devolve se algo mudou (o "done" do logic)
+        celulas = self.celulas
+        moveu = False
+        for linha in indices_direcao(self.n)[direcao]:
+            valores = [celulas[k] for k in linha if celulas[k]]
+            resultado = []
+            j = 0
+            while j < len(valores):
+                if j + 1 < len(valores) and valores[j] == valores[j + 1]:
+                    resultado.append(valores[j] + 1)
+                    j += 2
+                else:
+                    resultado.append(valores[j])
+                    j += 1
+            resultado += [0] * (len(linha) - len(resultado))
+            for k, novo in zip(linha, resultado):
+                if celulas[k] != novo:
+                    celulas[k] = novo
+                    moveu = True
+        if moveu:
+            self._atualizar()
+        return moveu
+
+    def add_two(self, rng=random):
+        # Sorteia direto entre as vazias, sem o laço de rejeição do logic
+        vazias = self.vazias
+        posicao = rng.randrange(len(vazias))
+        k = vazias[posicao]
+        vazias[posicao] = vazias[-1]
+        vazias.pop()
+        self.celulas[k] = 1
+        self.maior = max(self.maior, 1)
+        if self._mesclavel is False:
+            celulas = self.celulas
+            self._mesclavel = any(celulas[v] == 1 for v in indices_vizinhos(self.n)[k])
+        return self
+
+    def game_state(self) -> str:
+        if self.maior >= EXPOENTE_VITORIA:
+            return 'win'
+        if self.vazias or self.mesclavel():
+            return 'not over'
+        return 'lose'
+
+
+def new_game(n: int = c.GRID_LEN, rng=random) -> Tabuleiro:
+    return Tabuleiro(n).add_two(rng).add_two(rng)
+
+
+def executar_jogo(individuo: list[str], rng=random) -> tuple[int, int]:
+    tabuleiro = new_game(c.GRID_LEN, rng)
+    movimentos_validos = 0
+
+    for movimento in individuo:
+        if movimento not in ('up', 'down', 'left', 'right'):
+            continue
+
+        if tabuleiro.game_state() in ('lose', 'win'):
+            break
+
+        if tabuleiro.mover(movimento):
+            tabuleiro.add_two(rng)
+            movimentos_validos += 1
+
+    return tabuleiro.maior_tile(), movimentos_validos
@@ -0,0 +1,149 @@
+# Telemetria estruturada do AG
+#
+# Registra, por geração, o tempo gasto em cada fase (avaliação, seleção,
+# cruzamento e mutação), a vazão de simulação e as métricas de
+# calcular_metricas, e grava um registro por geração em JSON Lines ou CSV.
+# O TimerFuncoes mede chamadas das funções quentes do logic (movimentos e
+# game_state) trocando-as temporariamente por versões cronometradas.
+
+import contextlib
+import csv
+import json
+import time
+from collections import defaultdict
+
+FASES = ("avaliacao", "selecao", "cruzamento", "mutacao")
+FUNCOES_LOGIC = ("up", "down", "left", "right", "game_state")
+
+
+class TimerFuncoes:
+    def __init__(self):
+        self.chamadas = defaultdict(int)
+        self.tempos = defaultdict(float)
+
+    def _cronometrar(self, nome: str, funcao):
+        def cronometrada(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                self.tempos[nome] += time.perf_counter() - inicio
+                self.chamadas[nome] += 1
+        return cronometrada
+
+    @contextlib.contextmanager
+    def instrumentar(self, modulo, nomes=FUNCOES_LOGIC):
+        # Só enxerga chamadas feitas neste processo: com executores em
+        # processos separados os workers usam as funções originais
+        originais = {nome: getattr(modulo, nome) for nome in nomes}
+        try:
+            for nome, funcao in originais.items():
+                setattr(modulo, nome, self._cronometrar(nome, funcao))
+            yield self
+        finally:
+            for nome, funcao in originais.items():
+                setattr(modulo, nome, funcao)
+
+    def resumo(self) -> dict:
+        return {
+            nome: {
+                "chamadas": self.chamadas[nome],
+                "tempo_total": self.tempos[nome],
+                "tempo_medio_us": 1e6 * self.tempos[nome] / self.chamadas[nome],
+            }
+            for nome in self.chamadas
+        }
+
+    def zerar(self):
+        self.chamadas.clear()
+        self.tempos.clear()
+
+
+class Telemetria:
+    def __init__(self, destino=None, formato: str = "jsonl", timer: TimerFuncoes = None):
+        # destino pode ser um caminho, um arquivo já aberto ou None (só memória)
+        if formato not in ("jsonl", "csv"):
+            raise ValueError(f"formato de telemetria desconhecido: {formato!r}")
+        self.formato = formato
+        self.timer = timer
+        self.registros = []
+        self.tempos = defaultdict(float)
+        self._fechar_destino = isinstance(destino, str)
+        self._destino = open(destino, "w", encoding="utf-8", newline="") if self._fechar_destino else destino
+        self._csv = None
+
+    @contextlib.contextmanager
+    def medir(self, fase: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[fase] += time.perf_counter() - inicio
+
+    def registrar_geracao(
+        self,
+        geracao: int,
+        populacao_avaliada: list,
+        metricas: dict,
+        num_simulacoes: int,
+        tempo_total: float
+    ) -> dict:
+        # A avaliação por corrida informa quantas simulações cada indivíduo
+        # recebeu; os que vieram do cache (do_cache) não jogaram nesta geração
+        simulados = [avaliado for avaliado in populacao_avaliada if not avaliado[1].get("do_cache")]
+        simulacoes = [resultado.get("num_simulacoes", num_simulacoes) for _, resultado, _ in simulados]
+        jogos = sum(simulacoes)
+        movimentos = sum(
+            resultado["media_movimentos"] * n for (_, resultado, _), n in zip(simulados, simulacoes)
+        )
+        genes = sum(len(individuo) * n for (_, _, individuo), n in zip(simulados, simulacoes))
+        tempo_avaliacao = self.tempos["avaliacao"]
+
+        registro = {"geracao": geracao + 1}
+        registro.update({f"tempo_{fase}": self.tempos[fase] for fase in FASES})
+        registro["tempo_total"] = tempo_total
+        registro["jogos_por_segundo"] = jogos / tempo_avaliacao if tempo_avaliacao else 0.0
+        registro["movimentos_por_segundo"] = movimentos / tempo_avaliacao if tempo_avaliacao else 0.0
+        registro["taxa_movimentos_validos"] = movimentos / genes if genes else 0.0
+        registro.update(metricas)
+        if self.timer is not None:
+            registro["funcoes"] = self.timer.resumo()
+            self.timer.zerar()
+
+        self.tempos.clear()
+        self.registros.append(registro)
+        self._emitir(registro)
+        return registro
+
+    def registrar(self, registro: dict) -> dict:
+        # Registro já montado, de laços sem gerações (estacionario.py)
+        self.registros.append(registro)
+        self._emitir(registro)
+        return registro
+
+    def _emitir(self, registro: dict):
+        if self._destino is None:
+            return
+        if self.formato == "jsonl":
+            self._destino.write(json.dumps(registro) + "\n")
+        else:
+            linha = dict(registro)
+            for campo, valor in linha.items():
+                if isinstance(valor, dict):
+                    linha[campo] = json.dumps(valor)
+            if self._csv is None:
+                self._csv = csv.DictWriter(self._destino, fieldnames=list(linha), extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow(linha)
+        self._destino.flush()
+
+    def fechar(self):
+        if self._fechar_destino and self._destino is not None:
+            self._destino.close()
+            self._destino = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
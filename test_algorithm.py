@@ -2,6 +2,10 @@
 
 import random
 import algorithm as ag
+import cache_fitness
+import executores
+import logic
+from fita import FitaAleatoria
 from unittest.mock import patch
 
 # Criação de Individuo de tamanho variavel
@@ -202,3 +206,98 @@ def test_avaliarRodarAlgoritmoGenetico():
 
 
 
+
+# Com a mesma semente os motores logic e bitboard devem jogar exatamente o mesmo jogo
+
+def test_avaliarMotorBitboardIgualAoLogic():
+    individuo = ag.generate_individual(300)
+
+    for semente in range(5):
+        random.seed(semente)
+        esperado = ag.executar_jogo(individuo)
+        random.seed(semente)
+        obtido = ag.executar_jogo(individuo, "bitboard")
+
+        assert obtido == esperado
+
+    random.seed(42)
+    fitness_logic = ag.fitness(individuo, 5)
+    random.seed(42)
+    fitness_bitboard = ag.fitness(individuo, 5, "bitboard")
+
+    assert fitness_bitboard == fitness_logic
+
+# Com a mesma semente mestre, os backends serial e em processos devem dar o mesmo resultado
+
+def test_avaliarPopulacaoComExecutoresReprodutivel():
+    populacao = ag.generate_population(6, 50)
+
+    with executores.ExecutorSerial() as serial:
+        esperado = ag.avaliar_populacao(populacao, 3, "bitboard", serial, 123)
+    with executores.ExecutorProcessos(2, chunksize=2, semente=1) as processos:
+        obtido = ag.avaliar_populacao(populacao, 3, "bitboard", processos, 123)
+        # O pool é reaproveitado entre chamadas
+        de_novo = ag.avaliar_populacao(populacao, 3, "bitboard", processos, 123)
+    with executores.ExecutorPool(2, semente=1) as pool:
+        pelo_pool = ag.avaliar_populacao(populacao, 3, "bitboard", pool, 123)
+
+    assert obtido == esperado
+    assert de_novo == esperado
+    assert pelo_pool == esperado
+    assert [individuo for _, _, individuo in obtido] == populacao
+
+
+def test_avaliarRodarAgComSementeReprodutivel():
+    with executores.ExecutorProcessos(2) as processos:
+        primeiro = ag.rodar_ag(3, 6, 30, 0.1, 2, "bitboard", processos, seed=99, caminho_log=None)
+    segundo = ag.rodar_ag(3, 6, 30, 0.1, 2, "bitboard", seed=99, caminho_log=None)
+
+    assert primeiro == segundo
+
+# Modo crn: a simulação i de todo indivíduo usa a mesma fita de tiles
+
+def test_avaliarModoCrnUsaAMesmaFitaParaTodos():
+    individuo = ag.generate_individual(100)
+    populacao = [individuo, list(individuo)]
+
+    random.seed(1)
+    primeira = ag.avaliar_populacao(populacao, 4, seed=77, crn=True)
+    random.seed(2)
+    segunda = ag.avaliar_populacao(populacao, 4, seed=77, crn=True)
+
+    assert primeira[0][1] == primeira[1][1]
+    assert primeira == segunda
+
+    # A mesma fita leva os motores logic e bitboard ao mesmo jogo
+    assert ag.fitness(individuo, 4, crn=5) == ag.fitness(individuo, 4, "bitboard", crn=5)
+
+
+def test_avaliarFitaInjetadaNoLogic():
+    fita = FitaAleatoria(9)
+    matriz = logic.new_game(4, fita)
+
+    assert sum(v == 2 for linha in matriz for v in linha) == 2
+    assert matriz == logic.new_game(4, FitaAleatoria(9))
+
+
+def test_avaliarCrnComEngineNumpyUsaJogoAJogo():
+    individuo = ag.generate_individual(40)
+    # Com crn a engine numpy cai para o bitboard, com as mesmas fitas
+    assert ag.fitness(individuo, 3, "numpy", crn=9) == ag.fitness(individuo, 3, "bitboard", crn=9)
+
+
+def test_avaliarCacheNaoMisturaFitasCrn():
+    populacao = [ag.generate_individual(40) for _ in range(3)]
+    cache = cache_fitness.CacheFitness(10)
+    ag.avaliar_populacao(populacao, 2, "bitboard", seed=1, cache=cache, crn=True)
+    # Outra geração, outra fita: nada do cache vale
+    outra = ag.avaliar_populacao(populacao, 2, "bitboard", seed=2, cache=cache, crn=True)
+    assert cache.acertos == 0
+    assert outra == ag.avaliar_populacao(populacao, 2, "bitboard", seed=2, crn=True)
+
+
+def test_avaliarLogPadraoSegueTaxaDeMutacao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ag.rodar_ag(1, 4, 10, 0.2, 1, "bitboard", seed=1)
+    assert (tmp_path / "log_ag_20%.txt").exists()
+    assert ag.caminho_log_padrao(0.05) == "log_ag_5%.txt"
@@ -0,0 +1,36 @@
+# Testes da comparação de benchmarks
+
+import benchmark
+
+
+def suite(**valores):
+    return {"resultados": {
+        nome: {"valor": valor, "unidade": "", "maior_melhor": not nome.startswith("tempo")}
+        for nome, valor in valores.items()
+    }}
+
+# Vazão menor ou tempo maior que o limite é regressão; o resto não
+
+def test_avaliarComparacaoApontaRegressoes():
+    base = suite(vazao=100.0, tempo=1.0, estavel=50.0)
+    atual = suite(vazao=80.0, tempo=1.05, estavel=52.0, nova=1.0)
+
+    comparacoes = {linha["medida"]: linha for linha in benchmark.comparar(base, atual, 0.10)}
+
+    assert set(comparacoes) == {"vazao", "tempo", "estavel"}
+    assert comparacoes["vazao"]["regressao"]
+    assert abs(comparacoes["vazao"]["variacao"] + 0.2) < 1e-9
+    assert not comparacoes["tempo"]["regressao"]
+    assert not comparacoes["estavel"]["regressao"]
+    assert benchmark.comparar(base, suite(vazao=100.0, tempo=1.5), 0.10)[1]["regressao"]
+
+
+def test_avaliarSuiteGeraJsonComparavel(tmp_path):
+    saida = tmp_path / "base.json"
+    argumentos = [
+        "suite", "--saida", str(saida), "--motores", "bitboard", "--executores", "serial",
+        "--tamanhos", "pequeno", "--simulacoes", "1", "--geracoes", "1", "--repeticoes", "1"
+    ]
+
+    assert benchmark.main(argumentos) == 0
+    assert benchmark.main(["comparar", str(saida), str(saida)]) == 0
@@ -0,0 +1,64 @@
+# Testes do motor bitboard comparando com o módulo logic
+
+import random
+import logic
+import bitboard
+
+
+def tabuleiro_aleatorio(rng, cheio=False):
+    valores = [2, 4, 8, 16] if cheio else [0, 0, 2, 4, 8, 16, 1024]
+    return [[rng.choice(valores) for _ in range(4)] for _ in range(4)]
+
+
+def test_avaliarCodificacaoIdaEVolta():
+    rng = random.Random(1)
+    for _ in range(50):
+        matriz = tabuleiro_aleatorio(rng)
+        assert bitboard.decode(bitboard.encode(matriz)) == matriz
+
+
+def test_avaliarTransposicao():
+    matriz = [[2 ** (4 * i + j + 1) if 4 * i + j < 15 else 0 for j in range(4)] for i in range(4)]
+    esperado = logic.transpose(matriz)
+
+    assert bitboard.decode(bitboard.transpose(bitboard.encode(matriz))) == esperado
+
+# Cada movimento precisa gerar o mesmo tabuleiro e o mesmo "done" do logic
+
+def test_avaliarMovimentosIguaisAoLogic():
+    rng = random.Random(2)
+    for _ in range(200):
+        matriz = tabuleiro_aleatorio(rng)
+        board = bitboard.encode(matriz)
+        for nome in ["up", "down", "left", "right"]:
+            esperado, done_esperado = getattr(logic, nome)([linha[:] for linha in matriz])
+            obtido, done = getattr(bitboard, nome)(board)
+
+            assert bitboard.decode(obtido) == esperado
+            assert done == done_esperado
+
+
+def test_avaliarEstadoDoJogoIgualAoLogic():
+    rng = random.Random(3)
+    for _ in range(200):
+        matriz = tabuleiro_aleatorio(rng, cheio=rng.random() < 0.7)
+        if rng.random() < 0.1:
+            matriz[rng.randrange(4)][rng.randrange(4)] = 2048
+
+        assert bitboard.game_state(bitboard.encode(matriz)) == logic.game_state(matriz)
+
+
+def test_avaliarMaiorTile():
+    matriz = [[0, 2, 0, 0], [0, 0, 512, 0], [4, 0, 0, 0], [0, 0, 0, 8]]
+
+    assert bitboard.max_tile(bitboard.encode(matriz)) == 512
+    assert bitboard.max_tile(0) == 0
+
+
+def test_avaliarNovoJogoComMesmaSemente():
+    random.seed(10)
+    esperado = logic.new_game(4)
+    random.seed(10)
+    obtido = bitboard.new_game()
+
+    assert bitboard.decode(obtido) == esperado
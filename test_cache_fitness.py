@@ -0,0 +1,83 @@
+# Testes do cache de fitness
+
+from unittest.mock import patch
+import algorithm as ag
+from cache_fitness import CacheFitness, mesclar_resultados
+
+
+def resultado_fake(media_tile, maior_tile=64):
+    return {
+        "media_tile": media_tile,
+        "media_movimentos": 10.0,
+        "maior_tile": maior_tile,
+        "distribuicao_tiles": {128: 0, 256: 0, 512: 0, 1024: 0, 2048: 0}
+    }
+
+
+def test_avaliarCacheComDescarteLRU():
+    cache = CacheFitness(tamanho_max=2)
+    cache.guardar(["up"], resultado_fake(1.0), 10)
+    cache.guardar(["down"], resultado_fake(2.0), 10)
+    cache.obter(["up"])  # "up" passa a ser o mais recente
+    cache.guardar(["left"], resultado_fake(3.0), 10)
+
+    assert cache.contem(["up"])
+    assert not cache.contem(["down"])
+    assert cache.obter(["down"]) is None
+    assert cache.estatisticas() == {
+        "acertos": 1, "falhas": 1, "descartes": 1, "tamanho": 2, "taxa_acerto": 0.5
+    }
+
+
+def test_avaliarMesclaDeSimulacoes():
+    anterior = resultado_fake(100.0, 256)
+    anterior["distribuicao_tiles"][128] = 3
+    novo = resultado_fake(200.0, 128)
+    novo["distribuicao_tiles"][128] = 5
+
+    mesclado = mesclar_resultados(anterior, 10, novo, 30)
+
+    assert mesclado["media_tile"] == 175.0
+    assert mesclado["maior_tile"] == 256
+    assert mesclado["distribuicao_tiles"][128] == 8
+
+    cache = CacheFitness(politica="mesclar")
+    cache.guardar(["up"], anterior, 10)
+    cache.guardar(["up"], novo, 30)
+
+    assert cache.obter(["up"])["media_tile"] == 175.0
+    assert cache.simulacoes(["up"]) == 40
+
+    # Cada contexto (engine, simulações, fita crn) tem a própria entrada
+    cache.guardar(["up"], novo, 30, ("bitboard", 30, None))
+    assert cache.contem(["up"], ("bitboard", 30, None))
+    assert not cache.contem(["up"], ("bitboard", 30, 7))
+
+# Indivíduos já avaliados e repetidos não devem ser simulados de novo
+
+def test_avaliarPopulacaoNaoResimulaIndividuosConhecidos():
+    cache = CacheFitness()
+    populacao = [["up", "left"], ["down", "right"], ["up", "left"]]
+
+    with patch.object(ag, "fitness", side_effect=lambda ind, *_, **__: resultado_fake(len(ind))) as mock_fitness:
+        primeira = ag.avaliar_populacao(populacao, 5, cache=cache)
+        segunda = ag.avaliar_populacao(populacao[:2] + [["left"]], 5, cache=cache)
+
+    assert mock_fitness.call_count == 3
+    assert [f for f, _, _ in primeira] == [2, 2, 2]
+    assert [f for f, _, _ in segunda] == [2, 2, 1]
+    # Repetidos na mesma geração são agrupados antes do cache; só a segunda chamada acerta
+    assert cache.acertos == 2
+
+
+def test_avaliarPoliticaMesclarSimulaDeNovo():
+    cache = CacheFitness(politica="mesclar")
+    populacao = [["up", "left"]]
+
+    with patch.object(ag, "fitness", side_effect=[resultado_fake(4.0), resultado_fake(8.0)]):
+        ag.avaliar_populacao(populacao, 5, cache=cache)
+        resultado = ag.avaliar_populacao(populacao, 5, cache=cache)
+
+    assert resultado[0][0] == 6.0
+    # A chave inclui o contexto da avaliação: (engine, simulações, semente crn)
+    assert cache.simulacoes(["up", "left"], ("logic", 5, None)) == 10
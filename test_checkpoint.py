@@ -0,0 +1,81 @@
+# Testes dos checkpoints e da retomada do AG
+
+import os
+import random
+import pytest
+import algorithm as ag
+import checkpoint
+from cache_fitness import CacheFitness
+
+
+def test_avaliarCheckpointIdaEVolta(tmp_path):
+    caminho = str(tmp_path / "ag.ckpt")
+    random.seed(1)
+    populacao = ag.generate_population(6, 15)
+    cache = CacheFitness(10, "mesclar")
+    resultado = ag.fitness(populacao[0], 3, "bitboard")
+    cache.guardar(populacao[0], resultado, 3)
+    estado_random = random.getstate()
+
+    checkpoint.salvar(caminho, 4, {"seed": 1}, populacao, 12.5, populacao[2], estado_random, cache)
+
+    assert not os.path.exists(caminho + ".tmp")
+    with checkpoint.carregar(caminho) as salvo:
+        assert salvo.geracao == 4
+        assert salvo.parametros == {"seed": 1}
+        assert len(salvo) == 6
+        assert salvo.genoma(3) == populacao[3]
+        assert salvo.populacao() == populacao
+        assert salvo.melhor_individuo() == populacao[2]
+        assert salvo.melhor_fitness == 12.5
+        assert salvo.estado_random() == estado_random
+        restaurado = salvo.cache()
+        assert restaurado.obter(populacao[0]) == resultado
+        assert restaurado.simulacoes(populacao[0]) == 3
+        assert restaurado.politica == "mesclar"
+
+        genomas = salvo.genomas()
+        assert len(genomas) == 6 * 15
+        assert genomas[0] == checkpoint.CODIGOS[populacao[0][0]]
+        genomas.release()
+
+
+def test_avaliarCheckpointInvalido(tmp_path):
+    caminho = tmp_path / "lixo.ckpt"
+    caminho.write_bytes(b"nada disso" * 4)
+
+    with pytest.raises(ValueError):
+        checkpoint.carregar(str(caminho))
+
+
+def sem_tempos(caminho_log):
+    linhas = caminho_log.read_text(encoding="utf-8").splitlines()
+    return [linha for linha in linhas if "Tempo de geração" not in linha]
+
+# Parar no meio e retomar tem que dar exatamente o mesmo resultado (e o mesmo log)
+# que a execução inteira
+
+@pytest.mark.parametrize("opcoes", [
+    {},
+    {"cache": False, "crn": True},
+    {"genoma_compacto": True},
+])
+def test_avaliarRetomadaIdenticaAExecucaoInteira(tmp_path, opcoes):
+    if opcoes.get("genoma_compacto"):
+        pytest.importorskip("numpy")
+    log_inteiro = tmp_path / "inteiro.txt"
+    log_retomado = tmp_path / "retomado.txt"
+    caminho = str(tmp_path / "ag.ckpt")
+
+    inteiro = ag.rodar_ag(6, 8, 40, 0.1, 3, "bitboard", seed=7, caminho_log=str(log_inteiro), **opcoes)
+    ag.rodar_ag(
+        3, 8, 40, 0.1, 3, "bitboard", seed=7, caminho_log=str(log_retomado),
+        caminho_checkpoint=caminho, **opcoes
+    )
+    random.seed(999)
+    retomado = ag.retomar(caminho, populacoes=6)
+
+    assert retomado == inteiro
+    assert sem_tempos(log_retomado) == sem_tempos(log_inteiro)
+    with checkpoint.carregar(caminho) as salvo:
+        assert salvo.geracao == 6
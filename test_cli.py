@@ -0,0 +1,53 @@
+# Testes da linha de comando
+
+import subprocess
+import sys
+import pytest
+import cli
+
+
+def test_avaliarImportSemEfeitosColaterais():
+    # Importar o algorithm não pode rodar o AG nem imprimir nada
+    saida = subprocess.run(
+        [sys.executable, "-c", "import algorithm, cli"],
+        capture_output=True, text=True, timeout=60, check=True
+    )
+    assert saida.stdout == ""
+
+
+def test_avaliarLinhaDeComando(tmp_path, capsys):
+    log = tmp_path / "log.txt"
+    argumentos = [
+        "--geracoes", "2", "--tamanho-pop", "6", "--tamanho-individuo", "30",
+        "--simulacoes", "2", "--engine", "bitboard", "--seed", "5", "--log", str(log)
+    ]
+
+    primeiro = cli.main(argumentos)
+    segundo = cli.main(argumentos)
+
+    assert primeiro == segundo
+    assert len(primeiro[1]) == 30
+    assert log.exists()
+    assert "Melhor fitness" in capsys.readouterr().out
+
+
+def test_avaliarLinhaDeComandoRetomada(tmp_path):
+    caminho = str(tmp_path / "ag.ckpt")
+    base = ["--tamanho-pop", "6", "--tamanho-individuo", "30", "--simulacoes", "2",
+            "--engine", "bitboard", "--seed", "8", "--log", ""]
+
+    inteiro = cli.main(base + ["--geracoes", "4"])
+    cli.main(base + ["--geracoes", "2", "--checkpoint", caminho])
+    retomado = cli.main(["--retomar", "--checkpoint", caminho, "--geracoes", "4"])
+
+    assert retomado == inteiro
+
+
+def test_avaliarIlhasRecusamOpcoesDoRodarAg(tmp_path):
+    base = ["--ilhas", "2", "--log", ""]
+    for opcoes in (["--checkpoint", str(tmp_path / "ag.ckpt")], ["--telemetria", "t.jsonl"],
+                   ["--registro", "ag.db"], ["--cache", "10"], ["--crn"], ["--genoma-compacto"],
+                   ["--executor", "processos"], ["--servidor", "127.0.0.1:1"], ["--expectimax", "1"],
+                   ["--gravacao", "melhor.trace"], ["--estatisticas"], ["--genoma", "pesos"]):
+        with pytest.raises(SystemExit):
+            cli.main(base + opcoes)
@@ -0,0 +1,73 @@
+# Testes da avaliação por corrida
+
+import random
+import pytest
+import algorithm as ag
+import executores
+from cache_fitness import CacheFitness
+from corrida import AvaliadorCorrida
+from estatisticas import EstatisticasJogos
+
+
+def populacao_mista():
+    # Metade só joga "up" (trava logo), metade é aleatória e vai bem mais longe
+    random.seed(3)
+    ruins = [["up"] * 200 for _ in range(6)]
+    bons = ag.generate_population(6, 200)
+    return ruins + bons
+
+
+def test_avaliarCorridaMantemFormatoDeAvaliarPopulacao():
+    populacao = populacao_mista()
+    corrida = AvaliadorCorrida(num_pais=6)
+
+    avaliada = corrida.avaliar(populacao, 20, "bitboard", seed=1)
+
+    assert [individuo for _, _, individuo in avaliada] == populacao
+    for fitness_val, resultado, _ in avaliada:
+        assert fitness_val == resultado["media_tile"]
+        assert 2 <= resultado["num_simulacoes"] <= 20
+
+    pais = ag.selecionar_pais(avaliada, 6)
+    assert all(pai != ["up"] * 200 for pai in pais)
+
+# Os indivíduos claramente ruins devem receber menos simulações
+
+def test_avaliarCorridaGastaMenosQueOOrcamentoFixo():
+    corrida = AvaliadorCorrida(num_pais=6)
+    avaliada = corrida.avaliar(populacao_mista(), 20, "bitboard", seed=2)
+    relatorio = corrida.relatorio()
+
+    assert relatorio["orcamento_fixo"] == 12 * 20
+    assert relatorio["simulacoes_gastas"] < relatorio["orcamento_fixo"]
+    assert relatorio["economia"] > 0
+    assert relatorio["simulacoes_gastas"] == sum(r["num_simulacoes"] for _, r, _ in avaliada)
+
+
+def test_avaliarCorridaReprodutivelEntreExecutores():
+    populacao = populacao_mista()
+    serial = AvaliadorCorrida(num_pais=6).avaliar(populacao, 8, "bitboard", seed=5)
+    with executores.ExecutorProcessos(2) as processos:
+        paralela = AvaliadorCorrida(num_pais=6).avaliar(populacao, 8, "bitboard", processos, seed=5)
+
+    assert paralela == serial
+
+
+def test_avaliarRodarAgComCorrida():
+    corrida = AvaliadorCorrida(num_pais=3)
+    melhor_fitness, melhor_individuo = ag.rodar_ag(
+        3, 6, 30, 0.1, 6, "bitboard", seed=4, caminho_log=None, corrida=corrida
+    )
+
+    assert melhor_fitness > 0
+    assert len(melhor_individuo) == 30
+    assert corrida.relatorio()["orcamento_fixo"] == 3 * 6 * 6
+
+
+def test_avaliarCorridaRecusaOpcoesDaAvaliacaoNormal():
+    # A corrida não passa por avaliar_populacao: nada disso seria usado
+    for opcoes in ({"cache": CacheFitness()}, {"crn": True}, {"estatisticas": EstatisticasJogos()}):
+        with pytest.raises(ValueError):
+            ag.rodar_ag(
+                2, 4, 20, 0.1, 2, "bitboard", caminho_log=None, corrida=AvaliadorCorrida(2), **opcoes
+            )
@@ -0,0 +1,113 @@
+# Testes da evolução em estado estacionário
+
+import pytest
+import algorithm as ag
+import cli
+import estacionario
+import executores
+from registro import RegistroExecucoes
+from servidor import ExecutorEmProcesso, ServidorFitness
+from telemetria import Telemetria
+
+
+def _quadrado(x):
+    return x * x
+
+
+def test_avaliarSubmeterEmTodosOsExecutores():
+    for nome in ["serial", "processos", "pool"]:
+        with executores.criar_executor(nome, 2) as executor:
+            futuros = [executor.submeter(_quadrado, x) for x in range(5)]
+            assert [futuro.result(timeout=30) for futuro in futuros] == [0, 1, 4, 9, 16]
+
+
+def test_avaliarSubmeterNoServidorEmProcesso():
+    # As tarefas em voo vão juntas nos lotes do servidor
+    servidor = ServidorFitness(executores.ExecutorProcessos(2), espera_lote=0.2)
+    with ExecutorEmProcesso(servidor) as executor:
+        assert executor.processos == 2
+        tarefas = [(["up", "left"] * 10, 2, "bitboard", semente, None) for semente in range(6)]
+        futuros = [executor.submeter(ag.avaliar_tarefa, tarefa) for tarefa in tarefas]
+        resultados = [futuro.result(timeout=30) for futuro in futuros]
+        assert resultados == executor.mapear(ag.avaliar_tarefa, tarefas)
+        assert executor.metricas()["lotes"] < len(tarefas)
+
+        melhor_fitness, _ = estacionario.rodar_estacionario(
+            20, 4, 20, 0.1, 1, "bitboard", executor, seed=2
+        )
+        assert melhor_fitness > 0
+
+
+def test_avaliarSubstituicao():
+    populacao = []
+    for fitness_val in [5.0, 1.0, 3.0]:
+        assert estacionario.substituir(populacao, (fitness_val, {}, [str(fitness_val)]), 3)
+
+    # Pior que o pior da população: fica de fora
+    assert not estacionario.substituir(populacao, (0.5, {}, ["x"]), 3)
+    # Melhor que o pior: entra no lugar dele
+    assert estacionario.substituir(populacao, (2.0, {}, ["y"]), 3)
+    assert sorted(fitness_val for fitness_val, _, _ in populacao) == [2.0, 3.0, 5.0]
+
+    # No torneio com todos sorteados, o perdedor é o pior
+    assert estacionario.substituir(populacao, (4.0, {}, ["z"]), 3, "torneio", tamanho_torneio=3)
+    assert sorted(fitness_val for fitness_val, _, _ in populacao) == [3.0, 4.0, 5.0]
+
+
+def test_avaliarEstacionarioReprodutivelNoSerial(tmp_path):
+    log = tmp_path / "log.txt"
+    telemetria = Telemetria()
+    primeiro = estacionario.rodar_estacionario(
+        50, 8, 30, 0.1, 2, "bitboard", seed=4, telemetria=telemetria, caminho_log=str(log),
+        intervalo_metricas=20
+    )
+    segundo = estacionario.rodar_estacionario(50, 8, 30, 0.1, 2, "bitboard", seed=4)
+
+    assert primeiro == segundo
+    assert len(primeiro[1]) == 30
+    # Métricas a cada 20 avaliações, mais o bloco final incompleto
+    assert [r["avaliacoes"] for r in telemetria.registros] == [20, 40, 50]
+    assert [r["avaliacoes_bloco"] for r in telemetria.registros] == [20, 20, 10]
+    assert telemetria.registros[-1]["melhor_fitness_global"] == primeiro[0]
+    texto = log.read_text(encoding="utf-8")
+    assert "Avaliações 41-50" in texto and "Melhor indivíduo global" in texto
+
+
+def test_avaliarEstacionarioComProcessosERegistro():
+    registro = RegistroExecucoes()
+    with executores.criar_executor("processos", 2) as executor:
+        melhor_fitness, melhor_individuo = estacionario.rodar_estacionario(
+            40, 6, 20, 0.1, 1, "bitboard", executor, seed=1, substituicao="torneio",
+            registro=registro
+        )
+
+    [execucao] = registro.execucoes()
+    assert execucao["parametros"]["modo"] == "estacionario"
+    assert execucao["melhor_fitness"] == melhor_fitness
+    # Um bloco por tamanho_pop avaliações; cada um com os avaliados nele
+    curva = registro.curva_fitness(execucao["id"], ("jogos",))
+    assert [linha["jogos"] for linha in curva] == [6] * 6 + [4]
+    assert registro.melhores_individuos(execucao["id"], 1)[0][0] == melhor_fitness
+
+
+def test_avaliarEstacionarioComGenomaDePesos():
+    melhor_fitness, melhor_individuo = estacionario.rodar_estacionario(
+        12, 4, 0, 0.2, 2, seed=3, tipo_genoma='pesos'
+    )
+    assert melhor_fitness > 0
+    assert all(isinstance(peso, float) for peso in melhor_individuo)
+
+
+def test_avaliarEstacionarioRecusaOpcoesDoRodarAg():
+    base = ["--estacionario", "10", "--log", ""]
+    for opcoes in (["--crn"], ["--cache", "10"], ["--estatisticas"], ["--tile-alvo", "512"],
+                   ["--genoma-compacto"], ["--expectimax", "1"], ["--geracoes", "3"]):
+        with pytest.raises(SystemExit):
+            cli.main(base + opcoes)
+
+
+def test_avaliarEstacionarioParametrosInvalidos():
+    with pytest.raises(ValueError):
+        estacionario.rodar_estacionario(10, 1, 10, 0.1, 1)
+    with pytest.raises(ValueError):
+        estacionario.rodar_estacionario(10, 4, 10, 0.1, 1, substituicao="aleatoria")
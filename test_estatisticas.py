@@ -0,0 +1,118 @@
+# Testes das estatísticas de jogos em fluxo
+
+import random
+import statistics
+import pytest
+import algorithm as ag
+import executores
+from cache_fitness import CacheFitness
+from estatisticas import Acumulador, EsbocoQuantis, EstatisticasJogos, HistogramaTiles
+
+
+def test_avaliarAcumuladorWelford():
+    rng = random.Random(1)
+    valores = [rng.gauss(100, 15) for _ in range(1000)]
+    inteiro = Acumulador()
+    partes = [Acumulador() for _ in range(3)]
+    for i, valor in enumerate(valores):
+        inteiro.adicionar(valor)
+        partes[i % 3].adicionar(valor)
+    mesclado = partes[0].mesclar(partes[1]).mesclar(partes[2]).mesclar(Acumulador())
+
+    for acumulador in (inteiro, mesclado):
+        assert acumulador.n == 1000
+        assert acumulador.media == pytest.approx(statistics.mean(valores))
+        assert acumulador.desvio() == pytest.approx(statistics.stdev(valores))
+        assert acumulador.minimo == min(valores) and acumulador.maximo == max(valores)
+
+# Todo tile é potência de 2: os percentis do histograma são exatos
+
+def test_avaliarHistogramaTiles():
+    tiles = [64] * 50 + [128] * 40 + [1024] * 9 + [65536]
+    histograma = HistogramaTiles()
+    for tile in tiles:
+        histograma.adicionar(tile)
+
+    assert histograma.percentil(0.5) == 64
+    assert histograma.percentil(0.9) == 128
+    assert histograma.percentil(0.95) == 1024
+    assert histograma.percentil(1.0) == 65536
+    assert histograma.distribuicao() == {128: 50, 256: 10, 512: 10, 1024: 10, 2048: 1}
+    assert histograma.como_dict() == {64: 50, 128: 40, 1024: 9, 65536: 1}
+
+
+def test_avaliarEsbocoQuantis():
+    rng = random.Random(2)
+    valores = [rng.randint(0, 2000) for _ in range(5000)]
+    esboco = EsbocoQuantis(0.01)
+    for valor in valores:
+        esboco.adicionar(valor)
+    ordenados = sorted(valores)
+
+    for p in (0.05, 0.5, 0.95):
+        exato = ordenados[int(p * (len(ordenados) - 1))]
+        assert esboco.percentil(p) == pytest.approx(exato, rel=0.011)
+    # Memória limitada pela faixa de valores, não pela quantidade
+    assert len(esboco.baldes) < 400
+
+# Avaliar em workers e mesclar dá o mesmo agregador que avaliar tudo junto
+
+def test_avaliarEstatisticasNoFitness():
+    random.seed(3)
+    populacao = ag.generate_population(4, 120)
+
+    serial = ag.avaliar_populacao(populacao, 6, "bitboard", seed=5, estatisticas=True)
+    with executores.ExecutorProcessos(2) as executor:
+        paralelo = ag.avaliar_populacao(populacao, 6, "bitboard", executor, seed=5, estatisticas=True)
+
+    assert [r for _, r, _ in serial] == [r for _, r, _ in paralelo]
+    agregado = ag.estatisticas_geracao(serial)
+    resultado = serial[0][1]
+    jogos = EstatisticasJogos.de_dict(resultado["estatisticas"])
+    assert agregado.n == 24
+    assert jogos.n == 6
+    assert jogos.tiles.media == pytest.approx(resultado["media_tile"])
+    assert jogos.histograma.distribuicao() == resultado["distribuicao_tiles"]
+    assert jogos.histograma.percentil(1.0) == resultado["maior_tile"]
+    assert "estatisticas" not in ag.fitness(populacao[0], 2, "bitboard")
+
+
+def test_avaliarEstatisticasNoRodarAg(tmp_path):
+    log = tmp_path / "log.txt"
+    jogos = EstatisticasJogos()
+
+    ag.rodar_ag(
+        3, 6, 60, 0.1, 4, "bitboard", seed=2, caminho_log=str(log), estatisticas=jogos, cache=False
+    )
+
+    # Sem cache, cada geração simula os jogos de todos os 6
+    assert jogos.n == 3 * 6 * 4
+    resumo = jogos.resumo()
+    assert resumo["tile_p50"] <= resumo["tile_p95"] <= resumo["tile_maximo"]
+    assert sum(resumo["histograma_tiles"].values()) == jogos.n
+    assert "Histograma dos maiores tiles" in log.read_text(encoding="utf-8")
+
+
+class _CacheContado(CacheFitness):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.guardados = 0
+
+    def guardar(self, *args, **kwargs):
+        self.guardados += 1
+        return super().guardar(*args, **kwargs)
+
+
+def test_avaliarEstatisticasNaoRecontamOCache():
+    for politica in ("reusar", "mesclar"):
+        jogos = EstatisticasJogos()
+        cache = _CacheContado(12, politica)
+        ag.rodar_ag(
+            4, 6, 60, 0.1, 4, "bitboard", seed=2, caminho_log=None, estatisticas=jogos, cache=cache
+        )
+
+        # Só os jogos de fato simulados: os pais reaproveitados do cache e os
+        # genomas repetidos na geração não entram de novo
+        assert jogos.n == 4 * cache.guardados
+        if politica == "reusar":
+            assert jogos.n < 4 * 6 * 4
@@ -0,0 +1,79 @@
+# Testes do jogador expectimax
+
+import random
+import pytest
+import algorithm as ag
+import bitboard
+import expectimax
+from expectimax import JogadorExpectimax
+
+
+def girar(matriz):
+    return [list(linha) for linha in zip(*matriz[::-1])]
+
+
+def test_avaliarSimetriasDoTabuleiro():
+    matriz = [[2, 4, 0, 8], [0, 16, 32, 0], [64, 0, 0, 2], [4, 4, 8, 0]]
+    esperadas = []
+    atual = matriz
+    for _ in range(4):
+        esperadas.append(atual)
+        esperadas.append([linha[::-1] for linha in atual])
+        atual = girar(atual)
+
+    simetrias = expectimax.simetrias(bitboard.encode(matriz))
+
+    assert sorted(simetrias) == sorted(bitboard.encode(m) for m in esperadas)
+    assert len({expectimax.canonico(board) for board in simetrias}) == 1
+    valores = [expectimax.heuristica(board) for board in simetrias]
+    assert valores == pytest.approx([valores[0]] * 8)
+
+
+def test_avaliarEscolhaDeMovimento():
+    jogador = JogadorExpectimax(profundidade_max=2, tempo_por_jogada=0.01)
+    preso = bitboard.encode([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]])
+    # Só "left" ou "right" juntam os dois 1024 em um 2048
+    quase = bitboard.encode([[1024, 1024, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 2]])
+
+    assert jogador.escolher(preso) is None
+    assert jogador.escolher(quase) in ("left", "right")
+    assert jogador.estatisticas()["nos"] > 0
+
+# A sequência jogada é um indivíduo: com a mesma semente o motor do AG repete o jogo
+
+def test_avaliarSequenciaJogadaReproduzNoAg():
+    jogador = JogadorExpectimax(profundidade_max=2, tempo_por_jogada=0.01)
+    individuo, maior_tile, movimentos = jogador.jogar(random.Random(5), max_jogadas=80)
+
+    assert len(individuo) == movimentos == 80
+    assert ag.executar_jogo(individuo, "bitboard", rng=random.Random(5)) == (maior_tile, 80)
+
+
+def test_avaliarTabelaDeTransposicaoLimitada():
+    jogador = JogadorExpectimax(profundidade_max=2, tempo_por_jogada=1.0, max_entradas=50)
+    jogador.jogar(random.Random(1), max_jogadas=20)
+    estatisticas = jogador.estatisticas()
+
+    assert estatisticas["entradas"] <= 50
+    assert estatisticas["descartes"] > 0
+    assert 0 < estatisticas["taxa_acerto"] < 1
+    assert estatisticas["nos_por_segundo"] > 0
+
+
+def test_avaliarPopulacaoInicialNoRodarAg():
+    # O jogador padrão não tem limite de tempo: a busca não depende da
+    # velocidade da máquina
+    individuos = expectimax.gerar_individuos(2, 30, seed=3)
+    assert expectimax.gerar_individuos(2, 30, seed=3) == individuos
+    padrao = expectimax.jogador_aberturas()
+    assert expectimax.gerar_individuos(2, 30, seed=3, jogador=padrao) == individuos
+    assert all(len(individuo) == 30 for individuo in individuos)
+
+    fixo = ["up"] * 30
+    _, melhor = ag.rodar_ag(
+        1, 4, 30, 0.1, 1, "bitboard", seed=1, caminho_log=None, populacao_inicial=[fixo] * 4
+    )
+    assert melhor == fixo
+
+    with pytest.raises(ValueError):
+        ag.rodar_ag(1, 4, 30, 0.1, 1, "bitboard", caminho_log=None, populacao_inicial=[["up"] * 10])
@@ -0,0 +1,61 @@
+# Testes dos genomas compactos em uint8
+
+import numpy as np
+import algorithm as ag
+import genoma
+
+
+def test_avaliarCodificacaoIdaEVolta():
+    populacao = ag.generate_population(5, 20)
+    matriz = genoma.codificar_populacao(populacao)
+
+    assert matriz.dtype == np.uint8
+    assert matriz.shape == (5, 20)
+    assert genoma.decodificar_populacao(matriz) == populacao
+    assert genoma.decodificar(genoma.codificar(populacao[0])) == populacao[0]
+    assert list(genoma.MOVIMENTOS) == ag.valid_moves
+
+# Cada filho é prefixo de um pai + sufixo do outro, com um corte por casal
+
+def test_avaliarCruzamentoVetorizado():
+    rng = genoma.gerador(1)
+    pais1 = np.zeros((50, 10), dtype=np.uint8)
+    pais2 = np.full((50, 10), 3, dtype=np.uint8)
+
+    filhos1, filhos2 = genoma.cruzar_populacao(pais1, pais2, rng)
+
+    for f1, f2 in zip(filhos1, filhos2):
+        corte = int((f1 == 0).sum())
+        assert 1 <= corte <= 9
+        assert (f1[:corte] == 0).all() and (f1[corte:] == 3).all()
+        assert (f2[:corte] == 3).all() and (f2[corte:] == 0).all()
+
+
+def test_avaliarMutacaoVetorizada():
+    rng = genoma.gerador(2)
+    matriz = np.zeros((200, 100), dtype=np.uint8)
+
+    assert (genoma.mutar_populacao(matriz, 0.0, rng) == matriz).all()
+    mutada = genoma.mutar_populacao(matriz, 0.5, rng)
+    # Um gene sorteado de novo pode cair no mesmo código: ~3/8 mudam
+    assert 0.3 < (mutada != 0).mean() < 0.45
+    assert (matriz == 0).all()
+
+
+def test_avaliarNovaPopulacaoVetorizada():
+    rng = genoma.gerador(3)
+    matriz = genoma.gerar_populacao(7, 12, rng)
+    fitness_geral = np.array([5.0, 1.0, 9.0, 3.0, 7.0, 2.0, 0.0])
+
+    nova = genoma.gerar_nova_populacao(matriz, fitness_geral, 7, 0.1, 3, rng)
+
+    assert nova.shape == (7, 12)
+    assert (nova[:3] == matriz[[2, 4, 0]]).all()
+
+
+def test_avaliarRodarAgComGenomaCompacto():
+    primeiro = ag.rodar_ag(3, 8, 20, 0.1, 2, "bitboard", seed=3, caminho_log=None, genoma_compacto=True)
+    segundo = ag.rodar_ag(3, 8, 20, 0.1, 2, "bitboard", seed=3, caminho_log=None, genoma_compacto=True)
+
+    assert primeiro == segundo
+    assert len(primeiro[1]) == 20
@@ -0,0 +1,68 @@
+# Testes da gravação compacta de partidas
+
+import random
+import pytest
+import algorithm as ag
+import gravacao
+from gravacao import Gravacao
+
+
+def test_avaliarGravacaoReproduzPartida():
+    random.seed(3)
+    individuo = ag.generate_individual(300)
+
+    registro = ag.gravar_jogo(individuo, 42)
+    maior_tile, movimentos_validos = ag.executar_jogo(individuo, rng=random.Random(42))
+    quadros = list(registro.quadros())
+
+    assert len(registro) == movimentos_validos
+    assert len(quadros) == movimentos_validos + 1
+    assert quadros[0][0] is None
+    assert max(max(linha) for linha in quadros[-1][1]) == maior_tile
+    assert registro.movimentos() == [movimento for movimento, _ in quadros[1:]]
+
+# Cada movimento válido ocupa só 2 bytes depois do cabeçalho
+
+def test_avaliarGravacaoIdaEVolta(tmp_path):
+    random.seed(4)
+    registro = ag.gravar_jogo(ag.generate_individual(200), 7)
+    caminho = str(tmp_path / "jogo.trace")
+
+    registro.salvar(caminho)
+    lido = Gravacao.carregar(caminho)
+
+    assert len(registro.para_bytes()) == 24 + 2 * (len(registro) + 2)
+    assert lido.semente == 7
+    assert lido.movimentos() == registro.movimentos()
+    assert list(lido.quadros()) == list(registro.quadros())
+    assert Gravacao.de_bytes(Gravacao(semente=None).para_bytes()).semente is None
+    with pytest.raises(ValueError):
+        Gravacao.de_bytes(b"X" * 24)
+
+
+def test_avaliarGravacaoSoNaEngineLogic():
+    with pytest.raises(ValueError):
+        ag.executar_jogo(["up"] * 10, engine="bitboard", registro_jogo=Gravacao())
+
+
+def test_avaliarGravacaoDoMelhor(tmp_path):
+    caminho = str(tmp_path / "melhor.trace")
+
+    melhor_fitness, melhor = ag.rodar_ag(
+        3, 6, 30, 0.1, 2, seed=5, caminho_log=None, caminho_gravacao=caminho
+    )
+
+    registro = gravacao.Gravacao.carregar(caminho)
+    assert registro.semente is not None
+    assert registro.movimentos() == ag.gravar_jogo(melhor, registro.semente).movimentos()
+
+
+def test_avaliarGravacaoComSementeNegativa():
+    # A seed é reduzida a 64 bits antes do jogo: a gravação continua rejogável
+    registro = ag.gravar_jogo(["up", "left"] * 20, -7)
+    assert registro.semente == -7 & gravacao.MASCARA_SEMENTE
+    copia = Gravacao.de_bytes(registro.para_bytes())
+    assert copia.movimentos() == ag.gravar_jogo(["up", "left"] * 20, copia.semente).movimentos()
+
+    with pytest.raises(ValueError):
+        Gravacao(semente=-1)
@@ -0,0 +1,91 @@
+# Testes do histórico de jogadas da interface
+
+import random
+import tracemalloc
+import pytest
+import logic
+from historico import Historico
+
+
+def _partida(passos: int, seed: int) -> list[list[list[int]]]:
+    rng = random.Random(seed)
+    matriz = logic.new_game(4, rng)
+    tabuleiros = [[linha[:] for linha in matriz]]
+    while len(tabuleiros) < passos:
+        matriz, mudou = getattr(logic, rng.choice(("up", "down", "left", "right")))(matriz)
+        if mudou:
+            matriz = logic.add_two(matriz, rng)
+            tabuleiros.append([linha[:] for linha in matriz])
+        elif logic.game_state(matriz) != 'not over':
+            matriz = logic.new_game(4, rng)
+    return tabuleiros
+
+
+def test_avaliarDesfazerERefazer():
+    tabuleiros = _partida(10, 1)
+    historico = Historico(16)
+    for matriz in tabuleiros:
+        historico.registrar(matriz)
+
+    assert historico.refazer() is None
+    assert historico.desfazer() == tabuleiros[8]
+    assert historico.desfazer() == tabuleiros[7]
+    assert historico.refazer() == tabuleiros[8]
+    assert historico.ir_para(2) == tabuleiros[2]
+    assert historico.ir_para(0) == tabuleiros[0]
+    assert historico.desfazer() is None
+
+    # Registrar depois de desfazer descarta o que podia ser refeito
+    historico.registrar(tabuleiros[5])
+    assert historico.refazer() is None
+    assert len(historico) == 2
+
+# O tabuleiro devolvido não pode ser o mesmo objeto gravado (o logic.add_two muda a matriz)
+
+def test_avaliarHistoricoSemAliasing():
+    matriz = [[2, 0, 0, 0], [0, 0, 0, 0], [0, 0, 4, 0], [0, 0, 0, 0]]
+    historico = Historico(4)
+    historico.registrar(matriz)
+    historico.registrar([[0] * 4 for _ in range(4)])
+    matriz[0][0] = 1024
+
+    anterior = historico.desfazer()
+    anterior[2][2] = 8
+
+    assert anterior[0][0] == 2
+    assert historico.refazer() == [[0] * 4 for _ in range(4)]
+    assert historico.ir_para(0)[2][2] == 4
+
+
+def test_avaliarHistoricoLimitado():
+    tabuleiros = _partida(50, 2)
+    historico = Historico(8)
+    for matriz in tabuleiros:
+        historico.registrar(matriz)
+
+    assert len(historico) == 8
+    assert historico.primeiro == 42
+    assert historico.ir_para(42) == tabuleiros[42]
+    with pytest.raises(IndexError):
+        historico.ir_para(41)
+    while historico.pode_desfazer():
+        historico.desfazer()
+    assert historico.atual == 42
+
+# Memória constante em uma sessão longa: só o bytearray do buffer
+
+def test_avaliarHistoricoMemoriaConstante():
+    matriz = [[2, 4, 8, 16], [32, 64, 128, 256], [512, 1024, 2048, 4096], [0, 0, 0, 65536]]
+    historico = Historico(1024)
+    tracemalloc.start()
+    for _ in range(1000):
+        historico.registrar(matriz)
+    antes = tracemalloc.get_traced_memory()[0]
+    for _ in range(100_000):
+        historico.registrar(matriz)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert depois - antes < 4096
+    assert len(historico) == 1024
+    assert historico.desfazer() == matriz
@@ -0,0 +1,65 @@
+# Testes do modelo de ilhas
+
+import pytest
+from ilhas import Ilha, ModeloIlhas, origens
+
+
+def test_avaliarTopologias():
+    assert origens("anel", 4) == [[3], [0], [1], [2]]
+    assert origens("completa", 3) == [[1, 2], [0, 2], [0, 1]]
+    with pytest.raises(ValueError):
+        ModeloIlhas(topologia="estrela")
+
+# Imigrantes entram no lugar dos últimos filhos, sem tocar nos pais da elite
+
+def test_avaliarImigrantesSubstituemOsUltimosFilhos():
+    ilha = Ilha(0, 6, 10, 0.1, 1, "bitboard", 1)
+    pais = [individuo.copy() for individuo in ilha.populacao[:ilha.num_pais]]
+
+    ilha.receber([(50.0, ["up"] * 10), (40.0, ["down"] * 10)])
+
+    assert ilha.populacao[:ilha.num_pais] == pais
+    assert ilha.populacao[-2:] == [["up"] * 10, ["down"] * 10]
+
+
+def test_avaliarMigracaoCompletaLevaOsMelhores():
+    modelo = ModeloIlhas(3, "completa", num_migrantes=2, paralelo=False)
+    emigrantes = [
+        [(10.0, ["a"]), (9.0, ["b"])],
+        [(30.0, ["c"]), (1.0, ["d"])],
+        [(20.0, ["e"]), (15.0, ["f"])],
+    ]
+
+    migrantes = modelo._migrar(emigrantes)
+
+    assert [ind for _, ind in migrantes[0]] == [["c"], ["e"]]
+    assert [ind for _, ind in migrantes[1]] == [["e"], ["f"]]
+    assert [ind for _, ind in migrantes[2]] == [["c"], ["a"]]
+
+
+def test_avaliarIlhasSerialIgualAProcessos():
+    argumentos = (5, 6, 30, 0.1, 2, "bitboard", 11)
+    serial = ModeloIlhas(3, "anel", intervalo_migracao=2, paralelo=False)
+    paralelo = ModeloIlhas(3, "anel", intervalo_migracao=2, paralelo=True)
+
+    resultado_serial = serial.rodar(*argumentos)
+    resultado_paralelo = paralelo.rodar(*argumentos)
+
+    assert resultado_serial == resultado_paralelo
+    assert serial.relatorio()["metricas"] == paralelo.relatorio()["metricas"]
+    assert serial.relatorio()["migracoes"] == 2
+    assert len(serial.relatorio()["metricas"]) == 5
+
+# O melhor global é o melhor de todas as ilhas em todas as gerações
+
+def test_avaliarMelhorGlobalEMetricasConsolidadas(tmp_path):
+    modelo = ModeloIlhas(2, "completa", intervalo_migracao=1, paralelo=False)
+    log = tmp_path / "ilhas.txt"
+
+    melhor_fitness, melhor_individuo = modelo.rodar(3, 4, 20, 0.1, 2, "bitboard", 3, str(log))
+    metricas = modelo.relatorio()["metricas"]
+
+    assert melhor_fitness == max(m["melhor_fitness"] for m in metricas)
+    assert all(m["melhor_fitness"] == max(m["melhor_por_ilha"]) for m in metricas)
+    assert len(melhor_individuo) == 20
+    assert "Melhor indivíduo" in log.read_text(encoding="utf-8")
@@ -0,0 +1,81 @@
+# Testes do simulador em lote (NumPy)
+
+import random
+import numpy as np
+import logic
+import lote
+import algorithm as ag
+
+
+def tabuleiros_aleatorios(rng, quantidade):
+    valores = [0, 0, 2, 2, 4, 8, 16, 2048]
+    return [[[rng.choice(valores) for _ in range(4)] for _ in range(4)] for _ in range(quantidade)]
+
+# Todos os tabuleiros do lote devem andar igual ao logic
+
+def test_avaliarMovimentoEmLoteIgualAoLogic():
+    matrizes = tabuleiros_aleatorios(random.Random(5), 100)
+    tabuleiros = np.array(matrizes, dtype=np.int32)
+
+    for nome in ["up", "down", "left", "right"]:
+        novos, mudou = lote.mover(tabuleiros, nome)
+        for k, matriz in enumerate(matrizes):
+            esperado, done = getattr(logic, nome)([linha[:] for linha in matriz])
+            assert novos[k].tolist() == esperado
+            assert bool(mudou[k]) == done
+
+
+def test_avaliarFimDeJogoEmLoteIgualAoLogic():
+    rng = random.Random(6)
+    matrizes = [[[rng.choice([2, 4, 8, 16]) for _ in range(4)] for _ in range(4)] for _ in range(100)]
+    matrizes += tabuleiros_aleatorios(rng, 50)
+
+    fim = lote.terminados(np.array(matrizes, dtype=np.int32))
+
+    for k, matriz in enumerate(matrizes):
+        assert bool(fim[k]) == (logic.game_state(matriz) in ('win', 'lose'))
+
+
+def test_avaliarNovoTileApenasNosTabuleirosMarcados():
+    tabuleiros = np.zeros((3, 4, 4), dtype=np.int32)
+    tabuleiros[1] = 2
+    tabuleiros[1, 3, 3] = 0
+    mascara = np.array([True, True, False])
+
+    lote.adicionar_dois(tabuleiros, mascara, np.random.default_rng(0))
+
+    assert (tabuleiros[0] == 2).sum() == 1
+    assert (tabuleiros[1] == 2).all()
+    assert (tabuleiros[2] == 0).all()
+
+
+def test_avaliarFitnessEmLote():
+    individuo = ag.generate_individual(50)
+    resultado = ag.fitness(individuo, 200, "numpy")
+
+    assert set(resultado) == {"media_tile", "media_movimentos", "maior_tile", "distribuicao_tiles"}
+    assert 2 <= resultado["media_tile"] <= resultado["maior_tile"] <= 2048
+    assert resultado["media_movimentos"] <= 50
+    assert list(resultado["distribuicao_tiles"]) == [128, 256, 512, 1024, 2048]
+
+# Com a mesma semente global o resultado se repete
+
+def test_avaliarFitnessEmLoteReprodutivel():
+    individuo = ag.generate_individual(100)
+    random.seed(7)
+    primeiro = ag.fitness(individuo, 20, "numpy")
+    random.seed(7)
+    segundo = ag.fitness(individuo, 20, "numpy")
+
+    assert primeiro == segundo
+
+# As médias precisam bater com o motor sequencial (mesma distribuição de jogos)
+
+def test_avaliarFitnessEmLoteComparavelAoSequencial():
+    random.seed(8)
+    individuo = ag.generate_individual(200)
+    sequencial = ag.fitness(individuo, 300, "bitboard")
+    em_lote = ag.fitness(individuo, 300, "numpy")
+
+    assert abs(em_lote["media_movimentos"] - sequencial["media_movimentos"]) < 0.1 * sequencial["media_movimentos"]
+    assert abs(em_lote["media_tile"] - sequencial["media_tile"]) < 0.2 * sequencial["media_tile"]
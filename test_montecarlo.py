@@ -0,0 +1,59 @@
+# Testes do agente de Monte Carlo
+
+import random
+import numpy as np
+import executores
+import montecarlo
+from montecarlo import AgenteMonteCarlo
+
+
+def test_avaliarRolloutsRespeitamProfundidade():
+    rng = np.random.default_rng(1)
+    vivos = np.zeros((20, 4, 4), dtype=np.int32)
+    vivos[:, 0, 0] = 2
+    preso = np.array([[[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]]], dtype=np.int32)
+
+    pontos = montecarlo.rolar(np.concatenate([vivos, preso]), 15, rng)
+
+    assert (pontos[:20] <= 15).all() and pontos[:20].sum() > 0
+    assert pontos[20] == 0
+
+
+def test_avaliarMovimentosCandidatos():
+    agente = AgenteMonteCarlo(rollouts_por_movimento=20, profundidade_max=10, semente=1)
+    # Só "left" e "right" mudam este tabuleiro
+    matriz = [[2, 4, 8, 0], [4, 8, 16, 32], [8, 16, 32, 64], [16, 32, 64, 128]]
+    preso = [[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]]
+
+    medias = agente.avaliar(matriz)
+
+    assert set(medias) <= {"left", "right", "up", "down"}
+    assert all(valor >= 1 for valor in medias.values())
+    assert agente.escolher(preso) is None
+
+# Com z = 0 qualquer diferença entre as médias já basta para cortar após a primeira rodada
+
+def test_avaliarCorteAntecipado():
+    matriz = [[2, 4, 8, 0], [4, 8, 16, 32], [8, 16, 32, 64], [0, 0, 0, 0]]
+    exigente = AgenteMonteCarlo(100, profundidade_max=30, rodadas=4, z=50, semente=2)
+    afoito = AgenteMonteCarlo(100, profundidade_max=30, rodadas=4, z=0, semente=2)
+
+    candidatos = len(exigente.avaliar(matriz))
+    afoito.avaliar(matriz)
+
+    assert exigente.estatisticas()["cortes"] == 0
+    assert exigente.estatisticas()["rollouts"] == 100 * candidatos
+    assert afoito.estatisticas()["cortes"] == 1
+    assert afoito.estatisticas()["rollouts"] == 25 * candidatos
+
+
+def test_avaliarJogoSemInterfaceComProcessos():
+    with executores.ExecutorProcessos(2) as executor:
+        agente = AgenteMonteCarlo(8, profundidade_max=5, executor=executor, semente=3)
+        individuo, maior_tile, movimentos = agente.jogar(random.Random(4), max_jogadas=5)
+
+    assert len(individuo) == movimentos == 5
+    assert maior_tile >= 2
+    estatisticas = agente.estatisticas()
+    assert estatisticas["jogadas"] == 5
+    assert estatisticas["rollouts_por_segundo"] > 0
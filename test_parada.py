@@ -0,0 +1,137 @@
+# Testes dos critérios de parada do rodar_ag
+
+import time
+import pytest
+import algorithm as ag
+import cli
+from cache_fitness import CacheFitness
+from parada import CriteriosParada
+
+
+def _avaliada(melhor: float, maior_tile: int = 64) -> list:
+    resultado = {"media_tile": melhor, "maior_tile": maior_tile}
+    return [(melhor, resultado, ["up"]), (0.0, dict(resultado, maior_tile=4), ["down"])]
+
+
+def test_avaliarParadaPorEstagnacao():
+    criterios = CriteriosParada(janela_estagnacao=3, melhora_minima=1.0)
+    criterios.iniciar(20, 0.1)
+    melhores = [10, 20, 20.5, 20.9, 21.0]
+
+    motivos = [
+        criterios.atualizar(geracao, melhor, _avaliada(melhor), 5)
+        for geracao, melhor in enumerate(melhores)
+    ]
+
+    # Subir menos que melhora_minima não conta como melhora
+    assert motivos == [None, None, None, None, "estagnacao"]
+    relatorio = criterios.relatorio()
+    assert relatorio["geracao_parada"] == 4
+    assert relatorio["geracoes_economizadas"] == 15
+    assert relatorio["simulacoes"] == 5 * 2 * 5
+    assert relatorio["simulacoes_economizadas"] == 15 * 10
+
+
+def test_avaliarParadaPorTileEOrcamento():
+    alvo = CriteriosParada(tile_alvo=2048)
+    alvo.iniciar(10, 0.1)
+    assert alvo.atualizar(0, 5.0, _avaliada(5.0, 1024), 2) is None
+    assert alvo.atualizar(1, 5.0, _avaliada(5.0, 2048), 2) == "tile_alvo"
+
+    # 2 indivíduos x 3 jogos por geração: a terceira passaria de 13
+    simulacoes = CriteriosParada(simulacoes_maximas=13)
+    simulacoes.iniciar(10, 0.1)
+    assert simulacoes.atualizar(0, 1.0, _avaliada(1.0), 3) is None
+    assert simulacoes.atualizar(1, 2.0, _avaliada(2.0), 3) == "simulacoes"
+
+    tempo = CriteriosParada(tempo_maximo=0.01)
+    tempo.iniciar(10, 0.1)
+    time.sleep(0.02)
+    assert tempo.atualizar(0, 1.0, _avaliada(1.0), 1) == "tempo"
+
+    # Na última geração não há o que economizar
+    ultima = CriteriosParada(tile_alvo=2)
+    ultima.iniciar(1, 0.1)
+    assert ultima.atualizar(0, 1.0, _avaliada(1.0), 1) is None
+    assert ultima.relatorio()["motivo"] is None
+
+
+def test_avaliarMutacaoAdaptativa():
+    criterios = CriteriosParada(janela_mutacao=2, fator_mutacao=2.0, mutacao_maxima=0.3)
+    criterios.iniciar(50, 0.1)
+    taxas = []
+    for geracao, melhor in enumerate([1, 1, 1, 1, 1, 1, 2]):
+        criterios.atualizar(geracao, melhor, _avaliada(melhor), 1)
+        taxas.append(criterios.taxa_mutacao)
+
+    assert taxas == [0.1, 0.1, 0.2, 0.2, 0.3, 0.3, 0.1]
+    assert criterios.relatorio()["ajustes_mutacao"] == 2
+
+
+def test_avaliarRodarAgComParada(tmp_path):
+    log = tmp_path / "log.txt"
+    criterios = CriteriosParada(janela_estagnacao=2, melhora_minima=1e9)
+
+    melhor_fitness, melhor = ag.rodar_ag(
+        30, 6, 30, 0.1, 2, "bitboard", seed=3, caminho_log=str(log), parada=criterios
+    )
+
+    relatorio = criterios.relatorio()
+    assert relatorio["motivo"] == "estagnacao"
+    assert relatorio["geracoes"] == 3
+    assert relatorio["geracoes_economizadas"] == 27
+    assert len(melhor) == 30 and melhor_fitness > 0
+    texto = log.read_text(encoding="utf-8")
+    assert "Geração 3:" in texto and "Geração 4:" not in texto
+    assert "Parada antecipada (estagnacao)" in texto
+
+
+class _CacheContado(CacheFitness):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.guardados = 0
+
+    def guardar(self, *args, **kwargs):
+        self.guardados += 1
+        return super().guardar(*args, **kwargs)
+
+
+def test_avaliarOrcamentoDeSimulacoesComCache():
+    # Os pais que voltam do cache não gastam o orçamento
+    cache = _CacheContado(12)
+    criterios = CriteriosParada(simulacoes_maximas=60)
+    ag.rodar_ag(20, 6, 30, 0.1, 2, "bitboard", seed=3, caminho_log=None, cache=cache, parada=criterios)
+
+    relatorio = criterios.relatorio()
+    assert relatorio["motivo"] == "simulacoes"
+    assert relatorio["simulacoes"] == 2 * cache.guardados <= 60
+    # Contando todos os 6 por geração (12 jogos), pararia depois de 5 gerações
+    assert relatorio["geracoes"] > 5
+
+
+def test_avaliarParadaContinuaNaRetomada(tmp_path):
+    def criterios():
+        return CriteriosParada(janela_estagnacao=4, melhora_minima=1e9, janela_mutacao=1)
+
+    direto = criterios()
+    esperado = ag.rodar_ag(10, 6, 30, 0.1, 2, "bitboard", seed=3, caminho_log=None, parada=direto)
+
+    # Interrompida depois de 3 gerações e retomada com um objeto novo
+    caminho = str(tmp_path / "ckpt")
+    ag.rodar_ag(
+        3, 6, 30, 0.1, 2, "bitboard", seed=3, caminho_log=None, caminho_checkpoint=caminho,
+        parada=criterios()
+    )
+    retomado = criterios()
+    assert ag.retomar(caminho, populacoes=10, parada=retomado) == esperado
+
+    ignorar = ("tempo", "tempo_economizado")
+    assert {k: v for k, v in retomado.relatorio().items() if k not in ignorar} == {
+        k: v for k, v in direto.relatorio().items() if k not in ignorar
+    }
+    assert retomado.relatorio()["geracao_parada"] == 4
+
+
+def test_avaliarParadaRecusadaComIlhas():
+    with pytest.raises(SystemExit):
+        cli.main(["--ilhas", "2", "--tile-alvo", "512", "--log", ""])
@@ -0,0 +1,92 @@
+# Testes do genoma de pesos heurísticos
+
+import random
+import numpy as np
+import pytest
+import algorithm as ag
+import pesos
+
+BONS = [1.0, 1.0, 0.3, 0.5, 0.5]
+
+
+def test_avaliarCaracteristicasDeUmTabuleiro():
+    tabuleiro = np.array([[[2, 4, 8, 16], [0, 0, 0, 0], [0, 2, 0, 0], [0, 0, 0, 2]]])
+
+    vetor = pesos.caracteristicas(tabuleiro)[0]
+
+    # 10 vazias; maior tile (16) no canto; nenhum par igual vizinho
+    assert vetor[0] == pytest.approx(10 / 16)
+    assert vetor[1] == pytest.approx(-3 / 88)
+    assert vetor[2] == pytest.approx(-1 / 88)
+    assert vetor[3] == 1.0
+    assert vetor[4] == 0.0
+
+
+def test_avaliarCaracteristicasEmLoteIguaisAsIndividuais():
+    rng = np.random.default_rng(3)
+    tabuleiros = np.where(rng.random((50, 4, 4)) < 0.4, 0, 2 ** rng.integers(1, 12, (50, 4, 4)))
+
+    lote = pesos.caracteristicas(tabuleiros)
+    for k in range(len(tabuleiros)):
+        np.testing.assert_allclose(lote[k], pesos.caracteristicas(tabuleiros[k:k + 1])[0])
+
+
+def test_avaliarSimulacaoReprodutivel():
+    random.seed(11)
+    primeiro = pesos.fitness(BONS, 5)
+    random.seed(11)
+    segundo = pesos.fitness(BONS, 5)
+    assert primeiro == segundo
+
+    # Mesmo gerador de tiles (modo crn): mesmo resultado
+    a = pesos.fitness(BONS, 5, np.random.default_rng(4))
+    b = pesos.fitness(BONS, 5, np.random.default_rng(4))
+    assert a == b
+
+
+def test_avaliarPesosBonsVencemPesosNulos():
+    random.seed(2)
+    bons = pesos.fitness(BONS, 10)
+    nulos = pesos.fitness([0.0] * len(pesos.CARACTERISTICAS), 10)
+    assert bons["media_tile"] > 2 * nulos["media_tile"]
+
+
+def test_avaliarOperadoresDosPesos():
+    random.seed(1)
+    pai1 = pesos.gerar_individuo()
+    pai2 = pesos.gerar_individuo()
+    filho1, filho2 = pesos.cruzar(pai1, pai2)
+
+    assert len(pai1) == len(filho1) == len(filho2) == len(pesos.CARACTERISTICAS)
+    # Cruzamento aritmético: cada gene fica entre os dos pais
+    for gene, a, b in zip(filho1, pai1, pai2):
+        assert min(a, b) <= gene <= max(a, b)
+    assert pesos.mutar(pai1, 0.0) == pai1
+    assert pesos.mutar(pai1, 1.0) != pai1
+
+
+def test_avaliarRodarAgComGenomaDePesos(tmp_path):
+    log = tmp_path / "log.txt"
+    melhor_fitness, melhor_individuo = ag.rodar_ag(
+        3, 6, 0, 0.2, 3, seed=5, caminho_log=str(log), tipo_genoma='pesos'
+    )
+
+    assert len(melhor_individuo) == len(pesos.CARACTERISTICAS)
+    assert melhor_fitness > 0
+    assert "- Pesos:" in log.read_text(encoding="utf-8")
+    # Mesma seed, mesmo resultado
+    assert ag.rodar_ag(3, 6, 0, 0.2, 3, seed=5, caminho_log=None, tipo_genoma='pesos') == (
+        melhor_fitness, melhor_individuo
+    )
+
+
+def test_avaliarGenomaDePesosRecusaOpcoesDeSequencia(tmp_path):
+    with pytest.raises(ValueError):
+        ag.rodar_ag(2, 4, 0, 0.1, 1, caminho_log=None, tipo_genoma='pesos', genoma_compacto=True)
+    with pytest.raises(ValueError):
+        ag.rodar_ag(
+            2, 4, 0, 0.1, 1, caminho_log=None, tipo_genoma='pesos',
+            caminho_checkpoint=str(tmp_path / "ckpt")
+        )
+    with pytest.raises(ValueError):
+        ag.rodar_ag(2, 4, 0, 0.1, 1, caminho_log=None, tipo_genoma='outro')
@@ -0,0 +1,90 @@
+# Testes do registro de execuções em SQLite
+
+import pytest
+import algorithm as ag
+import cli
+from registro import RegistroExecucoes, codificar_genoma, decodificar_genoma
+
+
+def test_avaliarGenomaCompactoIdaEVolta():
+    individuo = ['up', 'left', 'down', 'right', 'up']
+    assert codificar_genoma(individuo) == bytes([0, 2, 1, 3, 0])
+    assert decodificar_genoma(codificar_genoma(individuo)) == individuo
+
+    pesos = [1.5, -0.25, 0.0]
+    assert decodificar_genoma(codificar_genoma(pesos, 'pesos'), 'pesos') == pesos
+
+
+def test_avaliarRegistroDeUmaExecucao(tmp_path):
+    caminho = str(tmp_path / "ag.db")
+    with RegistroExecucoes(caminho) as registro:
+        melhor_fitness, melhor_individuo = ag.rodar_ag(
+            3, 6, 20, 0.1, 2, "bitboard", seed=1, caminho_log=None, registro=registro
+        )
+
+    # Relido de outra conexão: tudo foi confirmado em disco
+    with RegistroExecucoes(caminho) as registro:
+        [execucao] = registro.execucoes()
+        assert execucao["seed"] == 1
+        assert execucao["engine"] == "bitboard"
+        assert execucao["geracoes"] == 3
+        assert execucao["parametros"]["tamanho_pop"] == 6
+        assert execucao["melhor_fitness"] == melhor_fitness
+        assert execucao["melhor_individuo"] == melhor_individuo
+
+        curva = registro.curva_fitness(execucao["id"], ("melhor_fitness", "jogos"))
+        assert [linha["geracao"] for linha in curva] == [0, 1, 2]
+        # Na primeira geração todos jogam; depois os pais voltam do cache
+        assert curva[0]["jogos"] == 12
+        assert all(0 < linha["jogos"] < 12 for linha in curva[1:])
+        assert max(linha["melhor_fitness"] for linha in curva) == melhor_fitness
+
+        individuos = registro.melhores_individuos(execucao["id"], 100)
+        assert len(individuos) == 18
+        fitness_val, resultado, individuo = individuos[0]
+        assert fitness_val == melhor_fitness
+        assert individuo == melhor_individuo
+        assert set(resultado["distribuicao_tiles"]) == {128, 256, 512, 1024, 2048}
+
+
+def test_avaliarMelhorPorExecucao():
+    registro = RegistroExecucoes(individuos=False)
+    for seed in (1, 2):
+        ag.rodar_ag(2, 4, 20, 0.1, 2, "bitboard", seed=seed, caminho_log=None, registro=registro)
+
+    melhores = registro.melhor_por_execucao()
+    assert sorted(linha["seed"] for linha in melhores) == [1, 2]
+    assert melhores[0]["melhor_fitness"] >= melhores[1]["melhor_fitness"]
+    for linha in melhores:
+        [execucao] = [e for e in registro.execucoes() if e["id"] == linha["execucao"]]
+        assert linha["melhor_fitness"] == execucao["melhor_fitness"]
+        # individuos=False: só as métricas
+        assert registro.melhores_individuos(linha["execucao"]) == []
+
+    with pytest.raises(ValueError):
+        registro.curva_fitness(1, ("melhor_fitness; DROP TABLE geracoes",))
+
+
+def test_avaliarRegistroComSeedGrande():
+    # Seeds de 64 bits sem sinal não cabem no INTEGER do SQLite
+    registro = RegistroExecucoes()
+    seed = 2 ** 63 + 5
+    ag.rodar_ag(1, 4, 10, 0.1, 1, "bitboard", seed=seed, caminho_log=None, registro=registro)
+
+    [execucao] = registro.execucoes()
+    assert execucao["seed"] == seed
+    assert execucao["parametros"]["seed"] == seed
+    assert registro.melhor_por_execucao()[0]["seed"] == seed
+
+
+def test_avaliarRegistroPelaLinhaDeComando(tmp_path):
+    caminho = str(tmp_path / "ag.db")
+    argumentos = ["--geracoes", "2", "--tamanho-pop", "4", "--tamanho-individuo", "10",
+                  "--simulacoes", "1", "--log", "", "--registro", caminho]
+    cli.main(argumentos + ["--seed", "1"])
+    cli.main(argumentos + ["--seed", "2", "--genoma", "pesos"])
+
+    with RegistroExecucoes(caminho) as registro:
+        execucoes = registro.execucoes()
+        assert [e["tipo_genoma"] for e in execucoes] == ["sequencia", "pesos"]
+        assert len(execucoes[1]["melhor_individuo"]) == 5
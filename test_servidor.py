@@ -0,0 +1,144 @@
+# Testes do servidor local de fitness
+
+import threading
+import time
+import pytest
+import algorithm as ag
+import executores
+from servidor import ExecutorEmProcesso, ExecutorRemoto, ServidorFitness
+
+
+def _tarefas(quantidade: int, semente: int = 1) -> list[tuple]:
+    populacao = [["up", "left", "down", "right"][i % 4:] * 10 for i in range(quantidade)]
+    return [(individuo, 2, "bitboard", semente + i, None) for i, individuo in enumerate(populacao)]
+
+
+def test_avaliarServidorIgualAoSerial():
+    populacao = [ag.generate_individual(40) for _ in range(6)]
+    esperado = ag.avaliar_populacao(populacao, 3, "bitboard", seed=9)
+
+    with ExecutorEmProcesso() as executor:
+        avaliada = ag.avaliar_populacao(populacao, 3, "bitboard", executor, seed=9)
+
+    assert avaliada == esperado
+
+# Dois clientes mandando as mesmas tarefas ao mesmo tempo: vão no mesmo lote
+# e cada tarefa repetida é simulada uma vez só
+
+def test_avaliarCoalescencia():
+    servidor = ServidorFitness(tamanho_lote=100, espera_lote=0.2)
+    tarefas = _tarefas(8)
+    resultados = [None, None]
+
+    with ExecutorEmProcesso(servidor) as executor:
+        def cliente(indice):
+            resultados[indice] = executor.mapear(ag.avaliar_tarefa, tarefas)
+
+        threads = [threading.Thread(target=cliente, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metricas = executor.metricas()
+
+    assert resultados[0] == resultados[1] == executores.ExecutorSerial().mapear(ag.avaliar_tarefa, tarefas)
+    assert metricas["tarefas"] == 16
+    assert metricas["coalescidas"] == 8
+    assert metricas["lotes"] == 1
+    assert metricas["requisicoes"] == 2
+
+# Um pedido maior que a fila passa aos poucos, sem travar
+
+def test_avaliarFilaLimitada():
+    servidor = ServidorFitness(tamanho_lote=3, espera_lote=0.001, max_fila=2)
+    tarefas = _tarefas(10)
+
+    with ExecutorEmProcesso(servidor) as executor:
+        resultados = executor.mapear(ag.avaliar_tarefa, tarefas)
+        metricas = executor.metricas()
+
+    assert len(resultados) == 10
+    assert metricas["lotes"] >= 4
+    assert metricas["fila"] == 0
+    assert metricas["latencia_p95"] > 0
+
+
+def test_avaliarServidorTcp():
+    tarefas = _tarefas(5)
+
+    with ExecutorEmProcesso() as local:
+        porta = local.rodar(local.servidor.escutar_tcp("127.0.0.1", 0))
+        with ExecutorRemoto(f"127.0.0.1:{porta}") as remoto:
+            resultados = remoto.mapear(ag.avaliar_tarefa, tarefas)
+            metricas = remoto.metricas()
+            with pytest.raises(RuntimeError):
+                remoto.mapear(ag.avaliar_tarefa, [(["up"], 1, "inexistente", 1, None)])
+            with pytest.raises(ValueError):
+                remoto.mapear(ag.fitness, tarefas)
+
+    assert resultados == executores.ExecutorSerial().mapear(ag.avaliar_tarefa, tarefas)
+    assert all(isinstance(tile, int) for tile in resultados[0]["distribuicao_tiles"])
+    assert metricas["clientes"] == 1
+    assert metricas["tarefas"] == 5
+
+# O erro de uma tarefa volta só para o cliente que a enviou, mesmo no mesmo lote
+
+def test_avaliarErroFicaComQuemEnviou():
+    servidor = ServidorFitness(tamanho_lote=100, espera_lote=0.2)
+    tarefas = _tarefas(4)
+    invalida = [(["up"] * 5, 1, "inexistente", 1, None)]
+    saidas = {}
+
+    with ExecutorEmProcesso(servidor) as executor:
+        def cliente(nome, lista):
+            try:
+                saidas[nome] = executor.mapear(ag.avaliar_tarefa, lista)
+            except Exception as erro:
+                saidas[nome] = erro
+
+        threads = [
+            threading.Thread(target=cliente, args=("valido", tarefas)),
+            threading.Thread(target=cliente, args=("invalido", invalida)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metricas = executor.metricas()
+
+    assert metricas["lotes"] == 1
+    assert saidas["valido"] == executores.ExecutorSerial().mapear(ag.avaliar_tarefa, tarefas)
+    assert isinstance(saidas["invalido"], ValueError)
+
+
+class _ExecutorTravado(executores.ExecutorSerial):
+    def __init__(self):
+        self.liberar = threading.Event()
+
+    def mapear(self, funcao, tarefas):
+        self.liberar.wait(10)
+        return super().mapear(funcao, tarefas)
+
+# Fechar com um lote em execução responde a quem esperava por ele
+
+def test_avaliarFecharComLoteEmExecucao():
+    travado = _ExecutorTravado()
+    executor = ExecutorEmProcesso(ServidorFitness(travado, espera_lote=0.001))
+    saida = []
+
+    def enviar():
+        with pytest.raises(RuntimeError) as erro:
+            executor.mapear(ag.avaliar_tarefa, _tarefas(2))
+        saida.append(erro)
+
+    cliente = threading.Thread(target=enviar)
+    cliente.start()
+    while executor.metricas()["em_execucao"] == 0:
+        time.sleep(0.01)
+
+    executor.fechar()
+    cliente.join(5)
+    travado.liberar.set()
+
+    assert not cliente.is_alive()
+    assert "fechado" in str(saida[0].value)
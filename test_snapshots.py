@@ -0,0 +1,74 @@
+# Testes da retomada de simulações por snapshots
+
+import random
+import bitboard
+import algorithm as ag
+from fita import FitaAleatoria
+from snapshots import ArmazemSnapshots, semente_simulacao
+
+
+def jogo_do_inicio(individuo, semente, simulacao):
+    return bitboard.executar_jogo(individuo, FitaAleatoria(semente_simulacao(semente, simulacao)))
+
+
+def test_avaliarFitaReprodutivel():
+    fita = FitaAleatoria(3)
+    valores = [fita.randint(0, 3) for _ in range(600)]
+    outra = FitaAleatoria(3)
+
+    assert [outra.randint(0, 3) for _ in range(600)] == valores
+    fita.ir_para(100)
+    assert fita.randint(0, 3) == valores[100]
+
+# Retomar de um snapshot precisa dar exatamente o mesmo jogo que simular do início
+
+def test_avaliarRetomadaIgualASimularDoInicio():
+    random.seed(4)
+    armazem = ArmazemSnapshots(semente=11, intervalo=10)
+    pai1 = ag.generate_individual(300)
+    pai2 = ag.generate_individual(300)
+
+    for simulacao in range(4):
+        armazem.simular(pai1, simulacao)
+        armazem.simular(pai2, simulacao)
+
+    filhos = list(ag.cruzar(pai1, pai2)) + [ag.mutar(pai1, 0.02) for _ in range(5)]
+    for filho in filhos:
+        for simulacao in range(4):
+            assert armazem.simular(filho, simulacao) == jogo_do_inicio(filho, 11, simulacao)
+
+    assert armazem.acertos > 0
+    assert armazem.estatisticas()["fracao_pulada"] > 0
+
+
+def test_avaliarFilhoComMesmoPrefixoPulaSimulacao():
+    armazem = ArmazemSnapshots(semente=1, intervalo=5)
+    pai = ["left", "up"] * 100
+    armazem.fitness(pai, 3)
+    simulados_antes = armazem.genes_simulados
+
+    filho = pai[:150] + ["down"] * 50
+    resultado = armazem.fitness(filho, 3)
+
+    assert armazem.genes_simulados - simulados_antes < 3 * 60
+    assert resultado == ag.fitness(filho, 3, snapshots=ArmazemSnapshots(semente=1, intervalo=5))
+
+
+def test_avaliarLimiteDeMemoriaDosSnapshots():
+    armazem = ArmazemSnapshots(intervalo=5, max_snapshots=20)
+    for _ in range(5):
+        armazem.fitness(ag.generate_individual(200), 2)
+
+    assert len(armazem) <= 20
+    assert armazem.descartes > 0
+
+
+def test_avaliarPopulacaoComSnapshots():
+    armazem = ArmazemSnapshots(semente=2, intervalo=20)
+    populacao = ag.generate_population(4, 100)
+
+    avaliada = ag.avaliar_populacao(populacao, 3, snapshots=armazem)
+
+    for (fitness_val, resultado, individuo), original in zip(avaliada, populacao):
+        assert individuo == original
+        assert fitness_val == resultado["media_tile"]
@@ -0,0 +1,74 @@
+# Testes do tabuleiro em array plano
+
+import random
+from unittest.mock import patch
+import logic
+import constants as c
+import algorithm as ag
+from tabuleiro import Tabuleiro, new_game
+
+
+def matriz_aleatoria(rng, n, cheio=False):
+    valores = [2, 4, 8, 16] if cheio else [0, 0, 2, 4, 8, 16]
+    return [[rng.choice(valores) for _ in range(n)] for _ in range(n)]
+
+# Os movimentos precisam bater com o logic para vários tamanhos de grade
+
+def test_avaliarMovimentosIguaisAoLogicEmVariosTamanhos():
+    rng = random.Random(1)
+    for n in [3, 4, 5, 6, 8]:
+        with patch.object(c, "GRID_LEN", n):
+            for _ in range(30):
+                matriz = matriz_aleatoria(rng, n)
+                for direcao in ["up", "down", "left", "right"]:
+                    esperado, done_esperado = getattr(logic, direcao)([linha[:] for linha in matriz])
+                    tabuleiro = Tabuleiro.da_matriz(matriz)
+                    done = tabuleiro.mover(direcao)
+
+                    assert tabuleiro.matriz() == esperado
+                    assert done == done_esperado
+
+
+def test_avaliarEstadoIgualAoLogic():
+    rng = random.Random(2)
+    for n in [4, 5, 7]:
+        for _ in range(50):
+            matriz = matriz_aleatoria(rng, n, cheio=rng.random() < 0.8)
+            assert Tabuleiro.da_matriz(matriz).game_state() == logic.game_state(matriz)
+
+# Vazias, maior tile e "mesclável" precisam continuar corretos depois de cada passo
+
+def test_avaliarEstadoIncrementalConsistente():
+    rng = random.Random(3)
+    tabuleiro = new_game(5, rng)
+    for _ in range(300):
+        if tabuleiro.game_state() != 'not over':
+            break
+        if tabuleiro.mover(rng.choice(["up", "down", "left", "right"])):
+            tabuleiro.add_two(rng)
+        recalculado = Tabuleiro(5, tabuleiro.celulas)
+
+        assert sorted(tabuleiro.vazias) == recalculado.vazias
+        assert tabuleiro.maior == recalculado.maior
+        assert tabuleiro.mesclavel() == recalculado.mesclavel()
+
+
+def test_avaliarNovoTileEmTabuleiroQuaseCheio():
+    matriz = [[2, 4, 8, 16], [32, 64, 128, 256], [512, 1024, 4, 8], [16, 32, 0, 2]]
+    tabuleiro = Tabuleiro.da_matriz(matriz)
+
+    tabuleiro.add_two(random.Random(0))
+
+    assert tabuleiro.matriz()[3][2] == 2
+    assert tabuleiro.vazias == []
+    assert tabuleiro.mesclavel()
+    assert tabuleiro.game_state() == 'not over'
+
+
+def test_avaliarMotorTabuleiro():
+    individuo = ag.generate_individual(100)
+    maior_tile, movimentos = ag.executar_jogo(individuo, "tabuleiro")
+
+    assert 2 <= maior_tile <= 2048
+    assert movimentos <= 100
+    assert ag.fitness(individuo, 3, "tabuleiro", crn=1) == ag.fitness(individuo, 3, "tabuleiro", crn=1)
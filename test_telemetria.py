@@ -0,0 +1,82 @@
+# Testes da telemetria estruturada
+
+import csv
+import io
+import json
+import logic
+import algorithm as ag
+from cache_fitness import CacheFitness
+from telemetria import Telemetria, TimerFuncoes
+
+
+def test_avaliarTelemetriaPorGeracaoEmJsonLines(tmp_path):
+    destino = tmp_path / "telemetria.jsonl"
+
+    with Telemetria(str(destino)) as telemetria:
+        ag.rodar_ag(3, 6, 20, 0.1, 2, "bitboard", seed=1, telemetria=telemetria, caminho_log=None)
+
+    registros = [json.loads(linha) for linha in destino.read_text(encoding="utf-8").splitlines()]
+
+    assert [r["geracao"] for r in registros] == [1, 2, 3]
+    for registro in registros:
+        for fase in ["avaliacao", "selecao", "cruzamento", "mutacao"]:
+            assert registro[f"tempo_{fase}"] >= 0
+        assert registro["tempo_avaliacao"] <= registro["tempo_total"]
+        assert registro["jogos_por_segundo"] > 0
+        assert 0 < registro["taxa_movimentos_validos"] <= 1
+        assert registro["melhor_fitness"] >= registro["pior_fitness"]
+
+
+def test_avaliarTelemetriaEmCsv():
+    destino = io.StringIO()
+    telemetria = Telemetria(destino, formato="csv")
+    ag.rodar_ag(2, 4, 10, 0.1, 1, telemetria=telemetria, caminho_log=None)
+
+    linhas = list(csv.DictReader(io.StringIO(destino.getvalue())))
+
+    assert len(linhas) == 2
+    assert "movimentos_por_segundo" in linhas[0]
+
+# O timer troca as funções do logic só durante o bloco
+
+def test_avaliarTimerDasFuncoesDoLogic():
+    timer = TimerFuncoes()
+    original = logic.up
+
+    with timer.instrumentar(logic):
+        ag.executar_jogo(["up", "left"] * 10)
+        assert logic.up is not original
+
+    resumo = timer.resumo()
+
+    assert logic.up is original
+    assert resumo["up"]["chamadas"] >= 1
+    assert resumo["game_state"]["chamadas"] >= resumo["up"]["chamadas"]
+
+
+def test_avaliarTimerNaTelemetriaDoAg():
+    telemetria = Telemetria(timer=TimerFuncoes())
+    ag.rodar_ag(2, 4, 10, 0.1, 1, telemetria=telemetria, caminho_log=None)
+
+    funcoes = telemetria.registros[0]["funcoes"]
+
+    assert "game_state" in funcoes
+    assert set(funcoes) & {"up", "down", "left", "right"}
+    assert len(telemetria.registros) == 2
+
+
+def test_avaliarTelemetriaNaoContaOCache():
+    cache = CacheFitness()
+    individuo = ["up", "left"] * 10
+    ag.avaliar_populacao([individuo], 3, "bitboard", seed=1, cache=cache)
+    # Um já no cache e um repetido: só o novo joga nesta geração
+    populacao = [individuo, ["down", "right"] * 10, ["down", "right"] * 10]
+    avaliada = ag.avaliar_populacao(populacao, 3, "bitboard", seed=2, cache=cache)
+
+    telemetria = Telemetria()
+    telemetria.tempos["avaliacao"] = 1.0
+    registro = telemetria.registrar_geracao(0, avaliada, {}, 3, 1.0)
+
+    novo = next(resultado for _, resultado, genes in avaliada if genes == populacao[1])
+    assert registro["jogos_por_segundo"] == 3
+    assert registro["movimentos_por_segundo"] == novo["media_movimentos"] * 3
@@ -0,0 +1,77 @@
+# Testes da varredura de hiperparâmetros
+
+import os
+import pytest
+import algorithm as ag
+import varredura
+
+PEQUENA = {"populacoes": 2, "tamanho_pop": 4, "tamanho_individuo": 20, "num_simulacoes": 2}
+
+
+def test_avaliarEspacosDeBusca():
+    configuracoes = varredura.grade({"taxa_mutacao": [0.05, 0.1], "tamanho_pop": [10, 20, 30]}, PEQUENA)
+    sorteadas = varredura.aleatoria({"taxa_mutacao": (0.01, 0.3), "tamanho_pop": (10, 20)}, 5, seed=1)
+
+    assert len(configuracoes) == 6
+    assert {(c["taxa_mutacao"], c["tamanho_pop"]) for c in configuracoes} == {
+        (t, p) for t in (0.05, 0.1) for p in (10, 20, 30)
+    }
+    assert all(c["populacoes"] == 2 and c["engine"] == "bitboard" for c in configuracoes)
+    assert sorteadas == varredura.aleatoria({"taxa_mutacao": (0.01, 0.3), "tamanho_pop": (10, 20)}, 5, seed=1)
+    assert all(0.01 <= c["taxa_mutacao"] <= 0.3 and 10 <= c["tamanho_pop"] <= 20 for c in sorteadas)
+    assert all(isinstance(c["tamanho_pop"], int) for c in sorteadas)
+
+# Rodar de novo reaproveita tudo o que já está no disco
+
+def test_avaliarVarreduraRetomavel(tmp_path):
+    diretorio = str(tmp_path / "varredura")
+    configuracoes = varredura.grade({"taxa_mutacao": [0.05, 0.2]}, PEQUENA)
+
+    primeira = varredura.executar(configuracoes, [1, 2], diretorio, processos=1)
+    # Simula uma interrupção: um resultado sumiu e outro ficou pela metade
+    arquivos = sorted(os.listdir(diretorio))
+    os.remove(os.path.join(diretorio, arquivos[0]))
+    with open(os.path.join(diretorio, arquivos[1]), "w") as arquivo:
+        arquivo.write('{"melhor_fit')
+    segunda = varredura.executar(configuracoes, [1, 2, 3], diretorio, processos=2)
+
+    assert len(arquivos) == 4
+    assert not any(resultado["do_cache"] for resultado in primeira)
+    assert sum(not resultado["do_cache"] for resultado in segunda) == 4
+    assert [r["melhor_fitness"] for r in segunda[:2]] == [r["melhor_fitness"] for r in primeira[:2]]
+    esperado = ag.rodar_ag(2, 4, 20, 0.05, 2, "bitboard", seed=1, caminho_log=None)
+    assert (segunda[0]["melhor_fitness"], segunda[0]["melhor_individuo"]) == esperado
+    # Os pais da segunda geração vêm do cache: menos que 2 x 4 x 2 jogos
+    assert all(4 * 2 < resultado["jogos"] < 2 * 4 * 2 for resultado in segunda)
+
+
+def test_avaliarResumoEFronteira():
+    def resultado(taxa, jogos, fitness_val):
+        return {"configuracao": {"taxa_mutacao": taxa}, "seed": 1, "melhor_fitness": fitness_val,
+                "jogos": jogos, "tempo": 1.0}
+
+    resultados = [
+        resultado(0.1, 100, 50.0), resultado(0.1, 100, 70.0),
+        resultado(0.2, 200, 55.0),
+        resultado(0.3, 300, 90.0),
+    ]
+    linhas = varredura.resumir(resultados)
+
+    assert [linha["configuracao"]["taxa_mutacao"] for linha in linhas] == [0.3, 0.1, 0.2]
+    assert linhas[1]["seeds"] == 2 and linhas[1]["media_fitness"] == 60.0
+    assert [linha["fronteira"] for linha in linhas] == [True, True, False]
+    tabela = varredura.formatar_tabela(linhas, ["taxa_mutacao"])
+    assert len(tabela.splitlines()) == 4 and "pareto" in tabela
+
+
+def test_avaliarLinhaDeComando(tmp_path, capsys):
+    argumentos = ["--grade", "taxa_mutacao=0.1,0.2", "populacoes=2", "tamanho_pop=4",
+                  "tamanho_individuo=20", "num_simulacoes=1", "--seeds", "1",
+                  "--diretorio", str(tmp_path), "--processos", "1"]
+
+    linhas = varredura.main(argumentos)
+
+    assert len(linhas) == 2
+    assert "2 execuções, 0 reaproveitadas" in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        varredura.main(["--grade", "inexistente=1", "--diretorio", str(tmp_path)])
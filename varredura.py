@@ -0,0 +1,249 @@
+# Varredura de hiperparâmetros do rodar_ag, em paralelo e retomável
+#
+# Uso: python varredura.py --grade taxa_mutacao=0.05,0.1,0.2 tamanho_pop=50,100 --seeds 1 2 3
+#      python varredura.py --aleatoria 20 taxa_mutacao=0.01:0.3 tamanho_pop=20:200 --seeds 1 2
+#
+# Cada (configuração, seed) é uma execução independente do rodar_ag, sem
+# log, em um worker do executor de processos. O worker grava o resultado em
+# um JSON próprio no diretório da varredura assim que termina, com o nome
+# derivado do hash da configuração e da seed: rodar de novo a mesma
+# varredura (interrompida ou estendida com mais pontos/seeds) só executa o
+# que ainda não tem arquivo. Os parâmetros fora da busca ficam com os
+# padrões do cli.py.
+#
+# O resumo agrupa as seeds de cada configuração: melhor e média do fitness,
+# jogos de fato simulados (sem os que o cache de fitness poupou) e tempo, e
+# marca a fronteira de Pareto entre fitness médio e jogos gastos.
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+import algorithm as ag
+import executores
+from parada import CriteriosParada
+
+PARAMETROS = ("populacoes", "tamanho_pop", "tamanho_individuo", "taxa_mutacao", "num_simulacoes")
+PADROES = {
+    "populacoes": 50,
+    "tamanho_pop": 150,
+    "tamanho_individuo": 500,
+    "taxa_mutacao": 0.10,
+    "num_simulacoes": 10,
+    "engine": "bitboard",
+}
+
+
+def grade(espaco: dict, base: dict = None) -> list[dict]:
+    # Produto cartesiano: espaco[parametro] = lista de valores
+    base = dict(PADROES, **(base or {}))
+    nomes = list(espaco)
+    return [dict(base, **dict(zip(nomes, valores))) for valores in itertools.product(*espaco.values())]
+
+
+def aleatoria(espaco: dict, quantidade: int, seed: int = None, base: dict = None) -> list[dict]:
+    # espaco[parametro] = lista (sorteia um item) ou tupla (mínimo, máximo):
+    # inteiros se os dois limites forem inteiros, senão uniforme
+    base = dict(PADROES, **(base or {}))
+    rng = random.Random(seed)
+    configuracoes = []
+    for _ in range(quantidade):
+        configuracao = dict(base)
+        for nome, valores in espaco.items():
+            if isinstance(valores, tuple):
+                minimo, maximo = valores
+                if isinstance(minimo, int) and isinstance(maximo, int):
+                    configuracao[nome] = rng.randint(minimo, maximo)
+                else:
+                    configuracao[nome] = rng.uniform(minimo, maximo)
+            else:
+                configuracao[nome] = rng.choice(list(valores))
+        configuracoes.append(configuracao)
+    return configuracoes
+
+
+def chave(configuracao: dict, seed: int) -> str:
+    texto = json.dumps({"configuracao": configuracao, "seed": seed}, sort_keys=True)
+    return hashlib.sha256(texto.encode()).hexdigest()[:20]
+
+
+def _caminho(diretorio: str, configuracao: dict, seed: int) -> str:
+    return os.path.join(diretorio, f"{chave(configuracao, seed)}.json")
+
+
+def _ler(caminho: str) -> dict:
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        # Arquivo ausente ou cortado no meio: a execução é refeita
+        return None
+
+
+def rodar_configuracao(tarefa: tuple) -> dict:
+    # Tarefa picklável para os executores: (configuracao, seed, diretorio)
+    configuracao, seed, diretorio = tarefa
+    inicio = time.perf_counter()
+    # Sem nenhum critério a execução vai até o fim; só conta os jogos simulados
+    contagem = CriteriosParada()
+    melhor_fitness, melhor_individuo = ag.rodar_ag(
+        configuracao["populacoes"], configuracao["tamanho_pop"],
+        configuracao["tamanho_individuo"], configuracao["taxa_mutacao"],
+        configuracao["num_simulacoes"], configuracao["engine"], seed=seed, caminho_log=None,
+        parada=contagem
+    )
+    resultado = {
+        "configuracao": configuracao,
+        "seed": seed,
+        "melhor_fitness": melhor_fitness,
+        "melhor_individuo": melhor_individuo,
+        "jogos": contagem.simulacoes,
+        "tempo": time.perf_counter() - inicio,
+    }
+    # Grava em um temporário e troca de nome: nunca fica um JSON pela metade
+    caminho = _caminho(diretorio, configuracao, seed)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo)
+    os.replace(caminho + ".tmp", caminho)
+    return resultado
+
+
+def executar(
+    configuracoes: list[dict],
+    seeds: list[int],
+    diretorio: str,
+    processos: int = None
+) -> list[dict]:
+    # Resultados na ordem (configuração, seed); os já gravados vêm do disco
+    # com "do_cache": True
+    os.makedirs(diretorio, exist_ok=True)
+    tarefas = [(configuracao, seed) for configuracao in configuracoes for seed in seeds]
+    resultados = [_ler(_caminho(diretorio, configuracao, seed)) for configuracao, seed in tarefas]
+    for resultado in resultados:
+        if resultado is not None:
+            resultado["do_cache"] = True
+
+    pendentes = [i for i, resultado in enumerate(resultados) if resultado is None]
+    if pendentes:
+        nome = "serial" if processos == 1 else "processos"
+        # Cada execução é longa: uma por vez para cada worker
+        with executores.criar_executor(nome, processos, chunksize=1) as executor:
+            novos = executor.mapear(
+                rodar_configuracao, [tarefas[i] + (diretorio,) for i in pendentes]
+            )
+        for i, resultado in zip(pendentes, novos):
+            resultado["do_cache"] = False
+            resultados[i] = resultado
+    return resultados
+
+
+def resumir(resultados: list[dict]) -> list[dict]:
+    grupos = {}
+    for resultado in resultados:
+        grupos.setdefault(chave(resultado["configuracao"], None), []).append(resultado)
+
+    linhas = []
+    for grupo in grupos.values():
+        fitness_seeds = [resultado["melhor_fitness"] for resultado in grupo]
+        linhas.append({
+            "configuracao": grupo[0]["configuracao"],
+            "seeds": len(grupo),
+            "melhor_fitness": max(fitness_seeds),
+            "media_fitness": statistics.fmean(fitness_seeds),
+            "desvio_fitness": statistics.stdev(fitness_seeds) if len(grupo) > 1 else 0.0,
+            "jogos": round(statistics.fmean(resultado["jogos"] for resultado in grupo)),
+            "tempo_medio": statistics.fmean(resultado["tempo"] for resultado in grupo),
+        })
+
+    # Fronteira: nenhuma outra configuração tem fitness médio maior ou igual
+    # gastando no máximo os mesmos jogos (e melhor em pelo menos um dos dois)
+    for linha in linhas:
+        linha["fronteira"] = not any(
+            outra["media_fitness"] >= linha["media_fitness"] and outra["jogos"] <= linha["jogos"]
+            and (outra["media_fitness"] > linha["media_fitness"] or outra["jogos"] < linha["jogos"])
+            for outra in linhas
+        )
+    linhas.sort(key=lambda linha: linha["media_fitness"], reverse=True)
+    return linhas
+
+
+def formatar_tabela(linhas: list[dict], parametros=PARAMETROS) -> str:
+    cabecalho = list(parametros) + ["seeds", "melhor", "média", "desvio", "jogos", "tempo (s)", "pareto"]
+    corpo = [
+        [str(linha["configuracao"][nome]) for nome in parametros] + [
+            str(linha["seeds"]),
+            f"{linha['melhor_fitness']:.2f}",
+            f"{linha['media_fitness']:.2f}",
+            f"{linha['desvio_fitness']:.2f}",
+            str(linha["jogos"]),
+            f"{linha['tempo_medio']:.2f}",
+            "*" if linha["fronteira"] else "",
+        ]
+        for linha in linhas
+    ]
+    larguras = [max(len(celula) for celula in coluna) for coluna in zip(cabecalho, *corpo)]
+    return "\n".join(
+        "  ".join(celula.rjust(largura) for celula, largura in zip(linha, larguras))
+        for linha in [cabecalho] + corpo
+    )
+
+
+def _numero(texto: str):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def _espaco(definicoes: list[str], faixas: bool) -> dict:
+    # "parametro=v1,v2,v3" ou, na busca aleatória, também "parametro=min:max"
+    espaco = {}
+    for definicao in definicoes:
+        nome, separador, valores = definicao.partition("=")
+        if not separador or nome not in PARAMETROS:
+            raise ValueError(f"definição inválida: {definicao!r} (parâmetros: {', '.join(PARAMETROS)})")
+        if faixas and ":" in valores:
+            minimo, maximo = valores.split(":")
+            espaco[nome] = (_numero(minimo), _numero(maximo))
+        else:
+            espaco[nome] = [_numero(valor) for valor in valores.split(",")]
+    return espaco
+
+
+def main(argv: list[str] = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description="Varredura de hiperparâmetros do AG")
+    busca = parser.add_mutually_exclusive_group(required=True)
+    busca.add_argument("--grade", nargs="+", metavar="PARAM=V1,V2", help="busca em grade")
+    busca.add_argument("--aleatoria", type=int, metavar="N", help="N configurações sorteadas")
+    parser.add_argument("espaco", nargs="*", metavar="PARAM=V1,V2|MIN:MAX",
+                        help="espaço da busca aleatória")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1])
+    parser.add_argument("--seed-busca", type=int, default=0, help="semente do sorteio das configurações")
+    parser.add_argument("--engine", default=PADROES["engine"])
+    parser.add_argument("--diretorio", default="varredura", help="onde ficam os resultados")
+    parser.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    base = {"engine": args.engine}
+    try:
+        if args.grade:
+            configuracoes = grade(_espaco(args.grade, faixas=False), base)
+        else:
+            configuracoes = aleatoria(_espaco(args.espaco, faixas=True), args.aleatoria, args.seed_busca, base)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    resultados = executar(configuracoes, args.seeds, args.diretorio, args.processos)
+    reaproveitados = sum(resultado["do_cache"] for resultado in resultados)
+    print(f"{len(resultados)} execuções, {reaproveitados} reaproveitadas de {args.diretorio}")
+    linhas = resumir(resultados)
+    print(formatar_tabela(linhas))
+    return linhas
+
+
+if __name__ == "__main__":
+    main()